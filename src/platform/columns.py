@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from entities import Entity
+
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+
+class Column:
+    """Descriptor:
+        Scalar attribute of an entity stored in a column of its simulation,
+        kept in the entity's own dictionary while it is not part of one
+    """
+    def __init__(self, column: Optional[str] = None):
+        """Constructor:
+            Declare a column attribute
+
+        Args:
+            column (Optional[str], optional): name of the column, the attribute's
+                                              without leading underscore if None. Defaults to None.
+        """
+        self.column: Optional[str] = column  # name of the column
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name: str = name
+        self.column = self.column or name.lstrip('_')
+
+    def __get__(self, entity: Optional[Entity], owner: Optional[type] = None) -> Any:
+        if entity is None:
+            return self
+
+        values = entity.__dict__
+        columns = values.get('_columns')
+        if columns is None:
+            try:
+                return values[self.name]
+            except KeyError:
+                raise AttributeError(self.name) from None
+
+        return int(columns._columns[self.column][values['_row']])
+
+    def __set__(self, entity: Entity, value: Any) -> None:
+        values = entity.__dict__
+        columns = values.get('_columns')
+        if columns is None:
+            values[self.name] = value
+        else:
+            columns._columns[self.column][values['_row']] = value
+
+
+class EnergyStock(MutableMapping):
+    """Class:
+        Energies owned by an entity, by energy type,
+        read from and written to the columns of its simulation
+
+        Attributes:
+            _columns (EntityColumns):   columns of the simulation
+            _row (int):                 row of the entity
+    """
+    KEYS: Dict[str, str] = {'blue energy': 'blue_energy',
+                            'red energy': 'red_energy'}
+
+    def __init__(self, columns: EntityColumns, row: int):
+        self._columns: EntityColumns = columns  # columns of the simulation
+        self._row: int = row                    # row of the entity
+
+    def __getitem__(self, key: str) -> int:
+        return int(self._columns._columns[EnergyStock.KEYS[key]][self._row])
+
+    def __setitem__(self, key: str, value: int) -> None:
+        self._columns._columns[EnergyStock.KEYS[key]][self._row] = value
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError("Energy types can not be removed from a stock")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(EnergyStock.KEYS)
+
+    def __len__(self) -> int:
+        return len(EnergyStock.KEYS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class EnergyStockColumn:
+    """Descriptor:
+        Energies stock of an entity, a dictionary while it is not part of a simulation,
+        a view into the blue and red energy columns once it is,
+        the view being kept in the entity's dictionary while attached
+    """
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name: str = name
+
+    def __get__(self, entity: Optional[Entity], owner: Optional[type] = None) -> Any:
+        if entity is None:
+            return self
+
+        try:
+            return entity.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, entity: Entity, value: Dict[str, int]) -> None:
+        stock = entity.__dict__.get(self.name)
+        if isinstance(stock, EnergyStock):
+            stock.update(value)
+        else:
+            entity.__dict__[self.name] = value
+
+
+class EntityColumns:
+    """Class:
+        Scalar state of the entities of a simulation
+        stored in one NumPy column per value, entities being views through a row,
+        so that the whole population's bookkeeping runs in a few array operations
+
+        Attributes:
+            entities (List[Optional[Entity]]):      entity in each row
+            free_rows (List[int]):                  rows available for new entities
+            _columns (Dict[str, npt.NDArray]):      values of every row, by name
+            _live (npt.NDArray[np.bool_]):          rows holding an entity
+
+        Methods:
+            attach:         move the values of an entity into a row
+            detach:         move the values of an entity back into it
+            export:         get the attributes of an entity as if it was detached
+            get_rows:       get the rows of some entities
+            gather:         get the values of some entities
+            age:            age every entity
+            find_dying:     find entities too old or without blue energy
+    """
+    COLUMNS: Dict[str, type] = {'age': np.int64,
+                                'size': np.int64,
+                                'max_age': np.int64,
+                                'action_cost': np.int64,
+                                'blue_energy': np.int64,
+                                'red_energy': np.int64}
+
+    # Attribute of the entities stored in each column
+    ATTRIBUTES: Dict[str, str] = {'age': 'age',
+                                  'size': 'size',
+                                  'max_age': '_max_age',
+                                  'action_cost': '_action_cost'}
+
+    def __init__(self, capacity: int = 256):
+        """Constructor:
+            Initialize empty columns
+
+        Args:
+            capacity (int, optional): initial number of rows. Defaults to 256.
+        """
+        self.entities: List[Optional[Entity]] = []      # entity in each row
+        self.free_rows: List[int] = []                  # rows available for new entities
+        self._columns: Dict[str, npt.NDArray] = {       # values of every row, by name
+            name: np.zeros(capacity, dtype=dtype)
+            for name, dtype in EntityColumns.COLUMNS.items()}
+        self._live: npt.NDArray[np.bool_] = np.zeros(capacity, dtype=np.bool_)  # rows holding an entity
+
+    def __len__(self) -> int:
+        return len(self.entities) - len(self.free_rows)
+
+    def __getitem__(self, name: str) -> npt.NDArray:
+        return self._columns[name]
+
+    def _grow(self, size: int) -> None:
+        """Private method:
+            Make room for at least a number of rows, doubling the capacity
+
+        Args:
+            size (int): number of rows required
+        """
+        capacity = len(self._live)
+        if size <= capacity:
+            return
+
+        capacity = max(size, 2 * capacity)
+        for name, column in self._columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            self._columns[name] = grown
+
+        live = np.zeros(capacity, dtype=np.bool_)
+        live[:len(self._live)] = self._live
+        self._live = live
+
+    def attach(self, entity: Entity) -> int:
+        """Public method:
+            Move the scalar values of an entity into a free row,
+            the entity reads and writes them there from now on
+
+        Args:
+            entity (Entity): entity to attach
+
+        Returns:
+            int: row of the entity
+        """
+        if entity.__dict__.get('_columns') is not None:
+            return entity.__dict__['_row']
+
+        if self.free_rows:
+            row = self.free_rows.pop()
+            self.entities[row] = entity
+        else:
+            row = len(self.entities)
+            self._grow(size=row + 1)
+            self.entities.append(entity)
+
+        values = entity.__dict__
+        for column, attribute in EntityColumns.ATTRIBUTES.items():
+            self._columns[column][row] = values.pop(attribute)
+
+        for key, column in EnergyStock.KEYS.items():
+            self._columns[column][row] = values['energies_stock'][key]
+        values['energies_stock'] = EnergyStock(columns=self,
+                                               row=row)
+
+        self._live[row] = True
+        values['_row'] = row
+        values['_columns'] = self
+
+        return row
+
+    def detach(self, entity: Entity) -> None:
+        """Public method:
+            Move the scalar values of an entity back into it and free its row
+
+        Args:
+            entity (Entity): entity to detach
+        """
+        if entity.__dict__.get('_columns') is not self:
+            return
+
+        values = entity.__dict__
+        row = values['_row']
+        for column, attribute in EntityColumns.ATTRIBUTES.items():
+            values[attribute] = int(self._columns[column][row])
+
+        values['energies_stock'] = {key: int(self._columns[column][row])
+                                    for key, column in EnergyStock.KEYS.items()}
+
+        values['_row'] = -1
+        values['_columns'] = None
+
+        self._live[row] = False
+        self.entities[row] = None
+        self.free_rows.append(row)
+
+    def export(self, entity: Entity) -> Dict[str, Any]:
+        """Public method:
+            Get the attributes of an entity as if it was detached,
+            without detaching it
+
+        Args:
+            entity (Entity): entity to export
+
+        Returns:
+            Dict[str, Any]: attributes of the entity, its scalar values included
+        """
+        values = dict(entity.__dict__)
+        if values.get('_columns') is not self:
+            return values
+
+        row = values['_row']
+        for column, attribute in EntityColumns.ATTRIBUTES.items():
+            values[attribute] = int(self._columns[column][row])
+
+        values['energies_stock'] = {key: int(self._columns[column][row])
+                                    for key, column in EnergyStock.KEYS.items()}
+        values['_row'] = -1
+        values['_columns'] = None
+
+        return values
+
+    @staticmethod
+    def get_rows(entities: Sequence[Entity]) -> npt.NDArray[np.int64]:
+        """Public static method:
+            Get the rows of some attached entities
+
+        Args:
+            entities (Sequence[Entity]): attached entities
+
+        Returns:
+            npt.NDArray[np.int64]: row of each entity
+        """
+        return np.fromiter((entity.__dict__['_row'] for entity in entities),
+                           dtype=np.int64, count=len(entities))
+
+    def gather(self, rows: npt.NDArray[np.int64], names: Tuple[str, ...]) -> npt.NDArray[np.int64]:
+        """Public method:
+            Get some values of the entities of some rows
+
+        Args:
+            rows (npt.NDArray[np.int64]):   rows of the entities
+            names (Tuple[str, ...]):        names of the columns
+
+        Returns:
+            npt.NDArray[np.int64]: N×len(names) values, one row per entity
+        """
+        return np.column_stack([self._columns[name][rows] for name in names]).reshape(-1, len(names))
+
+    def age(self, amount: int = 1) -> None:
+        """Public method:
+            Age every entity
+
+        Args:
+            amount (int, optional): amount to increase the ages by. Defaults to 1.
+        """
+        self._columns['age'][self._live] += amount
+
+    def find_dying(self) -> Tuple[List[Entity], List[Entity]]:
+        """Public method:
+            Find the entities older than their maximum age
+            and the ones without blue energy left
+
+        Returns:
+            Tuple[List[Entity], List[Entity]]:  entities too old,
+                                                entities without blue energy
+        """
+        columns = self._columns
+        too_old = self._live & (columns['age'] > columns['max_age'])
+        starving = self._live & ~too_old & (columns['blue_energy'] <= 0)
+
+        return ([self.entities[row] for row in np.flatnonzero(too_old)],
+                [self.entities[row] for row in np.flatnonzero(starving)])
@@ -15,7 +15,9 @@ class Resource(SimulatedObject):
         Inanimated objects used as resources by entities
 
     Attributes:
-        quantity (int): collectible amount
+        quantity (int):     collectible amount
+        birth_cycle (int):  cycle in which the resource was placed in the world
+        expiry (int):       number of cycles before the resource expires
     """
     DEFAULTY_EXPIRY: Final[int] = config['Simulation']['Resource']['expiry_date']
     def __init__(self,
@@ -39,8 +41,8 @@ class Resource(SimulatedObject):
 
         self.quantity: int = quantity or randint(10,100) # collectible amount of resources
         size: int = size or int(1 + log(quantity, 2))
-        self.age: int = 0
-        self.expiry: int = expiry
+        self.birth_cycle: int = 0                        # cycle in which the resource was placed in the world
+        self.expiry: int = expiry                        # number of cycles before the resource expires
 
         self.owner: Optional[int] = owner_id # unique identifier of owner
 
@@ -50,17 +52,27 @@ class Resource(SimulatedObject):
                          size=size,
                          appearance=appearance)
 
-    def update(self, environment) -> None:
+    @property
+    def expiry_cycle(self) -> int:
+        """Property:
+            Return the cycle at the end of which the resource expires
+
+        Returns:
+            int: expiry cycle
+        """
+        return self.birth_cycle + self.expiry
+
+    def get_age(self, cycle: int) -> int:
         """Public method:
-            Increase the life time of 1 cycle,
-            remove if reached expiry date
+            Get the number of cycles since the resource was placed in the world
 
         Args:
-            environment (Environment): energy's environment
+            cycle (int): current cycle
+
+        Returns:
+            int: age of the resource
         """
-        self.age += 1
-        if self.age >= self.expiry:
-            environment.remove_resource(resource=self)
+        return cycle - self.birth_cycle
 
 
 class EnergyType(enum.Enum):
@@ -17,9 +17,12 @@ import numpy.typing as npt
 from project.src.rtNEAT.brain import Brain
 
 from .actions import *
+from .columns import Column, EnergyStockColumn, EntityColumns
 from .energies import Energy, EnergyType, Resource
-from .running.config import config
-from .universal import EntityType, Position, SimulatedObject
+from .lineage import Lineage
+from .running.config import SimContext, config, default_context
+from .universal import (EntityType, Position, SimulatedObject,
+                        get_offset_tables)
 
 
 class Direction(enum.Enum):
@@ -46,7 +49,11 @@ class Entity(SimulatedObject):
         generation (int):                   # generation the entity was born in
         birthday (int):                     # cycle in which the entity was born
         species (int):                      # species the entity is part of
-        ancestors (Dict[int, Entity]):      # ancestors
+        parents (Tuple[int, int]):          # ids of the parents, 0 if unknown
+        lineage (Optional[Lineage]):        # lineage of the simulation the entity lives in
+        context (SimContext):               # settings of the simulation the entity lives in
+        _columns (Optional[EntityColumns]): # columns storing age, size, max age, action cost and energies
+        _row (int):                         # row of the entity in the columns, -1 if not attached
         _age (int):                         # time since birth
         _max_age (int):                     # maximum longevity before dying
         _adult_size (int):                  # size to reach before becoming adult
@@ -62,6 +69,7 @@ class Entity(SimulatedObject):
         update:             update entity
     """
 
+    # Settings of the process configuration at import, simulations read their own context
     MAX_AGE_SIZE_COEFF: Final[int] = config['Simulation']['Entity']['max_age_size_coeff']
     GROWTH_ENERGY_REQUIRED: Final[int] = config['Simulation']['Entity']['growth_energy_required']
     CHILD_ENERGY_COST_DIVISOR: Final[int] = config['Simulation']['Entity']['child_energy_cost_divisor']
@@ -73,6 +81,12 @@ class Entity(SimulatedObject):
     INITIAL_ACTION_COST: Final[int] = config['Simulation']['Entity']['init_action_cost']
     INITIAL_MAX_AGE: Final[int] = config['Simulation']['Entity']['init_max_age']
 
+    # Scalar state stored in the columns of the simulation once the entity is part of one
+    age = Column()
+    size = Column()
+    _max_age = Column()
+    _action_cost = Column()
+    energies_stock = EnergyStockColumn()
 
     def __init__(self,
                  position: Tuple[int, int],
@@ -86,6 +100,7 @@ class Entity(SimulatedObject):
                  red_energy: int = INITIAL_RED_ENERGY,
                  max_age: int = 0,
                  appearance: str = "",
+                 context: Optional[SimContext] = None,
                  ):
         """Super constructor:
             Get the necessary information for an entity
@@ -103,9 +118,15 @@ class Entity(SimulatedObject):
             blue_energy (int, optional):    amount of blue energy owned. Defaults to INITIAL_BLUE_ENERGY.
             red_energy (int, optional):     amount of red energy owned. Defaults to INITIAL_RED_ENERGY.
             appearance (str, optional):     path to sprite's image. Defaults to "".
+            context (Optional[SimContext], optional): settings of the simulation,
+                                                      the process configuration if None. Defaults to None.
         """
 
+        self.context: SimContext = (context if context is not None   # settings of the simulation
+                                    else default_context)
         appearance = "models/entities/" + appearance
+        self._columns: Optional[EntityColumns] = None           # columns storing the scalar state
+        self._row: int = -1                                     # row of the entity in the columns
         super().__init__(sim_obj_id=entity_id,
                          position=position,
                          size=size,
@@ -121,9 +142,11 @@ class Entity(SimulatedObject):
         self.generation: int = generation                       # generation the entity was born in
         self.birthday: int = birthday                           # cycle in which the entity was born
         self.species: int = 0                                   # species the entity is part of
-        self.ancestors: Dict[int, Entity] = {}                  # ancestors
+        self.parents: Tuple[int, int] = (0, 0)                  # ids of the parents, 0 if unknown
+        self.lineage: Optional[Lineage] = None                  # lineage of the simulation the entity lives in
         self.age: int = 0                                       # time since birth
-        self._max_age: int = max_age or Entity.INITIAL_MAX_AGE  # maximum longevity before dying
+        self._max_age: int = (max_age or                        # maximum longevity before dying
+                              self.context['Simulation']['Entity']['init_max_age'])
         self.gained_energy: float = 0.0
 
         self._adult_size: int = adult_size                      # size to reach before becoming adult
@@ -142,6 +165,32 @@ class Entity(SimulatedObject):
             self._create_brain()
 
 
+    def _get_column_values(self) -> Dict[str, Any]:
+        """Private method:
+            Get the scalar state of the entity, stored in columns or not
+
+        Returns:
+            Dict[str, Any]: values by attribute name
+        """
+        return {'age': self.age,
+                'size': self.size,
+                '_max_age': self._max_age,
+                '_action_cost': self._action_cost,
+                'energies_stock': dict(self.energies_stock)}
+
+    @property
+    def ancestors(self) -> npt.NDArray[np.int64]:
+        """Property:
+            Return the ids of the entity's ancestors found in the lineage
+
+        Returns:
+            npt.NDArray[np.int64]: sorted ids of the ancestors
+        """
+        if self.lineage is None:
+            return np.zeros(0, dtype=np.int64)
+
+        return self.lineage.get_ancestors(entity_id=self.id)
+
     def _create_brain(self):
         """Private method:
             Create a brain's genotype and its associated phenotype
@@ -150,23 +199,30 @@ class Entity(SimulatedObject):
     def on_birth(self, parent1: Entity, parent2: Entity) -> None:
         """Public method:
             Event: on entity's birth,
-            add parents and their ancestors to ancestors set,
+            record the parents in the lineage,
             Transplant a brain by crossovering parent's ones.
 
         Args:
             parent1 (Entity): first parent
             parent2 (Entity): second parent
         """
-        self.ancestors: Dict[int, Entity] = ({parent1.id: parent1,
-                                              parent2.id: parent2}
-                                            | parent1.ancestors
-                                            | parent2.ancestors)
+        self.parents = (parent1.id, parent2.id)
+        if self.lineage is None:
+            self.lineage = parent1.lineage
+
+        if self.lineage is not None:
+            self.lineage.add_birth(child_id=self.id,
+                                   parent1_id=parent1.id,
+                                   parent2_id=parent2.id)
 
         self.generation = max(parent1.generation, parent2.generation) + 1
 
         brain = Brain.crossover(brain_id=self.id,
                                 parent1=parent1.brain,
-                                parent2=parent2.brain)
+                                parent2=parent2.brain,
+                                difficulty=self.context.difficulty_level,
+                                settings=self.context['NEAT'],
+                                innov_table=self.context.innov_table)
 
         self._transplant_brain(brain=brain)
 
@@ -178,6 +234,10 @@ class Entity(SimulatedObject):
         Args:
             brain (Brain): brain to transplant
         """
+        # Free the place of the replaced brain
+        if getattr(self, 'brain', None):
+            self.brain.release()
+
         self.brain = brain
         self.mind = brain.phenotype
         self.mind.verify_post_crossover()
@@ -213,6 +273,15 @@ class Entity(SimulatedObject):
         """
         return self.energies_stock[EnergyType.RED.value]
 
+    @property
+    def max_age(self) -> int:
+        """Public property:
+
+        Returns:
+            int: maximum longevity before dying
+        """
+        return self._max_age
+
     def _change_status(self, new_status: Status, *statuses: Status):
         """Private method:
             change the status of the entity
@@ -267,11 +336,13 @@ class Entity(SimulatedObject):
             bool:   True if it has enough energy
                     False if energy is lacking
         """
+        settings = self.context['Simulation']['Entity']
         if self._is_adult:
-            energy_required = self.size * Entity.GROWTH_ENERGY_REQUIRED
+            energy_required = self.size * settings['growth_energy_required']
 
         else:
-            energy_required = self.size * Entity.CHILD_GROWTH_ENERGY_REQUIRED
+            energy_required = self.size * int(settings['growth_energy_required']
+                                              / settings['child_energy_cost_divisor'])
 
 
         return self._can_perform_action(energy_type=EnergyType.RED,
@@ -288,7 +359,7 @@ class Entity(SimulatedObject):
             # maximum age,
             # action cost
             self.size += 1
-            self._max_age += Entity.MAX_AGE_SIZE_COEFF
+            self._max_age += self.context['Simulation']['Entity']['max_age_size_coeff']
             if self._action_cost < 5:
                 self._action_cost += 1
 
@@ -431,7 +502,7 @@ class Entity(SimulatedObject):
         else:
             energy_type = EnergyType.RED
 
-        difficulty = config['Simulation']['difficulty_level']
+        difficulty = self.context.difficulty_level
         quantity = int(abs(energy)*250/difficulty)
         self._action_drop_energy(energy_type=energy_type,
                                  quantity=quantity,
@@ -480,7 +551,7 @@ class Entity(SimulatedObject):
             resource (Resource): resource picked up
         """
         # Keep track of owner of resources picked up
-        if config.evaluate:
+        if self.context['Simulation']['evaluate']:
             if resource.owner:
                 self.trade_partners.get(resource.owner, 0) + 1
 
@@ -489,7 +560,9 @@ class Entity(SimulatedObject):
             quantity = resource.quantity
             if resource.tree_planter:
                 if (resource.tree_planter == self.id
-                    or resource.tree_planter in self.ancestors):
+                    or (self.lineage is not None
+                        and self.lineage.is_ancestor(entity_id=self.id,
+                                                     ancestor_id=resource.tree_planter))):
                     quantity += 10 * self.size
 
             self._gain_energy(energy_type=resource.type,
@@ -504,24 +577,27 @@ class Entity(SimulatedObject):
         """Private method:
             Action: Death of the entity
         """
-        if config['Log']['death']:
+        if self.context['Log']['death']:
             print(f"{self} died of {cause} at age {self.age}")
         self.status = Status.DEAD
 
 
-    def update(self, environment: Environment) -> None:
+    def update(self, environment: Environment, age: bool = True) -> None:
         """Public method:
             Update entity, by resetting status,
             increment age, and activate the mind
 
         Args:
-            environment (Environment): environment on which the entity live
+            environment (Environment):  environment on which the entity live
+            age (bool, optional):       increase the age, False when the whole population
+                                        was aged at once. Defaults to True.
         """
         # Reset status
         self._change_status(new_status=Status.ALIVE)
         self.actions = []
         # Increase age by 1
-        self._increase_age()
+        if age:
+            self._increase_age()
 
         # Activate mind and return the result
         self._activate_mind(environment=environment)
@@ -554,13 +630,20 @@ class Entity(SimulatedObject):
 
     def _activate_mind(self, environment: Environment) -> None:
         """Private method:
-            Activate entity's brain
+            Activate entity's brain,
+            with the outputs evaluated in batch at the start of the cycle if any
         """
-        inputs = self._normalize_inputs(environment=environment)
-        mind = self.brain.phenotype
-        outputs = mind.activate(input_values=inputs)
+        outputs = environment.get_thoughts(entity=self)
+        if outputs is None:
+            inputs = environment.get_sensed_inputs(entity=self)
+            if inputs is None:
+                inputs = self._normalize_inputs(environment=environment)
+
+            mind = self.brain.phenotype
+            outputs = mind.activate(input_values=inputs)
+
         self._interpret_outputs(outputs=outputs)
-        
+
     def _find_closest_object_inputs(self, objects_around: Set[Any], sight_range: float) -> Tuple[float, float]:
         """Private method:
             Find the necessary information about the closest object around,
@@ -575,16 +658,24 @@ class Entity(SimulatedObject):
                                     norm_angle: normalized angle of the closest object
         """
         close_distance: float = sight_range
-        closest_object: SimulatedObject = None
-        own_distance = self.pos.distance
+        closest_offset: Optional[Tuple[int, int]] = None
+
+        # Objects further than the radius of the tables are out of sight
+        radius = int(sight_range)
+        distances, norm_angles = get_offset_tables(radius=radius)
+        x, y = self.position
         for obj in objects_around:
-            distance = own_distance(other_pos=obj.pos)
+            dx, dy = obj.pos.x - x + radius, obj.pos.y - y + radius
+            if not (0 <= dx <= 2*radius and 0 <= dy <= 2*radius):
+                continue
+
+            distance = distances[dx, dy]
             if  distance <= close_distance:
                 close_distance = distance
-                closest_object = obj
+                closest_offset = dx, dy
 
-        if closest_object:
-            norm_angle: float = self.pos.norm_angle(other_pos=closest_object.pos)
+        if closest_offset:
+            norm_angle: float = norm_angles[closest_offset]
             norm_distance: float = ((sight_range - close_distance)
                                    /(sight_range - 1))
         else:
@@ -615,6 +706,7 @@ class Animal(Entity):
             on_reproduction:    event when reproducing
 
     """
+    # Settings of the process configuration at import, simulations read their own context
     INITIAL_ANIMAL_BLUE_ENERGY: Final[int] = config['Simulation']["Animal"]['init_blue_energy']
     INITIAL_ANIMAL_RED_ENERGY: Final[int] = config['Simulation']["Animal"]['init_red_energy']
 
@@ -640,9 +732,11 @@ class Animal(Entity):
                  action_cost: int = 1,
                  blue_energy: int = 10,
                  red_energy: int = 10,
+                 context: Optional[SimContext] = None,
                  ):
 
-        adult_size = adult_size or Animal.INIT_ADULT_SIZE
+        context = context if context is not None else default_context
+        adult_size = adult_size or context['Simulation']['Animal']['init_adult_size']
 
         super().__init__(position=position,
                          entity_id=animal_id,
@@ -653,7 +747,8 @@ class Animal(Entity):
                          action_cost=action_cost,
                          blue_energy=blue_energy,
                          red_energy=red_energy,
-                         appearance="animal.png")
+                         appearance="animal.png",
+                         context=context)
 
         self._pocket: Optional[Seed] = None # pocket in which to store seed
 
@@ -670,17 +765,18 @@ class Animal(Entity):
         """
         return (self._is_adult and
                 self.has_enough_energy(energy_type=EnergyType.RED,
-                                       quantity=Animal.REPRODUCTION_COST * 5))
+                                       quantity=self.context['Simulation']['Animal']['reproduction_cost'] * 5))
 
     def on_reproduction(self) -> None:
         """Public method:
             Event: when reproducing
         """
-        if random() < Animal.DIE_GIVING_BIRTH_PROB:
+        settings = self.context['Simulation']['Animal']
+        if random() < settings['die_giving_birth_prob']:
             self._die(cause="giving birth")
 
         self._loose_energy(energy_type=EnergyType.RED,
-                           quantity=Animal.REPRODUCTION_COST * 5)
+                           quantity=settings['reproduction_cost'] * 5)
 
     def _create_brain(self) -> None:
         """Private method:
@@ -703,11 +799,12 @@ class Animal(Entity):
                                                     "reproduce": []
                                                 }} """
 
-        animal_genome_data: Dict[str, Any] = {"complete": Animal.COMPLETE_NETWORK,
-                                                "n_inputs": Animal.NUM_INPUTS,
-                                                "n_outputs": Animal.NUM_OUTPUTS,
-                                                "n_actions": Animal.NUM_ACTIONS,
-                                                "n_values": Animal.NUM_VALUES,
+        settings = self.context['Simulation']['Animal']
+        animal_genome_data: Dict[str, Any] = {"complete": settings['complete'],
+                                                "n_inputs": settings['num_input'],
+                                                "n_outputs": settings['num_output'],
+                                                "n_actions": settings['num_action'],
+                                                "n_values": settings['num_output'] - settings['num_action'],
                                                 "actions":{
                                                     "move": [0],
                                                     "grow": [],
@@ -718,7 +815,9 @@ class Animal(Entity):
                                                 }}
 
         self.brain = Brain.genesis(brain_id=self.id,
-                                   genome_data=animal_genome_data)
+                                   genome_data=animal_genome_data,
+                                   settings=self.context['NEAT'],
+                                   innov_table=self.context.innov_table)
 
         self.mind = self.brain.phenotype
         self.mind.verify_post_genesis()
@@ -762,7 +861,7 @@ class Animal(Entity):
         """
         # Verifiy that enough enough energy is available
         if self._can_perform_action(energy_type=EnergyType.RED,
-                                    quantity=Animal.PLANTING_COST):
+                                    quantity=self.context['Simulation']['Animal']['planting_cost']):
             
             action = PlantTreeAction(coordinates=self.position,
                                      seed=self._pocket)
@@ -862,18 +961,19 @@ class Animal(Entity):
             np.array: array containing the normalized input values
         """
         age = self.age/self._max_age
-        size = self.size/config["Simulation"]["Animal"]["normal_size"]
-        blue_energy, red_energy = (energy/config["Simulation"]["Animal"]["normal_energy"]
+        settings = self.context['Simulation']['Animal']
+        size = self.size/settings["normal_size"]
+        blue_energy, red_energy = (energy/settings["normal_energy"]
                                    for energy in self.energies_stock.values())
 
-        entity_sight_range = config['Simulation']['Animal']['entity_sight_range']
+        entity_sight_range = settings['entity_sight_range']
         animals_around = environment.find_animals_around(coordinates=self.position,
                                                          radius=entity_sight_range)
 
         animal_close_distance, animal_close_angle = self._find_closest_object_inputs(objects_around=animals_around,
                                                                                      sight_range=entity_sight_range)
 
-        energy_sight_range = config['Simulation']['Animal']['energy_sight_range']
+        energy_sight_range = settings['energy_sight_range']
         energies_around = environment.find_energies_around(coordinates=self.position,
                                                            radius=energy_sight_range)
 
@@ -896,31 +996,32 @@ class Animal(Entity):
         Args:
             outputs (np.array):         array or outputs values from brain activation
         """
+        settings = self.context['Simulation']['Animal']
         for key, value in outputs.items():
             output = self.mind.trigger_outputs[key]
             match output.name:
                 case 'move':
-                    if value >= config['Simulation']['Animal']['move_threshold']:
+                    if value >= settings['move_threshold']:
                         self._decide_move(output=output)
 
                 case 'grow':
-                    if value >= config['Simulation']['Animal']['grow_threshold']:
+                    if value >= settings['grow_threshold']:
                         self._decide_grow()
 
                 case 'reproduce':
-                    if value >= config['Simulation']['Animal']['reproduction_threshold']:
+                    if value >= settings['reproduction_threshold']:
                         self._decide_reproduce()
 
                 case 'plant':
-                    if value >= config['Simulation']['Animal']['plant_threshold']:
+                    if value >= settings['plant_threshold']:
                         self._decide_plant_tree()
                         
                 case 'drop':
-                    if value >= config['Simulation']['Animal']['drop_threshold']:
+                    if value >= settings['drop_threshold']:
                         self._decide_drop(output=output)
                         
                 case 'paint':
-                    if value >= config['Simulation']['Animal']['paint_threshold']:
+                    if value >= settings['paint_threshold']:
                         self._decide_paint(output=output)
 
         """ if (self._is_adult
@@ -949,8 +1050,9 @@ class Animal(Entity):
         #Inputs
         ## Internal properties
         age = self.age/self._max_age
-        size = self.size/config["Simulation"]["Animal"]["normal_size"]
-        blue_energy, red_energy = (energy/config["Simulation"]["Animal"]["normal_energy"]
+        settings = self.context['Simulation']['Animal']
+        size = self.size/settings["normal_size"]
+        blue_energy, red_energy = (energy/settings["normal_energy"]
                                    for energy in self.energies_stock.values())
         ## Perceptions
         entities = environment.find_if_entities_around(coordinates=self.position,
@@ -1050,7 +1152,7 @@ class Animal(Entity):
             outputs (np.array):         array or outputs values from brain activation
         """
         # Get the most absolute active value of all the outputs
-        if random() < config['Simulation']['Animal']['random_action_prob']:
+        if random() < self.context['Simulation']['Animal']['random_action_prob']:
             most_active_output_id = choice(list(outputs.keys()))
         else:
             most_active_output_id = max(outputs, key = lambda k : abs(outputs.get(k, 0.0)))
@@ -1103,6 +1205,7 @@ class Tree(Entity):
             on_death:       event on tree death
             create_seed:    create a seed on current position
     """
+    # Settings of the process configuration at import, simulations read their own context
     INIT_ADULT_SIZE: Final[int] = config['Simulation']['Tree']['init_adult_size']
     INIT_MAX_AGE: Final[int] = config['Simulation']['Tree']['init_max_age']
     INITIAL_TREE_BLUE_ENERGY: Final[int] = config['Simulation']["Tree"]['init_blue_energy']
@@ -1127,6 +1230,7 @@ class Tree(Entity):
                  production_type: Optional[EnergyType] = None,
                  planted_times: int = 1,
                  planter: int = 0,
+                 context: Optional[SimContext] = None,
                  ):
         """Constructor:
             Initialize a tree
@@ -1142,10 +1246,12 @@ class Tree(Entity):
             blue_energy (int, optional):                        amount of blue energy owned. Defaults to 10.
             red_energy (int, optional):                         amount of red energy owned. Defaults to 10.
             production_type (Optional[EnergyType], optional):   type of energy produced. Defaults to None.
+            context (Optional[SimContext], optional):           settings of the simulation,
+                                                                the process configuration if None. Defaults to None.
         """
-
-        adult_size = adult_size or Tree.INIT_ADULT_SIZE
-        max_age = max_age or Tree.INIT_MAX_AGE
+        context = context if context is not None else default_context
+        adult_size = adult_size or context['Simulation']['Tree']['init_adult_size']
+        max_age = max_age or context['Simulation']['Tree']['init_max_age']
 
         super().__init__(position=position,
                          entity_id=tree_id,
@@ -1155,7 +1261,8 @@ class Tree(Entity):
                          action_cost=action_cost,
                          blue_energy=blue_energy,
                          red_energy=red_energy,
-                         appearance="plant.png")
+                         appearance="plant.png",
+                         context=context)
 
         self._production_type: EnergyType = (production_type or         # Type of energy produced by the tree
                                              choice(list(EnergyType)))
@@ -1170,11 +1277,12 @@ class Tree(Entity):
         """Private method:
             Create a tree brain's genotype and its associated phenotype
         """
-        tree_genome_data: Dict[str, Any] = {"completed": Tree.COMPLETE_NETWORK,
-                                            "n_inputs": Tree.NUM_TREE_INPUTS,
-                                            "n_outputs": Tree.NUM_TREE_OUTPUTS,
-                                            "n_actions": Tree.NUM_TREE_ACTIONS,
-                                            "n_values": Tree.NUM_TREE_VALUES,
+        settings = self.context['Simulation']['Tree']
+        tree_genome_data: Dict[str, Any] = {"completed": settings['complete'],
+                                            "n_inputs": settings['num_tree_input'],
+                                            "n_outputs": settings['num_tree_output'],
+                                            "n_actions": settings['num_tree_action'],
+                                            "n_values": settings['num_tree_output'] - settings['num_tree_action'],
                                             "actions":{
                                                 "produce": [],
                                                 "drop": [0,1],
@@ -1183,7 +1291,9 @@ class Tree(Entity):
                                             }}
 
         self.brain = Brain.genesis(brain_id=self.id,
-                                   genome_data=tree_genome_data)
+                                   genome_data=tree_genome_data,
+                                   settings=self.context['NEAT'],
+                                   innov_table=self.context.innov_table)
 
         self.mind = self.brain.phenotype
         self.mind.verify_post_genesis()
@@ -1202,7 +1312,8 @@ class Tree(Entity):
             Dict: dictionary containing the genetic information
         """
 
-        original_dict: Dict[str, Any] = self.__dict__   # original dictionary with tree data
+        original_dict: Dict[str, Any] = (self.__dict__
+                                         | self._get_column_values())  # original dictionary with tree data
         genetic_data: Dict[str, Any] = {}               # new dictionary with formatted value
         args = inspect.getfullargspec(Tree)[0]          # list of parameters to create a tree
         # loop through original dictionary and
@@ -1262,7 +1373,7 @@ class Tree(Entity):
         """Public method:
             Event: Produce energy
         """
-        if self.size < Tree.INIT_ADULT_SIZE:
+        if self.size < self.context['Simulation']['Tree']['init_adult_size']:
             pass
 
         self._gain_energy(energy_type=self._production_type,
@@ -1295,11 +1406,12 @@ class Tree(Entity):
         #Inputs
         ## Internal properties
         age = self.age/self._max_age
-        size = self.size/config["Simulation"]["Tree"]["normal_size"]
-        blue_energy, red_energy = (energy/config["Simulation"]["Tree"]["normal_energy"]
+        settings = self.context['Simulation']['Tree']
+        size = self.size/settings["normal_size"]
+        blue_energy, red_energy = (energy/settings["normal_energy"]
                                    for energy in self.energies_stock.values())
         ## Perceptions
-        energy_sight_range = config['Simulation']['Tree']['energy_sight_range']
+        energy_sight_range = settings['energy_sight_range']
         energies_around = environment.find_energies_around(coordinates=self.position,
                                                            radius=energy_sight_range)
         
@@ -1373,12 +1485,17 @@ class Seed(Resource):
     def __repr__(self):
         return f"Seed {self.id}"
 
-    def germinate(self) -> Tree:
+    def germinate(self, context: Optional[SimContext] = None) -> Tree:
         """Public method:
             Spawn a tree from genetic data
             contained in this seed
 
+        Args:
+            context (Optional[SimContext], optional):   settings of the simulation the tree grows in,
+                                                        the process configuration if None. Defaults to None.
+
         Returns:
             Tree: tree spawned
         """
-        return Tree(**self.genetic_data)
+        return Tree(**self.genetic_data,
+                    context=context)
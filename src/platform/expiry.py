@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from energies import Resource
+
+from typing import Dict, List, Sequence
+
+
+class ExpiryWheel:
+    """Class:
+        Resources of a simulation bucketed by the cycle they expire in,
+        so that each cycle only looks at the resources expiring then
+
+        Attributes:
+            _buckets (Dict[int, Dict[Resource, None]]):     resources by expiry cycle, in order of scheduling
+            _cycles (Dict[Resource, int]):                  expiry cycle of each scheduled resource
+            _next_cycle (int):                              first cycle whose bucket was not emptied yet
+
+        Methods:
+            schedule:       register the expiry cycle of a resource
+            schedule_many:  register many resources expiring at the same cycle
+            cancel:         forget a resource removed before expiring
+            pop_expired:    remove and return the resources expiring up to a cycle
+    """
+    def __init__(self):
+        """Constructor:
+            Initialize an empty wheel
+        """
+        self._buckets: Dict[int, Dict[Resource, None]] = {}     # resources by expiry cycle
+        self._cycles: Dict[Resource, int] = {}                  # expiry cycle of each scheduled resource
+        self._next_cycle: int = 0                               # first cycle whose bucket was not emptied yet
+
+    def __len__(self) -> int:
+        return len(self._cycles)
+
+    def __contains__(self, resource: Resource) -> bool:
+        return resource in self._cycles
+
+    def schedule(self, resource: Resource, cycle: int) -> None:
+        """Public method:
+            Register the expiry cycle of a resource,
+            replacing the previous one if it was already scheduled,
+            cycles already emptied are moved to the next one
+
+        Args:
+            resource (Resource):    resource to schedule
+            cycle (int):            cycle at the end of which the resource expires
+        """
+        self.cancel(resource=resource)
+
+        cycle = max(cycle, self._next_cycle)
+        self._buckets.setdefault(cycle, {})[resource] = None
+        self._cycles[resource] = cycle
+
+    def schedule_many(self, resources: Sequence[Resource], cycle: int) -> None:
+        """Public method:
+            Register many resources expiring at the same cycle at once
+
+        Args:
+            resources (Sequence[Resource]): resources to schedule
+            cycle (int):                    cycle at the end of which the resources expire
+        """
+        for resource in resources:
+            if resource in self._cycles:
+                self.cancel(resource=resource)
+
+        cycle = max(cycle, self._next_cycle)
+        self._buckets.setdefault(cycle, {}).update(dict.fromkeys(resources))
+        self._cycles.update(dict.fromkeys(resources, cycle))
+
+    def cancel(self, resource: Resource) -> None:
+        """Public method:
+            Forget a resource removed before expiring
+
+        Args:
+            resource (Resource): resource to forget
+        """
+        cycle = self._cycles.pop(resource, None)
+        if cycle is None:
+            return
+
+        bucket = self._buckets[cycle]
+        del bucket[resource]
+        if not bucket:
+            del self._buckets[cycle]
+
+    def pop_expired(self, cycle: int) -> List[Resource]:
+        """Public method:
+            Remove and return the resources expiring up to a cycle
+
+        Args:
+            cycle (int): current cycle
+
+        Returns:
+            List[Resource]: expired resources, in order of scheduling
+        """
+        expired: List[Resource] = []
+        for expiry_cycle in range(self._next_cycle, cycle + 1):
+            bucket = self._buckets.pop(expiry_cycle, None)
+            if bucket:
+                expired.extend(bucket)
+
+        for resource in expired:
+            del self._cycles[resource]
+
+        self._next_cycle = max(self._next_cycle, cycle + 1)
+
+        return expired
@@ -2,9 +2,8 @@ from __future__ import annotations
 
 import enum
 from functools import lru_cache
-from itertools import combinations
 from random import sample
-from typing import Any, Optional, Set, Tuple, Type
+from typing import Any, Dict, Optional, Sequence, Set, Tuple, Type
 
 import numpy as np
 import numpy.typing as npt
@@ -22,6 +21,51 @@ class SubGridType(enum.Enum):
     COLOR = 2
 
 
+class CellKind(enum.IntFlag):
+    """Enum:
+        Kind of object occupying a cell,
+        bits can be combined into a search mask
+    """
+    EMPTY = 0
+    ANIMAL = 1
+    TREE = 2
+    BLUE_ENERGY = 4
+    RED_ENERGY = 8
+    SEED = 16
+    ENTITY = ANIMAL | TREE
+    ENERGY = BLUE_ENERGY | RED_ENERGY
+    RESOURCE = ENERGY | SEED
+
+
+CELL_KINDS: Dict[str, CellKind] = {"Animal": CellKind.ANIMAL,
+                                   "Tree": CellKind.TREE,
+                                   "Entity": CellKind.ENTITY,
+                                   "BlueEnergy": CellKind.BLUE_ENERGY,
+                                   "RedEnergy": CellKind.RED_ENERGY,
+                                   "Energy": CellKind.ENERGY,
+                                   "Seed": CellKind.SEED,
+                                   "Resource": CellKind.RESOURCE}
+
+
+@lru_cache
+def get_cell_kind(cls: Type) -> CellKind:
+    """Function:
+        Get the kind of cell corresponding to a class,
+        based on the closest known class in its hierarchy
+
+    Args:
+        cls (Type): class to get the kind of
+
+    Returns:
+        CellKind: kind of cell, EMPTY if the class is unknown
+    """
+    for base_class in cls.__mro__:
+        if (kind := CELL_KINDS.get(base_class.__name__)) is not None:
+            return kind
+
+    return CellKind.EMPTY
+
+
 class SubGrid:
     """Class:
         Layer of the grid
@@ -31,14 +75,20 @@ class SubGrid:
             data_type (Any):                type of data allowed
             initial_value (Any):            value to fill empty cells with
             _array (npt.NDArray):           array of values
+            padding_value (Any):            value of cells out of boundaries in sub regions
+            _padded_buffers (Dict):         reusable padded windows, by radius
+            kind_grid (Optional[SubGrid]):  kind of the object in each cell (object layers only)
+            id_grid (Optional[SubGrid]):    id of the object in each cell (object layers only)
 
         Methods:
             are_available_coordinates:      check if the coordinates correspond to valid cell
             are_vacant_coordinates:         check if a cell is vacant
             are_coordinates_in_bounds:      check if a cell is in the bounds of the grid
+            find_vacant_coordinates:        check which of many cells are in bounds and vacant
             are_instance_baseclass_around:  find all the instance of a certain base class in an area
             find_free_coordinates:          find a free cell in range
             select_free_coordinates:        select randomly from the free cells available
+            place_many_on_grid:             place many values on the grid in one pass
             update_cell:                    move an element from a cell to another
             empty_cell:                     empty the cell, putting it back to inital state
             get_cell_value:                 get the value of a cell
@@ -49,6 +99,7 @@ class SubGrid:
         dimensions: Tuple[int, ...],
         data_type: Any = Any,
         initial_value: Any = None,
+        padding_value: Any = None,
     ):
         """Constructor:
             Initialize a subgrid
@@ -57,6 +108,7 @@ class SubGrid:
             dimensions (Tuple[int, int]):   dimensions of the grid
             data_type (Any, optional):      type of data allowed. Defaults to Any.
             initial_value (Any, optional):  value to fill the emtpy cells with. Defaults to None.
+            padding_value (Any, optional):  value of cells out of boundaries. Defaults to initial_value.
         """
 
         self.dimensions: Tuple[int, ...]  = dimensions                      # dimensions of the grid
@@ -67,6 +119,24 @@ class SubGrid:
                                                 dtype=data_type
         )
 
+        self.padding_value: Any = (initial_value if padding_value is None   # value of cells out of boundaries
+                                   else padding_value)
+        self._padded_buffers: Dict[int, npt.NDArray[Any]] = {}              # reusable windows for borders, by radius
+
+        self.kind_grid: Optional[SubGrid] = None                            # kind of the object in each cell
+        self.id_grid: Optional[SubGrid] = None                              # id of the object in each cell
+
+        # Objects layers keep typed integer layers in step,
+        # so that neighbourhood queries are done on masks
+        if self._array.dtype == object:
+            self.kind_grid = SubGrid(dimensions=self.dimensions,
+                                     data_type=np.uint8,
+                                     initial_value=CellKind.EMPTY)
+
+            self.id_grid = SubGrid(dimensions=self.dimensions,
+                                   data_type=np.int64,
+                                   initial_value=0)
+
     @property
     def array(self) -> npt.NDArray[Any]:
         """Property:
@@ -86,6 +156,10 @@ class SubGrid:
         """
         self._array[coordinates] = self.initial_value
 
+        if self.kind_grid:
+            self.kind_grid.array[coordinates] = CellKind.EMPTY
+            self.id_grid.array[coordinates] = 0
+
     def _set_operation_valid(self, coordinates: Tuple[int, int], value: Any) -> bool:
         """Private method:
             Check if the set operation is valid, by applying 3 checks:
@@ -184,6 +258,87 @@ class SubGrid:
                     y < 0 or
                     y >= self.dimensions[1])
 
+    def find_vacant_coordinates(self, coordinates: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
+        """Public method:
+            Check in one mask operation which of many cells are in the bounds
+            of the grid and vacant, only the first of identical coordinates
+            counting as vacant (object layers only)
+
+        Args:
+            coordinates (npt.NDArray[np.int64]): N×2 coordinates of the cells to check
+
+        Returns:
+            npt.NDArray[np.bool_]: True for the cells that can be filled
+        """
+        coordinates = np.asarray(coordinates, dtype=np.int64).reshape(-1, 2)
+        xs, ys = coordinates.T
+        width, height = self.dimensions[:2]
+
+        vacant = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        vacant[vacant] = self.kind_grid.array[xs[vacant], ys[vacant]] == CellKind.EMPTY
+
+        # Keep the first occurrence of each cell
+        candidates = np.flatnonzero(vacant)
+        _, first = np.unique(xs[candidates] * height + ys[candidates],
+                             return_index=True)
+        vacant[:] = False
+        vacant[candidates[first]] = True
+
+        return vacant
+
+    def _clip_window(self, coordinates: Tuple[int, int],
+                     radius: int) -> Tuple[int, int, int, int]:
+        """Private method:
+            Clip a square window around some coordinates to the bounds of the grid
+
+        Args:
+            coordinates (Tuple[int, int]):  center of the window
+            radius (int):                   radius of the window
+
+        Returns:
+            Tuple[int, int, int, int]: x1, x2, y1, y2 bounds of the clipped window
+        """
+        width, height = self.dimensions[:2]
+        x, y = coordinates
+
+        return (min(max(x - radius, 0), width),
+                min(max(x + radius + 1, 0), width),
+                min(max(y - radius, 0), height),
+                min(max(y + radius + 1, 0), height))
+
+    def _find_mask_baseclass(
+        self,
+        base_class: Type,
+        coordinates: Tuple[int, int],
+        include_self: bool = True,
+        radius: int = 1
+        ) -> Tuple[npt.NDArray[np.bool_], Tuple[int, int, int, int]]:
+
+        """Private method:
+            Find the cells occupied by instances of a certain base class
+            in the window around some coordinates clipped to the grid
+
+        Args:
+            base_class (Type):              base class as reference for the search
+            coordinates (Tuple[int, int]):  coordinates to search around
+            include_self (bool, optional):  include the coordinates in the search. Defaults to True.
+            radius (int, optional):         radius of search. Defaults to 1.
+
+        Returns:
+            Tuple[npt.NDArray[np.bool_], Tuple[int, int, int, int]]:    boolean mask of the clipped window,
+                                                                        bounds of the clipped window
+        """
+        x1, x2, y1, y2 = bounds = self._clip_window(coordinates=coordinates,
+                                                    radius=radius)
+
+        mask: npt.NDArray[np.bool_] = (self.kind_grid.array[x1:x2, y1:y2]
+                                       & get_cell_kind(base_class)) != 0
+
+        if not include_self and self.are_coordinates_in_bounds(coordinates=coordinates):
+            mask[coordinates[0] - x1, coordinates[1] - y1] = False
+
+        return mask, bounds
+
     def are_instance_baseclass_around(
         self,
         coordinates: Tuple[int, int],
@@ -206,22 +361,15 @@ class SubGrid:
             np.array[bool]: boolean mask of instance of baseclass in cells
         """
 
-        subregion: npt.NDArray[Any] = self.get_sub_region(initial_pos=coordinates,
-                                                          radius=radius)
+        subregion: npt.NDArray[Any] = self.kind_grid.get_sub_region(initial_pos=coordinates,
+                                                                    radius=radius)
 
-        occupied_cells = []
-        for x in range(0, 2 * radius + 1):
-            for y in range(-0, 2 * radius + 1):
-                if (not include_self and
-                    x == int(radius / 2 + 1) and
-                    y == int(radius / 2 + 1)):
+        occupied_cells: npt.NDArray[np.bool_] = ((subregion & get_cell_kind(base_class)) != 0).flatten()
 
-                    continue
+        if not include_self:
+            occupied_cells = np.delete(occupied_cells, occupied_cells.size//2)
 
-                occupied_cells.append(Grid.is_subclass(derived=subregion[x, y],
-                                                       base_class=base_class))
-
-        return np.array(occupied_cells)
+        return occupied_cells
 
     def _find_coordinates_baseclass(
         self,
@@ -241,49 +389,11 @@ class SubGrid:
         Returns:
             Set[Tuple[int,int]]: set of found cells' coordinates
         """
+        mask, (x1, _, y1, _) = self._find_mask_baseclass(base_class=base_class,
+                                                         coordinates=coordinates,
+                                                         radius=radius)
 
-        if not (
-            self.are_coordinates_in_bounds(coordinates=tuple(np.add(coordinates, (-radius, -radius))))
-            and self.are_coordinates_in_bounds(coordinates=tuple(np.add(coordinates, (radius, radius))))
-        ):
-
-            search_interval = list(range(radius * 2 + 1))   # List from (0, 2*radius)
-            search_area = combinations(search_interval * 2, 2)        # ALl the combinations of coordinates
-
-            subregion: npt.NDArray[Any] = self.get_sub_region(
-                initial_pos=coordinates, radius=radius
-            )
-
-            # Optimised code to search if the cell at those coordinates contain an object
-            # that is a subclass of the class given, if yes add it to the list of coordinates.
-            # Avoid indexError when out of bounds
-            positions = {
-                tuple(np.add(coordinates, coordinate) - radius)
-                for x, y in set(search_area)
-                if Grid.is_subclass(derived=subregion[coordinate:= tuple((x, y))],
-                                    base_class=base_class)
-            }
-        else:
-            # Faster when no risk of indexError
-            search_interval = list(range(-radius, radius + 1))  # List from (-radius, radius)
-            search_area = combinations(search_interval * 2, 2)  # ALl the combinations of coordinates
-
-            # Optimised code to search if the cell at those coordinates contain an object
-            # that is a subclass of the class given, if yes add it to the list of coordinates
-            positions: Set[Tuple[int, int]] = {
-                coordinate
-                for x, y in set(search_area)
-                if (
-                    Grid.is_subclass(
-                        derived=self.get_cell_value(
-                            coordinate := tuple(np.add(coordinates, (x, y)))
-                        ),
-                        base_class=base_class,
-                    )
-                )
-            }
-
-        return positions
+        return {(int(x) + x1, int(y) + y1) for x, y in zip(*np.nonzero(mask))}
 
     def find_instances_baseclass_around(
         self, base_class: Any,
@@ -305,25 +415,13 @@ class SubGrid:
         Returns:
             Set[Any]: set of instances of the base class around
         """
+        mask, (x1, x2, y1, y2) = self._find_mask_baseclass(base_class=base_class,
+                                                           coordinates=coordinates,
+                                                           include_self=include_self,
+                                                           radius=radius)
 
-        instances = set()
-        search_interval = np.arange(-radius, radius + 1)  # List from (-radius, radius)
-        a, b = coordinates
-        for x in search_interval:
-            for y in search_interval:
-                if not include_self and x == 0 and y == 0:
-                    continue
-
-                position = (a+x, b+y)
-                obj = self.get_cell_value(coordinates=position)
-                if obj:
-                    if Grid.is_subclass(derived=obj,
-                                        base_class=base_class):
+        return set(self._array[x1:x2, y1:y2][mask])
 
-                        instances.add(obj)
-
-        return instances
-    
     def find_closest_instances_baseclass(
         self, base_class: Any,
         coordinates: Tuple[int, int],
@@ -331,57 +429,33 @@ class SubGrid:
     ) -> Set[Any]:
 
         """Private method:
-            Find all the instances of a certain base class around and
-            return a set containing them
+            Find the instances of a certain base class
+            on the closest ring around containing at least one of them,
+            rings are searched up to radius - 1
 
             Args:
                 coordinates (Tuple[int, int]):  coordinates to search around
                 base_class (Type):              base class as reference for the search
-                include_self (bool, optional):  include the coordinates in the search. Defaults to False.
                 radius (int, optional):         radius of search. Defaults to 1.
 
         Returns:
-            Set[Any]: set of instances of the base class around
+            Set[Any]: set of instances of the base class on the closest ring
         """
-        def find_instance(position:Tuple[int, int], instances: Set, base_class: Any):
-            obj = self.get_cell_value(coordinates=position)
-            if obj:
-                if Grid.is_subclass(derived=obj,
-                                    base_class=base_class):
+        mask, (x1, x2, y1, y2) = self._find_mask_baseclass(base_class=base_class,
+                                                           coordinates=coordinates,
+                                                           include_self=False,
+                                                           radius=radius - 1)
 
-                    instances.add(obj)
-        
-        instances = set()
-        a, b = coordinates
-        for n in range(1, radius):
-            for x in (-n, n):
-                x1 = a+x
-                y1 = b+x
-                for y in range(-n+1, n):
-                    
-                    find_instance(position=(x1, b+y),
-                                  instances=instances,
-                                  base_class=base_class)
-
-                    find_instance(position=(a+y, y1),
-                                  instances=instances,
-                                  base_class=base_class)
-  
-                find_instance(position=(x1, y1),
-                              instances=instances,
-                              base_class=base_class)
-                
-                find_instance(position=(x1, b-x),
-                              instances=instances,
-                              base_class=base_class)
+        xs, ys = np.nonzero(mask)
+        if not xs.size:
+            return set()
 
-            if instances:
-                break
-            
-        return instances
+        # Ring of each cell found: Chebyshev distance to the center
+        rings = np.maximum(np.abs(xs + x1 - coordinates[0]),
+                           np.abs(ys + y1 - coordinates[1]))
+        closest = rings == rings.min()
 
-        
-        
+        return set(self._array[x1:x2, y1:y2][xs[closest], ys[closest]])
 
     def find_free_coordinates(
         self, coordinates: Tuple[int, int], radius: int = 1
@@ -397,17 +471,12 @@ class SubGrid:
         Returns:
             Set[Tuple[int,int]]: set of free cells' coordinates
         """
-        search_interval = list(range(-radius, radius + 1))  # List from (-radius, radius)
-        search_area = combinations(search_interval * 2, 2)  # ALl the combinations of coordinates
+        x1, x2, y1, y2 = self._clip_window(coordinates=coordinates,
+                                           radius=radius)
 
-        positions = {
-            coordinate
-            for x, y in set(search_area)
-            if self.get_cell_value(coordinate:= tuple(np.add(coordinates, (x, y))))
-            is None
-        }
+        free: npt.NDArray[np.bool_] = self.kind_grid.array[x1:x2, y1:y2] == CellKind.EMPTY
 
-        return positions
+        return {(int(x) + x1, int(y) + y1) for x, y in zip(*np.nonzero(free))}
 
     def select_free_coordinates(
         self, coordinates: Tuple[int, int], radius: int = 1, num_cells: int = 1
@@ -480,12 +549,42 @@ class SubGrid:
                                                 value=value):
             try:
                 self._array[coordinates] = value
+
+                if self.kind_grid:
+                    self.kind_grid.array[coordinates] = get_cell_kind(type(value))
+                    self.id_grid.array[coordinates] = value.id
+
             except IndexError:
                 pass
                 # print("{coordinates} is out of bounds")
 
         return success
 
+    def place_many_on_grid(self, values: Sequence[Any],
+                           coordinates: npt.NDArray[np.int64]) -> None:
+        """Public method:
+            (Call place_entities or place_resources
+            from grid instead)
+            Place many values on the grid in one pass,
+            the coordinates having been checked with find_vacant_coordinates
+
+        Args:
+            values (Sequence[Any]):                 values to place on the grid
+            coordinates (npt.NDArray[np.int64]):    N×2 vacant coordinates of the values
+        """
+        if not len(values):
+            return
+
+        xs, ys = np.asarray(coordinates, dtype=np.int64).reshape(-1, 2).T
+
+        cells = np.empty(len(values), dtype=object)
+        cells[:] = values
+        self._array[xs, ys] = cells
+
+        if self.kind_grid:
+            self.kind_grid.array[xs, ys] = [get_cell_kind(type(value)) for value in values]
+            self.id_grid.array[xs, ys] = [value.id for value in values]
+
     def get_cell_value(self, coordinates: Tuple[int, int]) -> Any:
         """Public method:
             Get the value of a cell
@@ -510,7 +609,10 @@ class SubGrid:
         """Public method:
             Return an array around a given position of a defined size,
             even if the inital position is close from borders,
-            pad with -1 values for cells out of boundaries
+            pad with the subgrid's padding value for cells out of boundaries.
+            When the window lies inside the grid a read-only view is returned,
+            otherwise the window is copied into a padded buffer reused between calls,
+            in both cases the result should be consumed before the next call
 
         Args:
             initial_pos (Tuple[int,int]):   position from which to search around
@@ -519,6 +621,7 @@ class SubGrid:
         Returns:
             np.array: padded subregion with dimensions depending only on radius
         """
+        width, height = self.dimensions[:2]
         x1, x2, y1, y2 = (
             initial_pos[0] - radius,
             initial_pos[0] + radius + 1,
@@ -526,44 +629,48 @@ class SubGrid:
             initial_pos[1] + radius + 1,
         )
 
-        padded_subregion: npt.NDArray[Any]
-        ndim: int = self._array.ndim
-        width = height = 0
-
-        if ndim == 3:
-            width, height, depth = self.dimensions
-            padded_subregion = np.full(fill_value=-255, shape=(x2 - x1, y2 - y1, depth))
-        elif ndim == 2:
-            width, height = self.dimensions
-            padded_subregion = np.full(fill_value=None, shape=(x2 - x1, y2 - y1))
-
-        left_pad = right_pad = up_pad = down_pad = 0
-
-        if x1 < 0:
-            left_pad = -x1
-            x1 = 0
-        if x2 > width:
-            right_pad = x2 - width
-            x2 = width
-        if y1 < 0:
-            up_pad = -y1
-            y1 = 0
-        if y2 > height:
-            down_pad = y2 - height
-            y2 = height
-
-        subregion: npt.NDArray[Any] = self._array[x1:x2, y1:y2]
-
-        x_shape, y_shape = subregion.shape[:2]
-
-        for x in range(x_shape):
-            for y in range(y_shape):
-                padded_subregion[x + left_pad, y + up_pad] = subregion[
-                    x - right_pad, y - down_pad
-                ]
+        # Window inside the grid: zero-copy view
+        if x1 >= 0 and y1 >= 0 and x2 <= width and y2 <= height:
+            subregion: npt.NDArray[Any] = self._array[x1:x2, y1:y2]
+            subregion.flags.writeable = False
+            return subregion
+
+        padded_subregion: npt.NDArray[Any] = self._get_padded_buffer(radius=radius)
+        padded_subregion.fill(self.padding_value)
+
+        # Clip the window to the grid and copy
+        # the overlapping part in a single slice
+        in_x1, in_x2 = max(x1, 0), min(x2, width)
+        in_y1, in_y2 = max(y1, 0), min(y2, height)
+
+        if in_x1 < in_x2 and in_y1 < in_y2:
+            padded_subregion[in_x1 - x1:in_x2 - x1,
+                             in_y1 - y1:in_y2 - y1] = self._array[in_x1:in_x2,
+                                                                  in_y1:in_y2]
 
         return padded_subregion
 
+    def _get_padded_buffer(self, radius: int) -> npt.NDArray[Any]:
+        """Private method:
+            Get the padded buffer for windows of a given radius,
+            allocate it on first use
+
+        Args:
+            radius (int): radius of the window
+
+        Returns:
+            npt.NDArray[Any]: buffer of shape (2*radius+1, 2*radius+1, ...)
+        """
+        if (buffer := self._padded_buffers.get(radius)) is None:
+            side: int = 2 * radius + 1
+            buffer = np.empty(shape=(side, side, *self.dimensions[2:]),
+                              dtype=np.result_type(self._array.dtype,
+                                                   np.min_scalar_type(self.padding_value)))
+
+            self._padded_buffers[radius] = buffer
+
+        return buffer
+
 
 class Grid:
     """Class:
@@ -580,7 +687,9 @@ class Grid:
             is_subclass:        check if an object is an instance of a subclass
             place_resource:     place a resource on the appropriate subgrid
             remove_resource:    remove a resource from the appropriate subgrid
+            place_resources:    place many resources on the appropriate subgrid in one pass
             place_entity:       place an entity on the appropriate subgrid
+            place_entities:     place many entities on the appropriate subgrid in one pass
             remove_entity:      remove a entity from the appropriate subgrid
             modify_cell_color:  modify the color of a cell in the color grid
 
@@ -613,6 +722,7 @@ class Grid:
             dimensions=(*self.dimensions, 3),  # subgrid containing the color values
             data_type=np.uint8,
             initial_value=255,
+            padding_value=-255,
         )
 
     @property
@@ -655,6 +765,46 @@ class Grid:
         """
         return self._color_grid
 
+    @property
+    def entity_kinds(self) -> npt.NDArray[np.uint8]:
+        """property:
+            get the kinds of the entities in each cell
+
+        Returns:
+            npt.NDArray[np.uint8]: CellKind bits of the entity layer
+        """
+        return self._entity_grid.kind_grid.array
+
+    @property
+    def entity_ids(self) -> npt.NDArray[np.int64]:
+        """property:
+            get the ids of the entities in each cell
+
+        Returns:
+            npt.NDArray[np.int64]: ids of the entity layer
+        """
+        return self._entity_grid.id_grid.array
+
+    @property
+    def resource_kinds(self) -> npt.NDArray[np.uint8]:
+        """property:
+            get the kinds of the resources in each cell
+
+        Returns:
+            npt.NDArray[np.uint8]: CellKind bits of the resource layer
+        """
+        return self._resource_grid.kind_grid.array
+
+    @property
+    def resource_ids(self) -> npt.NDArray[np.int64]:
+        """property:
+            get the ids of the resources in each cell
+
+        Returns:
+            npt.NDArray[np.int64]: ids of the resource layer
+        """
+        return self._resource_grid.id_grid.array
+
     @property
     def width(self) -> int:
         """property:
@@ -731,6 +881,30 @@ class Grid:
         """
         return self.entity_grid.place_on_grid(value=value)
     
+    def place_resources(self, values: Sequence[Resource],
+                        coordinates: npt.NDArray[np.int64]) -> None:
+        """Public method:
+            Place many resources on the appropriate subgrid in one pass
+
+        Args:
+            values (Sequence[Resource]):            resources to place on the grid
+            coordinates (npt.NDArray[np.int64]):    N×2 vacant coordinates of the resources
+        """
+        self.resource_grid.place_many_on_grid(values=values,
+                                              coordinates=coordinates)
+
+    def place_entities(self, values: Sequence[Entity],
+                       coordinates: npt.NDArray[np.int64]) -> None:
+        """Public method:
+            Place many entities on the appropriate subgrid in one pass
+
+        Args:
+            values (Sequence[Entity]):              entities to place on the grid
+            coordinates (npt.NDArray[np.int64]):    N×2 vacant coordinates of the entities
+        """
+        self.entity_grid.place_many_on_grid(values=values,
+                                            coordinates=coordinates)
+
     def remove_entity(self, entity: Entity)  -> None:
         """Public method:
             Remove a entity on the appropriate subgrid
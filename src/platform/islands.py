@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+    from project.src.rtNEAT.genome import Genome
+    from .simulation import Simulation
+
+import enum
+import multiprocessing
+import random
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .running.config import config
+from .world import World
+
+
+class Topology(enum.Enum):
+    """Enum:
+        Worlds each world sends its emigrants to
+    """
+    RING = "ring"       # the next world, the last one sending to the first one
+    RANDOM = "random"   # any other world, drawn at each migration
+
+
+def select_emigrants(simulation: Simulation, n_migrants: int) -> List[Genome]:
+    """Function:
+        Select the genotypes of the fittest animals of a simulation,
+        the ones that gained the most energy
+
+    Args:
+        simulation (Simulation):    simulation to select the animals from
+        n_migrants (int):           number of genotypes to select
+
+    Returns:
+        List[Genome]: genotypes of the fittest animals, fittest first
+    """
+    animals = sorted(simulation.state.animals.values(),
+                     key=lambda animal: (-animal.gained_energy, animal.id))
+
+    return [animal.brain.genotype for animal in animals[:n_migrants]]
+
+
+def get_statistics(world: World) -> Dict[str, Any]:
+    """Function:
+        Summarize the state of a world
+
+    Args:
+        world (World): world to summarize
+
+    Returns:
+        Dict[str, Any]: cycle, number of animals, trees and innovations, and if it is still running
+    """
+    state = world.simulation.state
+
+    return {'cycle': state.cycle,
+            'animals': state.n_animals,
+            'trees': state.n_trees,
+            'innovations': len(world.simulation.innov_table.innovations),
+            'running': world.running}
+
+
+def serve(connection: Connection, island: int, n_islands: int,
+          dimensions: Tuple[int, int], seed: Optional[int]) -> None:
+    """Function:
+        Loop of a worker process, evolving one world,
+        its innovation numbers interleaved with the ones of the other worlds
+
+        Commands received:
+            ('run', n_cycles):                  run some cycles, then reply the statistics
+            ('emigrate', n_migrants):           reply the fittest genotypes and the innovations
+            ('immigrate', genomes, records):    merge the innovations, spawn the genotypes, then reply their number
+            ('close',):                         stop the worker
+
+    Args:
+        connection (Connection):        end of the pipe with the main process
+        island (int):                   index of the world
+        n_islands (int):                number of worlds
+        dimensions (Tuple[int, int]):   dimensions of the world
+        seed (Optional[int]):           seed of the random generators
+    """
+    if seed is not None:
+        random.seed(seed * n_islands + island)
+        np.random.seed(seed * n_islands + island)
+
+    world = World(world_id=island,
+                  dimensions=dimensions)
+    innov_table = world.context.innov_table
+    innov_table.set_numbering(stride=n_islands,
+                              offset=island)
+    world.init()
+    world.running = True
+    connection.send(get_statistics(world=world))
+
+    while True:
+        command, *args = connection.recv()
+        match command:
+            case 'run':
+                if world.running:
+                    world.run(n_cycles=args[0])
+                connection.send(get_statistics(world=world))
+
+            case 'emigrate':
+                connection.send((select_emigrants(simulation=world.simulation,
+                                                  n_migrants=args[0]),
+                                 innov_table.export_innovations()))
+
+            case 'immigrate':
+                genomes, records = args
+                for innovations in records:
+                    innov_table.merge_innovations(records=innovations)
+
+                immigrants = []
+                if world.running:
+                    settings = world.context['Simulation']
+                    immigrants = world.simulation.environment.spawn_immigrants(
+                                    genomes=genomes,
+                                    blue_energy=settings['Animal']['init_blue_energy'],
+                                    red_energy=settings['Animal']['init_red_energy'],
+                                    size=settings['Entity']['initial_size'])
+                connection.send(len(immigrants))
+
+            case 'close':
+                break
+
+    world.shutdown()
+
+
+def _release(processes: List[multiprocessing.Process], connections: List[Connection]) -> None:
+    """Function:
+        Stop the workers of an archipelago
+
+    Args:
+        processes (List[multiprocessing.Process]):  worker processes
+        connections (List[Connection]):             pipes to the workers
+    """
+    for connection in connections:
+        try:
+            connection.send(('close',))
+        except (BrokenPipeError, OSError):
+            pass
+
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+
+
+class Archipelago:
+    """Class:
+        Worlds evolving apart, each one in a worker process,
+        periodically sending the genotypes of their fittest animals to each other,
+        along with the innovations needed to compare them
+
+        Attributes:
+            n_islands (int):                            number of worlds
+            topology (Topology):                        worlds each world sends its emigrants to
+            migration_interval (int):                   number of cycles between migrations
+            n_migrants (int):                           number of genotypes sent by each world
+            epoch (int):                                number of migration intervals run
+            statistics (List[Dict[str, Any]]):          last statistics of each world
+            _rng (np.random.Generator):                 random generator of the destinations
+            _connections (List[Connection]):            pipes to the workers
+            _processes (List[multiprocessing.Process]): worker processes
+
+        Methods:
+            migrate:    send the fittest genotypes of each world to others
+            run:        alternate running the worlds and migrating between them
+            close:      stop the workers
+    """
+    def __init__(self, n_islands: Optional[int] = None, topology: Optional[Topology] = None,
+                 migration_interval: Optional[int] = None, n_migrants: Optional[int] = None,
+                 dimensions: Optional[Tuple[int, int]] = None, seed: Optional[int] = None):
+        """Constructor:
+            Start a worker for each world, settings missing from the configuration
+
+        Args:
+            n_islands (Optional[int], optional):            number of worlds. Defaults to None.
+            topology (Optional[Topology], optional):        worlds each world sends to. Defaults to None.
+            migration_interval (Optional[int], optional):   number of cycles between migrations. Defaults to None.
+            n_migrants (Optional[int], optional):           number of genotypes sent by each world. Defaults to None.
+            dimensions (Optional[Tuple[int, int]], optional): dimensions of each world. Defaults to None.
+            seed (Optional[int], optional):                 seed of the random generators. Defaults to None.
+        """
+        settings = config['Islands']
+        self.n_islands: int = n_islands or settings['n_islands']                        # number of worlds
+        self.topology: Topology = topology or Topology(settings['topology'])            # worlds each world sends to
+        self.migration_interval: int = (migration_interval                              # cycles between migrations
+                                        or settings['migration_interval'])
+        self.n_migrants: int = n_migrants or settings['n_migrants']                     # genotypes sent by each world
+        self.epoch: int = 0                                                             # migration intervals run
+        self._rng: np.random.Generator = np.random.default_rng(seed)                    # generator of the destinations
+
+        dimensions = dimensions or (World.GRID_WIDTH, World.GRID_HEIGHT)
+        self._connections: List[Connection] = []                                        # pipes to the workers
+        self._processes: List[multiprocessing.Process] = []                             # worker processes
+        for island in range(self.n_islands):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=serve,
+                                              args=(worker_connection, island, self.n_islands,
+                                                    dimensions, seed),
+                                              daemon=True)
+            process.start()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+        self._finalizer = weakref.finalize(self, _release, self._processes,
+                                           self._connections)
+
+        self.statistics: List[Dict[str, Any]] = [connection.recv() for connection   # last statistics of each world
+                                                 in self._connections]
+
+    def _get_destinations(self) -> npt.NDArray[np.int64]:
+        """Private method:
+            Get the world each world sends its emigrants to
+
+        Returns:
+            npt.NDArray[np.int64]: index of the destination of each world
+        """
+        islands = np.arange(self.n_islands)
+        if self.topology == Topology.RING:
+            return (islands + 1) % self.n_islands
+
+        # Any world but itself
+        shifts = self._rng.integers(1, self.n_islands, size=self.n_islands)
+
+        return (islands + shifts) % self.n_islands
+
+    def migrate(self) -> List[int]:
+        """Public method:
+            Send the genotypes of the fittest animals of each world to others,
+            each destination merging the innovations of the worlds it receives from
+
+        Returns:
+            List[int]: number of immigrants settled in each world
+        """
+        for connection in self._connections:
+            connection.send(('emigrate', self.n_migrants))
+
+        departures = [connection.recv() for connection in self._connections]
+        arrivals: List[Tuple[List[Genome], List[npt.NDArray]]] = [([], []) for _ in self._connections]
+        for (genomes, records), destination in zip(departures, self._get_destinations().tolist()):
+            arrivals[destination][0].extend(genomes)
+            arrivals[destination][1].append(records)
+
+        for connection, (genomes, records) in zip(self._connections, arrivals):
+            connection.send(('immigrate', genomes, records))
+
+        return [connection.recv() for connection in self._connections]
+
+    def run(self, n_epochs: int) -> List[Dict[str, Any]]:
+        """Public method:
+            Alternate running every world for a migration interval
+            and migrating between them, until the worlds stop or the epochs are run
+
+        Args:
+            n_epochs (int): number of migration intervals to run
+
+        Returns:
+            List[Dict[str, Any]]: last statistics of each world
+        """
+        if self.n_islands < 2:
+            raise ValueError("An archipelago needs at least two worlds to migrate between")
+
+        for _ in range(n_epochs):
+            for connection in self._connections:
+                connection.send(('run', self.migration_interval))
+
+            self.statistics = [connection.recv() for connection in self._connections]
+            self.epoch += 1
+            if not any(statistics['running'] for statistics in self.statistics):
+                break
+
+            self.migrate()
+
+        return self.statistics
+
+    def close(self) -> None:
+        """Public method:
+            Stop the workers
+        """
+        self._finalizer()
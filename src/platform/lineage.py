@@ -0,0 +1,179 @@
+from typing import Dict, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+
+class Lineage:
+    """Class:
+        Parents of every entity born in a simulation, stored by id in an array,
+        so that kinship is found without keeping dead entities alive
+
+        Attributes:
+            max_depth (int):                            number of generations of ancestors, 0 for all of them
+            _parents (npt.NDArray[np.int64]):           ids of the two parents by entity id, 0 if unknown
+            _ancestors (Dict[int, npt.NDArray]):        sorted ancestors ids of the entities asked about
+
+        Methods:
+            add_birth:        record the parents of a newborn
+            get_parents:      get the parents of an entity
+            get_ancestors:    get the ancestors of an entity
+            is_ancestor:      check if an entity descends from another one
+            are_kin:          check if two entities are too closely related to mate
+            forget:           drop what was computed for an entity
+            export_ancestry:  get the parents of an entity and of its ancestors
+            import_ancestry:  record parents exported from another lineage
+    """
+    def __init__(self, max_depth: int = 0, capacity: int = 1024):
+        """Constructor:
+            Initialize an empty lineage
+
+        Args:
+            max_depth (int, optional):  number of generations of ancestors, 0 for all of them. Defaults to 0.
+            capacity (int, optional):   initial number of entity ids. Defaults to 1024.
+        """
+        self.max_depth: int = max_depth                                         # number of generations of ancestors
+        self._parents: npt.NDArray[np.int64] = np.zeros((capacity, 2),
+                                                        dtype=np.int64)         # ids of the two parents by entity id
+        self._ancestors: Dict[int, npt.NDArray[np.int64]] = {}                  # sorted ancestors ids of the entities asked about
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._parents[:, 0]))
+
+    def add_birth(self, child_id: int, parent1_id: int, parent2_id: int) -> None:
+        """Public method:
+            Record the parents of a newborn
+
+        Args:
+            child_id (int):     newborn's id
+            parent1_id (int):   first parent's id
+            parent2_id (int):   second parent's id
+        """
+        if child_id >= len(self._parents):
+            grown = np.zeros((max(child_id + 1, 2 * len(self._parents)), 2), dtype=np.int64)
+            grown[:len(self._parents)] = self._parents
+            self._parents = grown
+
+        self._parents[child_id] = parent1_id, parent2_id
+        self._ancestors.pop(child_id, None)
+
+    def get_parents(self, entity_id: int) -> Tuple[int, int]:
+        """Public method:
+            Get the parents of an entity
+
+        Args:
+            entity_id (int): entity's id
+
+        Returns:
+            Tuple[int, int]: ids of the two parents, 0 if unknown
+        """
+        if entity_id >= len(self._parents):
+            return 0, 0
+
+        parent1_id, parent2_id = self._parents[entity_id].tolist()
+
+        return parent1_id, parent2_id
+
+    def get_ancestors(self, entity_id: int) -> npt.NDArray[np.int64]:
+        """Public method:
+            Get the ancestors of an entity, up to the maximum depth,
+            walking the parents table one generation at a time
+
+        Args:
+            entity_id (int): entity's id
+
+        Returns:
+            npt.NDArray[np.int64]: sorted ids of the ancestors
+        """
+        ancestors = self._ancestors.get(entity_id)
+        if ancestors is not None:
+            return ancestors
+
+        ancestors = np.zeros(0, dtype=np.int64)
+        generation = np.array([entity_id], dtype=np.int64)
+        depth = 0
+        while generation.size and (not self.max_depth or depth < self.max_depth):
+            generation = self._parents[generation[generation < len(self._parents)]].ravel()
+            generation = np.setdiff1d(generation[generation > 0], ancestors)
+            ancestors = np.union1d(ancestors, generation)
+            depth += 1
+
+        self._ancestors[entity_id] = ancestors
+
+        return ancestors
+
+    def is_ancestor(self, entity_id: int, ancestor_id: int) -> bool:
+        """Public method:
+            Check if an entity descends from another one
+
+        Args:
+            entity_id (int):    descendant's id
+            ancestor_id (int):  ancestor's id
+
+        Returns:
+            bool: the entity descends from the ancestor
+        """
+        ancestors = self.get_ancestors(entity_id=entity_id)
+        index = np.searchsorted(ancestors, ancestor_id)
+
+        return bool(index < len(ancestors) and ancestors[index] == ancestor_id)
+
+    def are_kin(self, entity1_id: int, entity2_id: int) -> bool:
+        """Public method:
+            Check if two entities are too closely related to mate,
+            siblings or one descending from the other,
+            an entity without known ancestors has no kin
+
+        Args:
+            entity1_id (int): first entity's id
+            entity2_id (int): second entity's id
+
+        Returns:
+            bool: the two entities are related
+        """
+        ancestors1 = self.get_ancestors(entity_id=entity1_id)
+        if not ancestors1.size:
+            return False
+
+        return (np.array_equal(ancestors1, self.get_ancestors(entity_id=entity2_id))
+                or self.is_ancestor(entity_id=entity2_id, ancestor_id=entity1_id)
+                or self.is_ancestor(entity_id=entity1_id, ancestor_id=entity2_id))
+
+    def forget(self, entity_id: int) -> None:
+        """Public method:
+            Drop the ancestors computed for an entity,
+            its parents stay in the table for its descendants
+
+        Args:
+            entity_id (int): entity's id
+        """
+        self._ancestors.pop(entity_id, None)
+
+    def export_ancestry(self, entity_id: int) -> npt.NDArray[np.int64]:
+        """Public method:
+            Get the parents of an entity and of its ancestors,
+            to record them in the lineage of another simulation
+
+        Args:
+            entity_id (int): entity's id
+
+        Returns:
+            npt.NDArray[np.int64]: N×3 rows of entity id, first and second parents' ids
+        """
+        ids = np.append(self.get_ancestors(entity_id=entity_id), entity_id)
+        ids = ids[ids < len(self._parents)]
+        ids = ids[self._parents[ids, 0] > 0]
+
+        return np.column_stack((ids, self._parents[ids]))
+
+    def import_ancestry(self, records: npt.NDArray[np.int64]) -> None:
+        """Public method:
+            Record parents exported from another lineage
+
+        Args:
+            records (npt.NDArray[np.int64]): N×3 rows of entity id, first and second parents' ids
+        """
+        for child_id, parent1_id, parent2_id in np.asarray(records, dtype=np.int64).reshape(-1, 3).tolist():
+            self.add_birth(child_id=child_id,
+                           parent1_id=parent1_id,
+                           parent2_id=parent2_id)
@@ -0,0 +1,360 @@
+from os import cpu_count
+from random import sample
+from timeit import default_timer, timeit
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+from project.src.platform.running.config import config as neat_config
+from project.src.rtNEAT.arena import BrainArena
+from project.src.rtNEAT.genes import reset_innovation_table
+from project.src.rtNEAT.genome import Genome, pairwise_compatibility
+from project.src.rtNEAT.network import Network
+
+from ..energies import Energy, EnergyType
+from ..grid import CellKind
+from ..simulation import Environment
+from ..tiling import TiledSimulation
+from .config import config
+
+# python -m src.platform.running.benchmark
+
+GRID_SIZES: Tuple[int, ...] = (40, 200, 1000)
+HIDDEN_NODES: Tuple[int, ...] = (0, 10, 50, 100, 300)
+POPULATION_SIZES: Tuple[int, ...] = (10, 100, 1000)
+MUTATION_FACTORS: Tuple[int, ...] = (1, 20)
+TILE_SHAPES: Tuple[Tuple[int, int], ...] = ((1, 1), (2, 1), (2, 2), (4, 2))
+
+
+def create_environment(size: int, density: float = 0.01) -> Environment:
+    """Function:
+        Create an environment of a given size populated
+        with animals and energies at random positions
+
+    Args:
+        size (int):                 width and height of the grid
+        density (float, optional):  proportion of cells occupied by each kind. Defaults to 0.01.
+
+    Returns:
+        Environment: populated environment
+    """
+    environment = Environment(env_id=0,
+                              dimensions=(size, size))
+    environment.init()
+
+    n_objects = max(1, int(size * size * density))
+    cells = sample(range(size * size), 2 * n_objects)
+
+    for cell in cells[:n_objects]:
+        environment.spawn_animal(coordinates=divmod(cell, size))
+
+    for cell in cells[n_objects:]:
+        environment.create_energy(energy_type=EnergyType.BLUE,
+                                  quantity=10,
+                                  coordinates=divmod(cell, size))
+
+    return environment
+
+
+def time_queries(queries: Dict[str, Callable], number: int = 3) -> Dict[str, float]:
+    """Function:
+        Time each query and return the mean time per run
+
+    Args:
+        queries (Dict[str, Callable]):  queries to time, by name
+        number (int, optional):         number of runs. Defaults to 3.
+
+    Returns:
+        Dict[str, float]: time in seconds, by name
+    """
+    return {name: timeit(query, number=number) / number
+            for name, query in queries.items()}
+
+
+def benchmark_spatial_index() -> None:
+    """Function:
+        Compare the per-cycle cost of the animals' queries
+        using the grid window scans and the spatial index
+    """
+    entity_sight_range = config['Simulation']['Animal']['entity_sight_range']
+    energy_sight_range = config['Simulation']['Animal']['energy_sight_range']
+    reproduction_range = config['Simulation']['Animal']['reproduction_range']
+
+    print(f"{'grid':>10} {'query':>24} {'scan (ms)':>12} {'index (ms)':>12} {'speedup':>8}")
+    for size in GRID_SIZES:
+        environment = create_environment(size=size)
+        grid, index = environment.grid, environment.spatial_index
+        positions = [animal.position for animal in environment.state.animals.values()]
+
+        comparisons = {
+            "closest animals": (
+                lambda: [grid.find_close_animal_instances(coordinates=position,
+                                                          radius=entity_sight_range)
+                         for position in positions],
+                lambda: [index.find_closest(kinds=CellKind.ANIMAL,
+                                            coordinates=position,
+                                            radius=entity_sight_range)
+                         for position in positions]),
+            "closest energies": (
+                lambda: [grid.resource_grid.find_closest_instances_baseclass(base_class=Energy,
+                                                                             coordinates=position,
+                                                                             radius=energy_sight_range)
+                         for position in positions],
+                lambda: [index.find_closest(kinds=CellKind.ENERGY,
+                                            coordinates=position,
+                                            radius=energy_sight_range)
+                         for position in positions]),
+            "animals within range": (
+                lambda: [grid.find_animal_instances(coordinates=position,
+                                                    radius=reproduction_range)
+                         for position in positions],
+                lambda: [index.find_around(kinds=CellKind.ANIMAL,
+                                           coordinates=position,
+                                           radius=reproduction_range)
+                         for position in positions]),
+        }
+
+        for name, (scan, indexed) in comparisons.items():
+            timings = time_queries(queries={'scan': scan, 'index': indexed})
+            print(f"{size:>4}x{size:<5} {name:>24} {timings['scan']*1000:>12.2f} "
+                  f"{timings['index']*1000:>12.2f} {timings['scan']/timings['index']:>8.1f}")
+
+
+def create_genome(n_hidden: int) -> Genome:
+    """Function:
+        Create a genome with the animals' 8 inputs and 9 outputs,
+        grown by a given number of hidden nodes
+
+    Args:
+        n_hidden (int): number of hidden nodes to add
+
+    Returns:
+        Genome: created genome
+    """
+    reset_innovation_table()
+    genome = Genome.genesis(genome_id=0,
+                            genome_data={'n_inputs': 8,
+                                         'n_outputs': 9,
+                                         'n_actions': 6,
+                                         'actions': {f"{i}": [] for i in range(6)}})
+
+    while sum(node.type.name == 'HIDDEN' for node in genome.get_node_genes()) < n_hidden:
+        genome._mutate_add_node()
+        genome._mutate_add_link(tries=20)
+
+    return genome
+
+
+def benchmark_network(n_activations: int = 1000) -> None:
+    """Function:
+        Compare the recursive activation of networks
+        with their compiled flat evaluation
+    """
+    inputs = np.random.uniform(-1, 1, (n_activations, 8))
+
+    print(f"{'hidden':>8} {'links':>8} {'recursive (us)':>16} {'compiled (us)':>16} {'speedup':>8}")
+    for n_hidden in HIDDEN_NODES:
+        genome = create_genome(n_hidden=n_hidden)
+        network = Network.genesis(genome=genome)
+        flat_network = Network.genesis(genome=genome,
+                                       compiled=True)
+
+        # Warm up the jit compiled functions
+        network.activate(input_values=inputs[0])
+        flat_network.activate(input_values=inputs[0])
+
+        timings = time_queries(queries={
+            'recursive': lambda: [network.activate(input_values=values) for values in inputs],
+            'compiled': lambda: [flat_network.activate(input_values=values) for values in inputs]})
+
+        print(f"{n_hidden:>8} {network.n_links:>8} "
+              f"{timings['recursive']/n_activations*1e6:>16.1f} "
+              f"{timings['compiled']/n_activations*1e6:>16.1f} "
+              f"{timings['recursive']/timings['compiled']:>8.1f}")
+
+
+def benchmark_arena(n_hidden: int = 10, n_cycles: int = 20) -> None:
+    """Function:
+        Compare the activation of the compiled networks of a population
+        one by one with their evaluation in one pass by an arena
+    """
+    print(f"{'population':>10} {'per network (ms)':>18} {'arena (ms)':>12} {'speedup':>8}")
+    for population in POPULATION_SIZES:
+        networks = [Network.genesis(genome=create_genome(n_hidden=n_hidden),
+                                    compiled=True)
+                    for _ in range(population)]
+
+        arena = BrainArena(n_inputs=8,
+                           n_outputs=9)
+        slots = np.array([arena.add(network=network) for network in networks])
+        inputs = np.random.uniform(-1, 1, (population, 8))
+
+        # Warm up the jit compiled functions
+        networks[0].activate(input_values=inputs[0])
+        arena.evaluate(slots=slots, inputs=inputs)
+
+        timings = time_queries(queries={
+            'per network': lambda: [[network.activate(input_values=values)
+                                     for network, values in zip(networks, inputs)]
+                                    for _ in range(n_cycles)],
+            'arena': lambda: [arena.evaluate(slots=slots, inputs=inputs)
+                              for _ in range(n_cycles)]})
+
+        print(f"{population:>10} "
+              f"{timings['per network']/n_cycles*1e3:>18.3f} "
+              f"{timings['arena']/n_cycles*1e3:>12.3f} "
+              f"{timings['per network']/timings['arena']:>8.1f}")
+
+
+def benchmark_pool(n_hidden: int = 100, n_cycles: int = 20, n_workers: int = 0) -> None:
+    """Function:
+        Compare the evaluation of the networks of a population by an arena
+        in this process with their evaluation by worker processes owning part of them
+    """
+    n_workers = n_workers or cpu_count()
+    print(f"{'population':>10} {'workers':>8} {'arena (ms)':>12} {'pool (ms)':>12}")
+    for population in POPULATION_SIZES:
+        networks = [Network.genesis(genome=create_genome(n_hidden=n_hidden),
+                                    compiled=True)
+                    for _ in range(population)]
+
+        arena = BrainArena(n_inputs=8,
+                           n_outputs=9)
+        slots = np.array([arena.add(network=network) for network in networks])
+        inputs = np.random.uniform(-1, 1, (population, 8))
+        arena.evaluate(slots=slots, inputs=inputs)
+
+        timings = time_queries(queries={
+            'arena': lambda: [arena.evaluate(slots=slots, inputs=inputs)
+                              for _ in range(n_cycles)]})
+
+        arena.start_pool(n_workers=n_workers)
+        arena.evaluate(slots=slots, inputs=inputs)
+        timings |= time_queries(queries={
+            'pool': lambda: [arena.evaluate(slots=slots, inputs=inputs)
+                             for _ in range(n_cycles)]})
+        arena.stop_pool()
+
+        print(f"{population:>10} {n_workers:>8} "
+              f"{timings['arena']/n_cycles*1e3:>12.3f} "
+              f"{timings['pool']/n_cycles*1e3:>12.3f}")
+
+
+def benchmark_mutation(n_births: int = 50) -> None:
+    """Function:
+        Compare the mutation of newborn genomes on their genes
+        with the mutation on the genes stored in arrays
+    """
+    print(f"{'hidden':>8} {'links':>8} {'factor':>8} {'genes (us)':>12} {'arrays (us)':>12}")
+    for n_hidden in HIDDEN_NODES:
+        parent = create_genome(n_hidden=n_hidden)
+        for factor in MUTATION_FACTORS:
+            timings: Dict[bool, list] = {False: [], True: []}
+            # Alternate both modes as the innovations keep growing,
+            # rtNEAT reads the configuration through the project package
+            for _ in range(n_births):
+                for vectorized in timings:
+                    neat_config["NEAT"]["vectorized_mutation"] = vectorized
+                    genome = Genome.crossover(genome_id=1,
+                                              parent1=parent,
+                                              parent2=parent)
+                    start = default_timer()
+                    genome.mutate(factor=factor)
+                    timings[vectorized].append(default_timer() - start)
+
+            print(f"{n_hidden:>8} {parent.n_link_genes:>8} {factor:>8} "
+                  f"{np.median(timings[False])*1e6:>12.0f} "
+                  f"{np.median(timings[True])*1e6:>12.0f}")
+
+
+def benchmark_compatibility(n_hidden: int = 10) -> None:
+    """Function:
+        Compare the genetic distances of a population computed pair by pair
+        with the compatibility matrix of the population
+    """
+    parent = create_genome(n_hidden=n_hidden)
+    print(f"{'size':>8} {'pairs (ms)':>12} {'matrix (ms)':>12}")
+    for size in POPULATION_SIZES[:2]:
+        genomes = []
+        for genome_id in range(size):
+            genome = Genome.crossover(genome_id=genome_id,
+                                      parent1=parent,
+                                      parent2=parent)
+            genome.mutate(factor=MUTATION_FACTORS[-1])
+            genomes.append(genome)
+
+        timings = time_queries(queries={
+            'pairs': lambda: [[Genome.genetic_distance(genome1=genome1, genome2=genome2)
+                               for genome2 in genomes] for genome1 in genomes],
+            'matrix': lambda: pairwise_compatibility(genomes=genomes)},
+            number=1)
+
+        print(f"{size:>8} {timings['pairs']*1e3:>12.1f} {timings['matrix']*1e3:>12.1f}")
+
+
+def benchmark_spawning(density: float = 0.05) -> None:
+    """Function:
+        Compare creating energies one by one
+        with creating them in one bulk operation
+    """
+    print(f"{'size':>8} {'energies':>10} {'single (ms)':>12} {'bulk (ms)':>12}")
+    for size in GRID_SIZES:
+        n_energies = int(size * size * density)
+        cells = np.array(sample(range(size * size), n_energies))
+        coordinates = np.column_stack(np.divmod(cells, size))
+
+        environments = []
+        for _ in range(2):
+            environment = Environment(env_id=0,
+                                      dimensions=(size, size))
+            environment.init()
+            environments.append(environment)
+
+        def single():
+            for x, y in coordinates.tolist():
+                environments[0].create_energy(energy_type=EnergyType.BLUE,
+                                              quantity=10,
+                                              coordinates=(x, y))
+
+        def bulk():
+            environments[1].create_energies(energy_types=[EnergyType.BLUE] * n_energies,
+                                            quantities=np.full(n_energies, 10),
+                                            coordinates=coordinates)
+
+        timings = time_queries(queries={'single': single,
+                                        'bulk': bulk},
+                               number=1)
+
+        print(f"{size:>8} {n_energies:>10} {timings['single']*1e3:>12.1f} {timings['bulk']*1e3:>12.1f}")
+
+
+def benchmark_tiling(size: int = 120, n_cycles: int = 20) -> None:
+    """Function:
+        Compare the cycles of a world simulated by one process
+        with the world divided into more and more tiles, each one simulated
+        by a worker process, and their populations after the same number of cycles
+    """
+    print(f"{'tiles':>8} {'cycle (ms)':>12} {'animals':>8} {'trees':>8} {'energies':>9}")
+    for shape in TILE_SHAPES:
+        simulation = TiledSimulation(sim_id=0,
+                                     dimensions=(size, size),
+                                     shape=shape,
+                                     seed=1)
+        start = default_timer()
+        for _ in range(n_cycles):
+            counts = simulation.update()
+        duration = default_timer() - start
+        simulation.close()
+
+        print(f"{shape[0] * shape[1]:>8} {duration/n_cycles*1e3:>12.1f} "
+              f"{counts['animals']:>8} {counts['trees']:>8} {counts['energies']:>9}")
+
+
+if __name__ == "__main__":
+    benchmark_spatial_index()
+    benchmark_network()
+    benchmark_arena()
+    benchmark_pool()
+    benchmark_mutation()
+    benchmark_compatibility()
+    benchmark_spawning()
+    benchmark_tiling()
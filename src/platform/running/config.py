@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import copy
 import json
 import optparse
@@ -5,7 +7,10 @@ import sys
 from functools import cached_property
 from os.path import dirname, join, realpath
 from pathlib import Path
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+from project.src.rtNEAT.innovation import InnovTable, default_innov_table
 
 default_settings = {
                     "Run":{
@@ -45,6 +50,8 @@ default_settings = {
                             "add_link_tries": 50,
                             ## Add node mutation
                             "add_node_prob": 0.25,
+                            ## Mutate genes stored in arrays
+                            "vectorized_mutation": True,
                             # Mating
                             "mate_multipoint_prob": 0.0,
                             # Compatibility
@@ -54,7 +61,17 @@ default_settings = {
                             "link_diff_coeff": 0.5,
                             "mutation_difference_coeff": 0.5,
                             "compatibility_threshod": 3.0,
-                        },#21
+                            # Phenotype
+                            "compile_network": True,
+                        },#23
+
+                    "Islands":{
+                        "n_islands": 4,
+                        ## "ring": each world sends to the next one, "random": to any other one
+                        "topology": "ring",
+                        "migration_interval": 100,
+                        "n_migrants": 3,
+                        },#4
 
                     "Simulation":{
                         "evaluate": True,
@@ -89,7 +106,16 @@ default_settings = {
                         "energy_quantity": 100,
                         "spawn_tree": False,
                         "tree_sparsity": 5,
-                        #26
+                        # Cycle
+                        ## "interleaved": each entity decides then acts in turn,
+                        ## "two_phase": all entities decide, then all actions are applied by id
+                        "cycle_mode": "interleaved",
+                        ## Pool evaluating the brains in chunks: "", "thread" or "process",
+                        ## or "pool" for worker processes owning a partition of the brains
+                        "think_executor": "",
+                        "think_workers": 0,
+                        "think_chunk_size": 0,
+                        #30
                         "Entity":{
                             "initial_size": 1,
                             "init_max_age": 10,
@@ -126,6 +152,8 @@ default_settings = {
                             "random_action_prob": 0.05,
                             "success_reproduction": 1.00,
                             "incest": False,
+                            ## Generations of ancestors checked for incest, 0 for all
+                            "lineage_depth": 0,
                             "reproduction_range": 3,
                             "move_threshold": 0.1,
                             "grow_threshold": 0.5,
@@ -133,7 +161,7 @@ default_settings = {
                             "plant_threshold": 0.3,
                             "drop_threshold": 0.9,
                             "paint_threshold": 0.5
-                        }, #25
+                        }, #26
 
                         "Tree":{
                             #Tree
@@ -185,21 +213,37 @@ class ConfigManager:
     def parse_config(self):
         opt, args = self.parser.parse_args()
         if opt.my_config_file:
-            config_data = json.load(open(join(ConfigManager.directory, opt.my_config_file), encoding="utf-8"))
-
-            for key in config_data:
-                for subkey in config_data[key]:
-                    if isinstance(config_data[key][subkey], type(dict())):
-                        self.settings[key][subkey].update(config_data[key][subkey])
-
-                    else:
-                        self.settings[key][subkey] = config_data[key][subkey]
+            self.load_config(file_name=opt.my_config_file)
 
 
         self.loaded_simulation = opt.load_simulation or None
         self.display = bool(opt.display)
 
 
+    def load_config(self, file_name: str) -> None:
+        """Public method:
+            Override the settings with the ones of a configuration file
+
+        Args:
+            file_name (str): name of the file in the configuration directory, or its absolute path
+        """
+        merge_settings(settings=self.settings,
+                       config_data=ConfigManager.read_config(file_name=file_name))
+
+    @staticmethod
+    def read_config(file_name: str) -> Dict[str, Any]:
+        """Static method:
+            Read the settings of a configuration file
+
+        Args:
+            file_name (str): name of the file in the configuration directory, or its absolute path
+
+        Returns:
+            Dict[str, Any]: settings of the file, by section
+        """
+        with open(join(ConfigManager.directory, file_name), encoding="utf-8") as read_file:
+            return json.load(read_file)
+
     def __getitem__(self, key):
         return self.settings[key]
 
@@ -245,4 +289,160 @@ class ConfigManager:
     def evaluate(self) -> bool:
         return self.settings['Simulation']['evaluate']
 
+def merge_settings(settings: Dict[str, Any], config_data: Mapping[str, Any]) -> None:
+    """Function:
+        Override settings with the ones of a configuration,
+        the subsections merged rather than replaced
+
+    Args:
+        settings (Dict[str, Any]):          settings to override, by section
+        config_data (Mapping[str, Any]):    overriding settings, by section
+    """
+    for key in config_data:
+        for subkey in config_data[key]:
+            if isinstance(config_data[key][subkey], type(dict())):
+                settings[key][subkey].update(config_data[key][subkey])
+
+            else:
+                settings[key][subkey] = config_data[key][subkey]
+
+
+def freeze(value: Any) -> Any:
+    """Function:
+        Make settings read-only, at every depth
+
+    Args:
+        value (Any): settings, a section or a single value
+
+    Returns:
+        Any: read-only view of the dictionaries, tuples instead of the lists
+    """
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Function:
+        Copy read-only settings back into dictionaries and lists
+
+    Args:
+        value (Any): settings, a section or a single value
+
+    Returns:
+        Any: writable copy of the settings
+    """
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+
+    return value
+
+
+class SimContext:
+    """Class:
+        Settings of one simulation, frozen when it is created,
+        along with the values the simulation adjusts while it runs.
+        Simulations with different contexts can run side by side in one process
+
+    Attributes:
+        settings (Mapping[str, Any]):   settings by section, read as the configuration
+        difficulty_level (float):       current difficulty of the simulation
+        difficulty_factor (float):      factor applied to the difficulty set
+        energy_expiry (int):            number of cycles before the spawned energies expire
+        innov_table (InnovTable):       table numbering the innovations of the simulation
+
+    Methods:
+        from_config:            freeze the process configuration, with some settings overridden
+        set_difficulty:         set the difficulty, within the bounds of the settings
+        set_difficulty_factor:  set the factor applied to the difficulty
+    """
+    def __init__(self, settings: Mapping[str, Any],
+                 innov_table: Optional[InnovTable] = None):
+        """Constructor:
+            Create a context around settings
+
+        Args:
+            settings (Mapping[str, Any]):                   settings by section
+            innov_table (Optional[InnovTable], optional):   table numbering the innovations,
+                                                            a new one if None. Defaults to None.
+        """
+        self.settings: Mapping[str, Any] = settings                                     # settings by section
+        self.difficulty_level: float = settings['Simulation']['difficulty_level']      # current difficulty
+        self.difficulty_factor: float = settings['Simulation']['difficulty_factor']    # factor applied to the difficulty
+        self.energy_expiry: int = settings['Simulation']['energy_expiry']              # cycles before spawned energies expire
+        self.innov_table: InnovTable = (innov_table if innov_table is not None         # table numbering the innovations
+                                        else InnovTable())
+
+    @classmethod
+    def from_config(cls, config_file: Optional[str] = None,
+                    overrides: Optional[Mapping[str, Any]] = None) -> SimContext:
+        """Class method:
+            Freeze the settings of the process configuration,
+            with the ones of a configuration file and some others overridden
+
+        Args:
+            config_file (Optional[str], optional):              configuration file to apply. Defaults to None.
+            overrides (Optional[Mapping[str, Any]], optional):  settings to apply last, by section. Defaults to None.
+
+        Returns:
+            SimContext: context of a simulation
+        """
+        settings = copy.deepcopy(config.settings)
+        if config_file is not None:
+            merge_settings(settings=settings,
+                           config_data=ConfigManager.read_config(file_name=config_file))
+
+        if overrides is not None:
+            merge_settings(settings=settings,
+                           config_data=overrides)
+
+        return cls(settings=freeze(settings))
+
+    def __getitem__(self, key: str) -> Any:
+        return self.settings[key]
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return vars(self) | {'settings': thaw(self.settings)}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state | {'settings': freeze(state['settings'])})
+
+    def set_difficulty(self, new_difficulty: float) -> float:
+        """Public method:
+            Set the difficulty, multiplied by the difficulty factor
+            and kept within the bounds of the settings
+
+        Args:
+            new_difficulty (float): difficulty before the factor is applied
+
+        Returns:
+            float: difficulty set
+        """
+        new_difficulty *= self.difficulty_factor
+        max_difficulty = self.settings['Simulation']['difficulty_max']
+        min_difficulty = self.settings['Simulation']['difficulty_min']
+        self.difficulty_level = min(max(min_difficulty, new_difficulty), max_difficulty)
+
+        return self.difficulty_level
+
+    def set_difficulty_factor(self, factor: float) -> None:
+        """Public method:
+            Set the factor applied to the difficulty
+
+        Args:
+            factor (float): new factor
+        """
+        self.difficulty_factor = factor
+
+
 config = ConfigManager()
+# Settings of the objects created outside of any simulation, following the process configuration
+default_context = SimContext(settings=config.settings,
+                             innov_table=default_innov_table)
@@ -0,0 +1,218 @@
+import json
+import multiprocessing
+import random
+from dataclasses import asdict, dataclass
+from itertools import product
+from os import cpu_count, makedirs
+from os.path import dirname, isfile, join, realpath
+from pathlib import Path
+from timeit import default_timer
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set
+
+import numpy as np
+
+from ..world import World
+from .config import SimContext
+
+# python -m src.platform.running.launcher
+
+MEASUREMENTS_DIRECTORY = join(Path(dirname(realpath(__file__))).parent.parent.parent.absolute(),
+                              "measurements/")
+
+
+@dataclass(frozen=True)
+class Job:
+    """Data class:
+        One run of an experiment
+
+        Attributes:
+            config_file (str):      configuration file of the run
+            repetition (int):       index of the repetition of the configuration
+            seed (Optional[int]):   seed of the random generators, drawn by the run if None
+            n_cycles (Optional[int]): maximum number of cycles, until the world stops if None
+    """
+    config_file: str
+    repetition: int
+    seed: Optional[int]
+    n_cycles: Optional[int] = None
+
+    @property
+    def key(self) -> str:
+        """Property:
+            Return the identifier of the job in the results
+
+        Returns:
+            str: configuration file, repetition and seed of the job
+        """
+        return f"{self.config_file}|{self.repetition}|{self.seed}"
+
+
+@dataclass
+class Sweep:
+    """Data class:
+        Experiment running every configuration file,
+        repeated for every seed
+
+        Attributes:
+            config_files (Sequence[str]):   configuration files, in the configuration directory or absolute paths
+            repetitions (int):              number of runs of each configuration and seed
+            seeds (Sequence[Optional[int]]): seeds of the runs, None for a seed drawn by the run
+            n_cycles (Optional[int]):       maximum number of cycles of each run, until the world stops if None
+    """
+    config_files: Sequence[str]
+    repetitions: int = 1
+    seeds: Sequence[Optional[int]] = (None,)
+    n_cycles: Optional[int] = None
+
+    def __iter__(self) -> Iterator[Job]:
+        for config_file, repetition, seed in product(self.config_files,
+                                                     range(self.repetitions),
+                                                     self.seeds):
+            yield Job(config_file=config_file,
+                      repetition=repetition,
+                      seed=seed,
+                      n_cycles=self.n_cycles)
+
+    def __len__(self) -> int:
+        return len(self.config_files) * self.repetitions * len(self.seeds)
+
+
+def run_job(job: Job) -> Dict[str, Any]:
+    """Function:
+        Run a job in a worker process and measure it,
+        the world reading the settings of the job's configuration from its own context
+
+    Args:
+        job (Job): job to run
+
+    Returns:
+        Dict[str, Any]: job, metrics of the run, and the error that stopped it if any
+    """
+    start = default_timer()
+    result: Dict[str, Any] = asdict(job) | {'key': job.key}
+    try:
+        context = SimContext.from_config(config_file=job.config_file)
+        if job.seed is not None:
+            random.seed(job.seed)
+            np.random.seed(job.seed)
+
+        world = World(world_id=0,
+                      context=context)
+        world.init()
+
+        born_animals = 0
+        max_generation = 0
+        world.running = True
+        while world.running and (job.n_cycles is None or
+                                 world.simulation.state.cycle < job.n_cycles):
+            world.run(n_cycles=1)
+            newborns = world.simulation.state.added_entities["Animal"].values()
+            born_animals += len(newborns)
+            max_generation = max([max_generation] + [animal.generation for animal in newborns])
+
+        state = world.simulation.state
+        world.shutdown()
+        result |= {'cycles': state.cycle,
+                   'generations': max_generation,
+                   'born_animals': born_animals,
+                   'animals': state.n_animals,
+                   'trees': state.n_trees}
+
+    except Exception as e:
+        result['error'] = repr(e)
+
+    result['seconds'] = default_timer() - start
+
+    return result
+
+
+def read_completed(results_file: str) -> Set[str]:
+    """Function:
+        Read the jobs already completed by a previous run of a sweep
+
+    Args:
+        results_file (str): file the results are appended to, one per line
+
+    Returns:
+        Set[str]: keys of the jobs completed without error
+    """
+    if not isfile(results_file):
+        return set()
+
+    completed = set()
+    with open(results_file, encoding="utf-8") as read_file:
+        for line in read_file:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                # Line cut by an interruption
+                continue
+
+            if 'error' not in result:
+                completed.add(result['key'])
+
+    return completed
+
+
+def run_sweep(sweep: Sweep, results_file: Optional[str] = None,
+              max_workers: Optional[int] = None) -> Dict[str, float]:
+    """Function:
+        Run the jobs of a sweep not completed yet on a pool of processes,
+        appending each result to a file as soon as it arrives,
+        so that an interrupted sweep resumes where it stopped
+
+        Workers are reused from a job to the next one,
+        each run keeping its configuration in its own context
+
+    Args:
+        sweep (Sweep):                      experiment to run
+        results_file (Optional[str], optional): file of the results, one JSON per line.
+                                                Defaults to None, sweep.jsonl in the measurements directory.
+        max_workers (Optional[int], optional): number of jobs run at once. Defaults to None, the number of cores.
+
+    Returns:
+        Dict[str, float]: number of jobs run, skipped and failed, and the throughput of the sweep
+    """
+    results_file = results_file or join(MEASUREMENTS_DIRECTORY, "sweep.jsonl")
+    makedirs(dirname(results_file) or ".", exist_ok=True)
+    completed = read_completed(results_file=results_file)
+    jobs: List[Job] = [job for job in sweep if job.key not in completed]
+    max_workers = max(1, min(max_workers or cpu_count() or 1, len(jobs) or 1))
+
+    report = {'jobs': len(sweep),
+              'skipped': len(sweep) - len(jobs),
+              'run': 0,
+              'failed': 0,
+              'cycles': 0}
+
+    start = default_timer()
+    with (multiprocessing.Pool(processes=max_workers) as pool,
+          open(results_file, "a", encoding="utf-8") as write_file):
+        for result in pool.imap_unordered(run_job, jobs):
+            write_file.write(json.dumps(result) + "\n")
+            write_file.flush()
+
+            report['run'] += 1
+            if 'error' in result:
+                report['failed'] += 1
+            else:
+                report['cycles'] += result['cycles']
+
+            print(f"{report['run']}/{len(jobs)} {result['key']}: "
+                  f"{result.get('error', result.get('cycles'))} ({result['seconds']:.1f} s)")
+
+        # Let the workers exit on their own, the display library
+        # they imported catching the signal sent by terminate
+        pool.close()
+        pool.join()
+
+    elapsed = default_timer() - start
+    report |= {'seconds': elapsed,
+               'jobs_per_hour': report['run'] / elapsed * 3600 if elapsed else 0.0,
+               'cycles_per_second': report['cycles'] / elapsed if elapsed else 0.0}
+
+    print(f"{report['run']} jobs run on {max_workers} workers in {elapsed:.1f} s, "
+          f"{report['skipped']} already completed, {report['failed']} failed: "
+          f"{report['jobs_per_hour']:.1f} jobs/h, {report['cycles_per_second']:.1f} cycles/s")
+
+    return report
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from entities import Animal, Entity, Tree
+    from columns import EntityColumns
+
+from typing import Any, Collection, Dict, Mapping, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from .grid import CellKind, Grid
+from .running.config import config
+from .universal import get_offset_tables, get_ring_offsets
+
+
+def find_closest_inputs(positions: npt.NDArray[np.int64], kinds: npt.NDArray[np.uint8],
+                        kind: CellKind, sight_range: int) -> npt.NDArray[np.float64]:
+    """Function:
+        Find the normalized distance and angle of the closest object of a kind
+        for a batch of positions, the closest object being searched
+        on the closest ring containing one, as Entity._find_closest_object_inputs does
+
+    Args:
+        positions (npt.NDArray[np.int64]):  N×2 positions of the observers
+        kinds (npt.NDArray[np.uint8]):      occupancy layer of the grid
+        kind (CellKind):                    kind of object to look for
+        sight_range (int):                  maximum distance of visible objects
+
+    Returns:
+        npt.NDArray[np.float64]: N×2 normalized distance and angle, -1 if nothing is visible
+    """
+    radius = sight_range - 1
+    inputs = np.full((len(positions), 2), -1.0)
+    offsets, rings = get_ring_offsets(radius=radius)
+    if not len(positions) or not len(offsets):
+        return inputs
+
+    # Cells seen by each observer, N×K, on a layer padded with empty cells
+    padded = np.pad((kinds & kind) != 0, radius)
+    cells = positions[:, np.newaxis, :] + (offsets + radius)
+    hits = padded[cells[..., 0], cells[..., 1]]
+
+    closest_ring = np.where(hits, rings, sight_range).min(axis=1)
+    distance_table, norm_angle_table = get_offset_tables(radius=radius)
+    distances = distance_table[offsets[:, 0] + radius, offsets[:, 1] + radius]
+    visible = (hits
+               & (rings == closest_ring[:, np.newaxis])
+               & (distances <= sight_range))
+
+    closest = np.where(visible, distances, np.inf).argmin(axis=1)
+    found = visible.any(axis=1)
+
+    dx, dy = offsets[closest[found]].T + radius
+    inputs[found, 0] = (sight_range - distance_table[dx, dy]) / (sight_range - 1)
+    inputs[found, 1] = norm_angle_table[dx, dy]
+
+    return inputs
+
+
+class Senses:
+    """Class:
+        Perceptions of the whole population,
+        computed in one batch at the start of a cycle
+
+        Attributes:
+            animal_inputs (npt.NDArray[np.float64]):    N×8 inputs of the animals
+            tree_inputs (npt.NDArray[np.float64]):      M×6 inputs of the trees
+            _rows (Dict[int, npt.NDArray[np.float64]]): row of inputs by entity id
+
+        Methods:
+            sense:      compute the inputs of all the animals and trees
+            get_inputs: get the row of inputs of an entity
+    """
+    def __init__(self):
+        """Constructor:
+            Initialize empty perceptions
+        """
+        self.animal_inputs: npt.NDArray[np.float64] = np.empty((0, 8))  # N×8 inputs of the animals
+        self.tree_inputs: npt.NDArray[np.float64] = np.empty((0, 6))    # M×6 inputs of the trees
+        self._rows: Dict[int, npt.NDArray[np.float64]] = {}             # row of inputs by entity id
+
+    @staticmethod
+    def _internal_inputs(entities: Collection[Entity], settings: Dict,
+                         columns: Optional[EntityColumns] = None) -> npt.NDArray[np.float64]:
+        """Private method:
+            Normalize the internal properties of entities,
+            age is the one the entities will have when thinking this cycle
+
+        Args:
+            entities (Collection[Entity]):                  entities to normalize
+            settings (Dict):                                configuration of the kind of entity
+            columns (Optional[EntityColumns], optional):    columns storing the entities' state,
+                                                            read directly if all of them are attached. Defaults to None.
+
+        Returns:
+            npt.NDArray[np.float64]: n×4 age, size, blue and red energy
+        """
+        rows = columns.get_rows(entities=entities) if columns is not None else None
+        if rows is not None and (rows >= 0).all():
+            internal = columns.gather(rows=rows,
+                                      names=('age', 'max_age', 'size',
+                                             'blue_energy', 'red_energy')).astype(np.float64)
+            internal[:, 0] += 1
+
+        else:
+            internal = np.array([(entity.age + 1, entity.max_age, entity.size,
+                                  entity.blue_energy, entity.red_energy)
+                                 for entity in entities], dtype=np.float64).reshape(-1, 5)
+
+        return np.column_stack((internal[:, 0] / internal[:, 1],
+                                internal[:, 2] / settings["normal_size"],
+                                internal[:, 3:] / settings["normal_energy"]))
+
+    def sense(self, grid: Grid, animals: Collection[Animal], trees: Collection[Tree],
+              columns: Optional[EntityColumns] = None,
+              settings: Optional[Mapping[str, Any]] = None) -> None:
+        """Public method:
+            Compute the inputs of all the animals and trees
+
+        Args:
+            grid (Grid):                                    grid on which the entities live
+            animals (Collection[Animal]):                   animals of the simulation
+            trees (Collection[Tree]):                       trees of the simulation
+            columns (Optional[EntityColumns], optional):    columns storing the entities' state. Defaults to None.
+            settings (Optional[Mapping[str, Any]], optional): settings of the simulation,
+                                                            the configuration's if None. Defaults to None.
+        """
+        settings = settings if settings is not None else config['Simulation']
+        animal_settings = settings['Animal']
+        tree_settings = settings['Tree']
+
+        animal_positions = np.array([animal.position for animal in animals],
+                                    dtype=np.int64).reshape(-1, 2)
+        tree_positions = np.array([tree.position for tree in trees],
+                                  dtype=np.int64).reshape(-1, 2)
+
+        self.animal_inputs = np.column_stack((
+            self._internal_inputs(entities=animals,
+                                  settings=animal_settings,
+                                  columns=columns),
+            find_closest_inputs(positions=animal_positions,
+                                kinds=grid.entity_kinds,
+                                kind=CellKind.ANIMAL,
+                                sight_range=animal_settings['entity_sight_range']),
+            find_closest_inputs(positions=animal_positions,
+                                kinds=grid.resource_kinds,
+                                kind=CellKind.ENERGY,
+                                sight_range=animal_settings['energy_sight_range'])))
+
+        self.tree_inputs = np.column_stack((
+            self._internal_inputs(entities=trees,
+                                  settings=tree_settings,
+                                  columns=columns),
+            find_closest_inputs(positions=tree_positions,
+                                kinds=grid.resource_kinds,
+                                kind=CellKind.ENERGY,
+                                sight_range=tree_settings['energy_sight_range'])))
+
+        self._rows = {entity.id: row
+                      for entities, inputs in ((animals, self.animal_inputs),
+                                               (trees, self.tree_inputs))
+                      for entity, row in zip(entities, inputs)}
+
+    def get_inputs(self, entity: Entity) -> Optional[npt.NDArray[np.float64]]:
+        """Public method:
+            Get the row of inputs of an entity
+
+        Args:
+            entity (Entity): entity to get the inputs of
+
+        Returns:
+            Optional[npt.NDArray[np.float64]]: inputs of the entity, None if it was not sensed
+        """
+        return self._rows.get(entity.id)
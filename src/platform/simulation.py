@@ -5,19 +5,30 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from entities import Animal, Tree, Entity
 
-from itertools import product
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from math import ceil
-from random import choice, randint, random, sample
-from typing import Any, Dict, Final, Optional, Set, Tuple, ValuesView
+from operator import attrgetter
+from os import cpu_count
+from random import randint, random
+from typing import Any, Dict, Final, List, Optional, Sequence, Set, Tuple
 
+import numpy as np
 import numpy.typing as npt
+from project.src.rtNEAT.arena import BrainArena
+from project.src.rtNEAT.brain import Brain
+from project.src.rtNEAT.genome import Genome
 from project.src.rtNEAT.innovation import InnovTable
 
 from .actions import Action, ActionType, PickupAction
+from .columns import EntityColumns
 from .energies import BlueEnergy, Energy, EnergyType, RedEnergy, Resource
 from .entities import Animal, Entity, Seed, Status, Tree
-from .grid import Grid
-from .running.config import config
+from .expiry import ExpiryWheel
+from .grid import CellKind, Grid
+from .lineage import Lineage
+from .running.config import SimContext, config, default_context
+from .sensing import Senses
+from .spatial import SpatialIndex
 from .universal import Position
 
 
@@ -29,15 +40,20 @@ class SimState:
             __id (int):                                 unique identifier
             next_entity_id (int):                       incremental value for the next entity identifier
             next_energy_id (int):                       incremental value for the next energy identifier
+            id_stride (int):                            step between identifiers, to share them between simulations
             animals (Dict[int, Animal]):                register of simulation's animals
             trees (Dict[int, Tree]):                    register of simulation's trees
             energies (Dict[int, Energy]):               register of simulation's energies
             seeds (Dict[int, Seed]):                    register of simulation's seeds
+            _entities (Dict[int, Entity]):              register of animals and trees, kept up to date
+            _resources (Dict[int, Resource]):           register of energies and seeds, kept up to date
             added_entities (Dict[int, Entity]):         register of added entities in the last simulation cycle
             removed_entities (Dict[int, Entity]):       register of removed entities in the last simulation cycle
             added_resources (Dict[int, Resource]):      register of added resources in the last simulation cycle
             removed_resources (Dict[int, Resource]):    register of removed resources in the last simulation cycle
             cycle (int):                                current cycle
+            lineage (Lineage):                          parents of every entity born in the simulation
+            columns (EntityColumns):                    scalar state of the entities, by row
 
         Methods:
             get_entities: get all   entities currently in the simulation
@@ -46,29 +62,39 @@ class SimState:
             increment_entity_id:    increment the current entity id
             get_energy_id:          get the current energy id
             increment_energy_id:    increment the current energy id
+            allocate_entity_ids:    reserve a block of entity ids
+            allocate_energy_ids:    reserve a block of energy ids
             add_entity:             add an entity to the register
             remove_entity:          remove a entity from the register
             add_resource:           adds a resource to the register
             remove_resource:        remove a resource from the register
             new_cycle:              start a new cycle of simulation
+            _reindex:               update an entry of a unified register
     """
     def __init__(self,
-                 sim_id: int):
+                 sim_id: int,
+                 context: Optional[SimContext] = None):
         """Constructor:
             Initialize a new simulation state
 
         Args:
-            sim_id (int): unique identifier of the simulation
+            sim_id (int):                               unique identifier of the simulation
+            context (Optional[SimContext], optional):   settings of the simulation,
+                                                        the process configuration if None. Defaults to None.
         """
+        context = context if context is not None else default_context
 
         self.__id: int = sim_id                                 # unique identifier
         self.next_entity_id: int  = 1                           # incremental value for the next entity identifier
         self.next_energy_id: int = 1                            # incremental value for the next energy identifier
+        self.id_stride: int = 1                                 # step between identifiers
 
         self.animals: Dict[int, Animal] = {}                    # register of simulation's animals
         self.trees: Dict[int, Tree] = {}                        # register of simulation's trees
         self.energies: Dict[int, Energy] = {}                   # register of simulation's energies
         self.seeds: Dict[int, Seed] = {}                        # register of simulation's seeds
+        self._entities: Dict[int, Entity] = {}                  # register of animals and trees, kept up to date
+        self._resources: Dict[int, Resource] = {}               # register of energies and seeds, kept up to date
 
         self.added_entities: Dict[int, Entity] = {"Animal": {},
                                                   "Tree": {}}   # register of added entities in the last simulation cycle
@@ -77,6 +103,8 @@ class SimState:
         self.removed_resources: Dict[int, Resource] = {}        # register of removed resources in the last simulation cycle
 
         self.cycle: int = 0
+        self.lineage: Lineage = Lineage(max_depth=context['Simulation']['Animal']['lineage_depth'])  # parents of every entity born in the simulation
+        self.columns: EntityColumns = EntityColumns()           # scalar state of the entities, by row
 
     @property
     def id(self) -> int:
@@ -88,24 +116,27 @@ class SimState:
         """
         return self.__id
 
-    def get_entities(self) -> ValuesView[Entity]:
+    def get_entities(self) -> List[Entity]:
         """Public method:
-            Get all entities currently in the simulation
+            Get all entities currently in the simulation,
+            animals then trees, in a snapshot that stays valid
+            while entities are added or removed
 
         Returns:
-            ValuesView[Entity]: all entities in the simulation
+            List[Entity]: all entities in the simulation
         """
-        return (self.animals | self.trees).values()
+        return [*self.animals.values(), *self.trees.values()]
 
     @property
     def entities(self) -> Dict[int, Entity]:
         """Property:
-            Return the register of entities
+            Return the register of entities,
+            kept up to date by the state and not to be modified
 
         Returns:
             Dict[int, Entity]: register of entities
         """
-        return self.animals | self.trees
+        return self._entities
 
     @property
     def n_animals(self) -> int:
@@ -135,26 +166,38 @@ class SimState:
         Returns:
             int: number of entities in the simulation
         """
-        return len(self.entities)
+        return len(self._entities)
 
-    def get_resources(self) -> ValuesView[Resource]:
+    def get_resources(self) -> List[Resource]:
         """Public method:
-            Get all the resources currently in the simulation
+            Get all the resources currently in the simulation,
+            in a snapshot that stays valid while resources are added or removed
 
         Returns:
-            ValuesView[Resource]: all resources in the simulation
+            List[Resource]: all resources in the simulation
         """
-        return (self.energies | self.seeds).values()
+        return list(self._resources.values())
 
     @property
     def resources(self) -> Dict[int, Resource]:
         """Property:
-            Return the register of resources
+            Return the register of resources,
+            kept up to date by the state and not to be modified
 
         Returns:
             Dict[int, Resource]: register of resources
         """
-        return self.energies | self.seeds
+        return self._resources
+
+    @property
+    def n_resources(self) -> int:
+        """Property:
+            Return the number of resources in the simulation
+
+        Returns:
+            int: number of resources in the simulation
+        """
+        return len(self._resources)
 
     @property
     def n_energies(self) -> int:
@@ -185,12 +228,27 @@ class SimState:
 
     def increment_entity_id(self, amount: int=1) -> None:
         """Public method:
-            Increment the current entity id by a given amount
+            Increment the current entity id by a given amount of ids
 
         Args:
             amount (int, optional): entity id's increment. Defaults to 1.
         """
-        self.next_entity_id += amount
+        self.next_entity_id += amount * self.id_stride
+
+    def allocate_entity_ids(self, amount: int) -> range:
+        """Public method:
+            Reserve a block of entity ids
+
+        Args:
+            amount (int): number of ids to reserve
+
+        Returns:
+            range: reserved ids
+        """
+        first_id = self.next_entity_id
+        self.increment_entity_id(amount=amount)
+
+        return range(first_id, self.next_entity_id, self.id_stride)
 
     def get_energy_id(self, increment: bool=False) -> int:
         """Public method:
@@ -210,12 +268,27 @@ class SimState:
         return energy_id
 
     def increment_energy_id(self, amount: int=1) -> None:
-        """ Increment the current energy id by a given amount
+        """ Increment the current energy id by a given amount of ids
 
         Args:
             amount (int, optional): energy id's increment. Defaults to 1.
         """
-        self.next_energy_id += amount
+        self.next_energy_id += amount * self.id_stride
+
+    def allocate_energy_ids(self, amount: int) -> range:
+        """Public method:
+            Reserve a block of energy ids
+
+        Args:
+            amount (int): number of ids to reserve
+
+        Returns:
+            range: reserved ids
+        """
+        first_id = self.next_energy_id
+        self.increment_energy_id(amount=amount)
+
+        return range(first_id, self.next_energy_id, self.id_stride)
 
     def add_entity(self, new_entity: Entity) -> None:
         """Public method:
@@ -233,6 +306,11 @@ class SimState:
                 self.trees[new_entity.id] = new_entity
                 self.added_entities["Tree"][new_entity.id] = new_entity
 
+        self._reindex(register=self._entities,
+                      registers=(self.animals, self.trees),
+                      obj_id=new_entity.id)
+        self.columns.attach(entity=new_entity)
+
         # self.added_entities[new_entity.id] = new_entity
 
     def remove_entity(self, entity: Entity) -> None:
@@ -251,6 +329,11 @@ class SimState:
             case "Tree":
                 self.trees.pop(entity.id)
 
+        self._reindex(register=self._entities,
+                      registers=(self.animals, self.trees),
+                      obj_id=entity.id)
+        self.columns.detach(entity=entity)
+
     def add_resource(self, new_resource: Resource) -> None:
         """Public method:
             Add an resource to the register
@@ -265,6 +348,9 @@ class SimState:
         else:
             self.seeds[new_resource.id] = new_resource
 
+        self._reindex(register=self._resources,
+                      registers=(self.energies, self.seeds),
+                      obj_id=new_resource.id)
         self.added_resources[new_resource.id] = new_resource
 
     def remove_resource(self, resource: Resource) -> None:
@@ -280,8 +366,31 @@ class SimState:
         else:
             self.seeds.pop(resource.id)
 
+        self._reindex(register=self._resources,
+                      registers=(self.energies, self.seeds),
+                      obj_id=resource.id)
         self.removed_resources[resource.id] = resource
 
+    @staticmethod
+    def _reindex(register: Dict[int, Any], registers: Tuple[Dict[int, Any], ...],
+                 obj_id: int) -> None:
+        """Private static method:
+            Update the entry of an id in a unified register
+            from the registers by type, the last one taking precedence
+            for ids shared between types
+
+        Args:
+            register (Dict[int, Any]):                  unified register to update
+            registers (Tuple[Dict[int, Any], ...]):     registers by type
+            obj_id (int):                               id of the added or removed object
+        """
+        for type_register in reversed(registers):
+            if obj_id in type_register:
+                register[obj_id] = type_register[obj_id]
+                return
+
+        register.pop(obj_id, None)
+
     def new_cycle(self) -> None:
         """Public method:
             Start a new cycle of simulation
@@ -302,14 +411,28 @@ class Environment:
             __id (int):                     unique identifier
             state (SimState):               state of the simulation
             grid (Grid):                    2 dimensional grid
+            spatial_index (SpatialIndex):   index of the positions of the objects in the world
+            senses (Senses):                perceptions of the entities sensed at the start of the cycle
+            animal_arena (BrainArena):      compiled brains of the animals
+            tree_arena (BrainArena):        compiled brains of the trees
+            _thinkers (Set[int]):           ids of the entities whose brain was evaluated this cycle
+            _executor (Optional[Executor]): pool of threads or processes evaluating the brains in chunks
+            expiries (ExpiryWheel):         resources by the cycle they expire in
             dimensions (Tuple[int, int]):   dimensions of the world
+            context (SimContext):           settings of the simulation
+            populated_area (Optional[Tuple[int, int, int, int]]):
+                                            cells x1, y1, x2, y2 populated, None for the whole grid
 
         Methods:
             spawn_animal:               create an animal at given coordinates and add it to the world
             spawn_tree:                 create a tree at given coordinates and add it to the world
+            spawn_animals:              create animals at many coordinates at once and add them to the world
+            spawn_trees:                create trees at many coordinates at once and add them to the world
+            spawn_immigrants:           create animals around genotypes evolved in another world
             create_seed_from_tree:      create a seed from a tree
             sprout_tree:                spawn a tree from a seed at a given position on the grid
             create_energy:              create energy on the grid
+            create_energies:            create energies at many coordinates at once on the grid
             remove_resource:            remove resource from the grid
             remove_entity:              remove entity from the grid
             decompose_entity:           decompose an entity into its energy components
@@ -319,6 +442,15 @@ class Environment:
             get_colors_around:          get the colors in a radis around certain coordinates
             modify_cell_color:          change the color of a cell
             find_trees_around:          find and return all the cells occupied by trees
+            sense:                      compute the inputs of all the entities in one batch
+            get_sensed_inputs:          get the inputs sensed for an entity this cycle
+            think:                      evaluate the brains of the entities sensed in one batch
+            get_thoughts:               get the outputs of the brain of an entity evaluated this cycle
+            decide:                     let every entity decide on its actions from the cycle-start state
+            act:                        apply the decided actions in a deterministic order
+            shutdown:                   stop the pool evaluating the brains
+            age_entities:               age the whole population at once
+            expire_resources:           remove the resources expiring this cycle
     """
     GRID_WIDTH: Final[int] = config['Simulation']['grid_width']
     GRID_HEIGHT: Final[int] = config['Simulation']['grid_height']
@@ -326,23 +458,41 @@ class Environment:
     def __init__(self,
                  env_id: int,
                  sim_state: Optional[SimState] = None,
-                 dimensions: Optional[Tuple[int, int]] = None):
+                 dimensions: Optional[Tuple[int, int]] = None,
+                 context: Optional[SimContext] = None):
         """Constructor:
             Initiliaze an environment
 
         Args:
             env_id (int):                               unique identifier
             sim_state (Optional[SimState], optional):   simulation's state. Defaults to None.
-            dimensions (Tuple[int, int], optional):     dimensions of the world. Defaults to (20, 20).
+            dimensions (Tuple[int, int], optional):     dimensions of the world. Defaults to the settings' grid.
+            context (Optional[SimContext], optional):   settings of the simulation,
+                                                        the process configuration if None. Defaults to None.
         """
 
         self.__id: int = env_id                                     # unique identifier
+        self.context: SimContext = (context if context is not None  # settings of the simulation
+                                    else default_context)
 
-        self.state: SimState = sim_state or SimState(sim_id=env_id) # simulation's state
+        self.state: SimState = sim_state or SimState(sim_id=env_id, # simulation's state
+                                                     context=self.context)
         self.grid: Grid                                             # 2 dimensional grid
+        self.spatial_index: SpatialIndex                            # index of the positions of the objects
+        self.senses: Senses = Senses()                              # perceptions sensed at the start of the cycle
+        self.animal_arena: BrainArena = BrainArena(                 # compiled brains of the animals
+                                            n_inputs=self.context['Simulation']['Animal']['num_input'],
+                                            n_outputs=self.context['Simulation']['Animal']['num_output'])
+        self.tree_arena: BrainArena = BrainArena(                   # compiled brains of the trees
+                                            n_inputs=self.context['Simulation']['Tree']['num_tree_input'],
+                                            n_outputs=self.context['Simulation']['Tree']['num_tree_output'])
+        self._thinkers: Set[int] = set()                            # entities whose brain was evaluated
+        self._executor: Optional[Executor] = None                   # pool evaluating the brains in chunks
+        self.expiries: ExpiryWheel = ExpiryWheel()                  # resources by the cycle they expire in
         self.dimensions: Tuple[int, int] = dimensions or (          # dimensions of the world
-                                            Environment.GRID_WIDTH,
-                                            Environment.GRID_HEIGHT)
+                                            self.context['Simulation']['grid_width'],
+                                            self.context['Simulation']['grid_height'])
+        self.populated_area: Optional[Tuple[int, int, int, int]] = None  # cells populated, None for the whole grid
 
     def init(self, populate: bool=False) -> Optional[SimState]:
         """Public method:
@@ -358,6 +508,8 @@ class Environment:
         self.grid = Grid(grid_id=self.id,
                          dimensions=self.dimensions)
 
+        self.spatial_index = SpatialIndex()
+
         if populate:
             return self._populate()
 
@@ -370,10 +522,10 @@ class Environment:
         """
         self.state = self._populate_animal()
 
-        if config['Simulation']['spawn_initial_energy']:
+        if self.context['Simulation']['spawn_initial_energy']:
             self.state = self._populate_energy()
 
-        if config['Simulation']['spawn_tree']:
+        if self.context['Simulation']['spawn_tree']:
             self.state = self._populate_tree()
 
         return self.state
@@ -389,11 +541,11 @@ class Environment:
         width, height = self.dimensions
 
         # How much time the grid can be divided by sections
-        num_min_section_horizontal = int(width/config["Simulation"]["min_horizontal_size_section"])
-        num_min_section_vertical = int(height/config["Simulation"]["min_vertical_size_section"])
+        num_min_section_horizontal = int(width/self.context["Simulation"]["min_horizontal_size_section"])
+        num_min_section_vertical = int(height/self.context["Simulation"]["min_vertical_size_section"])
 
-        num_max_section_horizontal = int(width/config["Simulation"]["max_horizontal_size_section"])
-        num_max_section_vertical = int(height/config["Simulation"]["max_vertical_size_section"])
+        num_max_section_horizontal = int(width/self.context["Simulation"]["max_horizontal_size_section"])
+        num_max_section_vertical = int(height/self.context["Simulation"]["max_vertical_size_section"])
 
         # Choose the number of divisions into section h * v
         horizontal_divisor = randint(num_max_section_horizontal,
@@ -405,17 +557,13 @@ class Environment:
         section_horizontal_size = ceil(width/horizontal_divisor)
         section_vertical_size = ceil(height/vertical_divisor)
 
-        possible_coordinates = set(product(range(section_horizontal_size),
-                                           range(section_vertical_size)))
-
-        section_dimension = len(possible_coordinates)
+        section_dimension = section_horizontal_size * section_vertical_size
 
         populate_properties = {'section_dimension': section_dimension,
                                'horizontal_divisor': horizontal_divisor,
                                'section_horizontal_size': section_horizontal_size,
                                'vertical_divisor': vertical_divisor,
-                               'section_vertical_size': section_vertical_size,
-                               'possible_coordinates': possible_coordinates}
+                               'section_vertical_size': section_vertical_size}
 
         return populate_properties
 
@@ -426,7 +574,7 @@ class Environment:
         Returns:
             SimState: state of the simulation
         """
-        energy_sparsity: Final[int] = config["Simulation"]["energy_sparsity"] #+ config["Simulation"]["difficulty_level"] - 1
+        energy_sparsity: Final[int] = self.context["Simulation"]["energy_sparsity"] #+ self.context["Simulation"]["difficulty_level"] - 1
         self._populate_with_item(sparsity=energy_sparsity,
                                  item='energy')
         print(f"Initial population of energies: {self.state.n_energies}")
@@ -439,7 +587,7 @@ class Environment:
         Returns:
             SimState: state of the simulation
         """
-        animal_sparsity: Final[int] = config["Simulation"]["animal_sparsity"]
+        animal_sparsity: Final[int] = self.context["Simulation"]["animal_sparsity"]
         self._populate_with_item(sparsity=animal_sparsity,
                                  item='animal')
         print(f"Initial population of animal: {self.state.n_animals}")
@@ -452,15 +600,50 @@ class Environment:
         Returns:
             SimState: state of the simulation
         """
-        tree_sparsity: Final[int] = config["Simulation"]["tree_sparsity"]
+        tree_sparsity: Final[int] = self.context["Simulation"]["tree_sparsity"]
         self._populate_with_item(sparsity=tree_sparsity,
                                  item='tree')
         print(f"Initial population of trees: {self.state.n_trees}")
         return self.state
 
+    def _sample_populate_coordinates(self, sparsity: int) -> npt.NDArray[np.int64]:
+        """Private method:
+            Divide the grid into sections and sample
+            a random number of distinct cells in each of them at once
+
+        Args:
+            sparsity (int): determine the density of populating
+
+        Returns:
+            npt.NDArray[np.int64]: N×2 coordinates of the sampled cells, in the populated area
+        """
+        prop = self._get_populate_properties()
+        section_dimension = prop['section_dimension']
+        density = min(int(section_dimension/sparsity), section_dimension)
+        n_sections = prop['horizontal_divisor'] * prop['vertical_divisor']
+
+        # Number of cells in each section, then that many cells
+        # drawn without replacement from a random order of each section
+        counts = np.random.randint(0, density + 1, size=n_sections)
+        order = np.argsort(np.random.random((n_sections, section_dimension)), axis=1)
+        cells = order[np.arange(section_dimension) < counts[:, None]]
+        sections = np.repeat(np.arange(n_sections), counts)
+
+        h, v = np.divmod(sections, prop['vertical_divisor'])
+        x, y = np.divmod(cells, prop['section_vertical_size'])
+        x, y = x + h * prop['section_horizontal_size'], y + v * prop['section_vertical_size']
+
+        if self.populated_area is not None:
+            x1, y1, x2, y2 = self.populated_area
+            inside = (x >= x1) & (x < x2) & (y >= y1) & (y < y2)
+            x, y = x[inside], y[inside]
+
+        return np.column_stack((x, y))
+
     def _populate_with_item(self, sparsity:int, item:str) -> SimState:
         """Private method:
-            Populate the world with a specified item
+            Populate the world with a specified item,
+            spawning all of them in one bulk operation
 
         Args:
             sparsity (int): determine the density of populating
@@ -469,42 +652,30 @@ class Environment:
         Returns:
             SimState: state of the simulation
         """
-        prop = self._get_populate_properties()
-        density = int(prop['section_dimension']/sparsity)
-
-        for h in range(prop['horizontal_divisor']):
-            x_offset = h * prop['section_horizontal_size']
-            for v in range(prop['vertical_divisor']):
-                y_offset = v * prop['section_vertical_size']
-
-                num_section = randint(0, density)
-                coordinates = sample(prop['possible_coordinates'],
-                                     num_section)
-
-                for x, y in coordinates:
-
-                    match item:
-                        case 'energy':
-                            quantity =  int(config['Simulation']['energy_quantity']
-                                          * config['Simulation']['difficulty_level'])
-
-                            quantity = randint(int(quantity/2), quantity)
-                            self.create_energy(energy_type=choice(list(EnergyType)),
-                                               quantity=quantity,
-                                               coordinates=(x + x_offset,
-                                                            y + y_offset),
-                                               expiry=config['Simulation']['energy_expiry'])
-
-                        case 'animal':
-                            self.spawn_animal(coordinates=(x + x_offset,
-                                                           y + y_offset),
-                                              blue_energy=Animal.INITIAL_ANIMAL_BLUE_ENERGY,
-                                              red_energy=Animal.INITIAL_ANIMAL_RED_ENERGY,
-                                              size=Animal.INITIAL_SIZE)
-
-                        case 'tree':
-                            self.spawn_tree(coordinates=(x + x_offset,
-                                                         y + y_offset))
+        coordinates = self._sample_populate_coordinates(sparsity=sparsity)
+
+        match item:
+            case 'energy':
+                quantity =  int(self.context['Simulation']['energy_quantity']
+                              * self.context.difficulty_level)
+
+                energy_types = list(EnergyType)
+                self.create_energies(energy_types=[energy_types[index] for index in
+                                                   np.random.randint(0, len(energy_types),
+                                                                     size=len(coordinates))],
+                                     quantities=np.random.randint(int(quantity/2), quantity + 1,
+                                                                  size=len(coordinates)),
+                                     coordinates=coordinates,
+                                     expiry=self.context.energy_expiry)
+
+            case 'animal':
+                self.spawn_animals(coordinates=coordinates,
+                                   blue_energy=self.context['Simulation']['Animal']['init_blue_energy'],
+                                   red_energy=self.context['Simulation']['Animal']['init_red_energy'],
+                                   size=self.context['Simulation']['Entity']['initial_size'])
+
+            case 'tree':
+                self.spawn_trees(coordinates=coordinates)
 
         return self.state
 
@@ -530,6 +701,8 @@ class Environment:
         # and new position to occupied by self
         if self.grid.entity_grid.update_cell(new_coordinates=action.coordinates,
                                              value=animal):
+            self.spatial_index.move(obj=animal,
+                                    coordinates=action.coordinates)
             animal.on_move(new_position=action.coordinates)
 
             action = PickupAction(coordinates=animal.position)
@@ -628,12 +801,12 @@ class Environment:
             action (Action): reproduce action
         """
         """ entities_around = self.grid.find_animal_instances(coordinates=animal.position,
-                                                          radius=config['Simulation']['Animal']['reproduction_range']) """
+                                                          radius=self.context['Simulation']['Animal']['reproduction_range']) """
 
 
-        reproduction_range = config['Simulation']['Animal']['reproduction_range']
-        animals_around = self. find_animals_around(coordinates=animal.position,
-                                                   radius=config['Simulation']['Animal']['reproduction_range'])
+        reproduction_range = self.context['Simulation']['Animal']['reproduction_range']
+        animals_around = self.find_animals_around(coordinates=animal.position,
+                                                   radius=self.context['Simulation']['Animal']['reproduction_range'])
         fitness: int = 0
         most_suitable_mate: Animal = None
         for other_entity in animals_around:
@@ -642,7 +815,7 @@ class Environment:
                 and animal.pos.distance(other_entity.pos)
                 <= reproduction_range):
 
-                if (not config['Simulation']['Animal']['incest']
+                if (not self.context['Simulation']['Animal']['incest']
                     and self._check_incest(parent1=animal,
                                            parent2=other_entity)):
 
@@ -702,13 +875,18 @@ class Environment:
         self._entity_died(entity=animal)
 
     def _check_incest(self, parent1: Animal, parent2: Animal) -> bool:
-        return (parent1.ancestors == {}
-            or not (
-                       (parent1.ancestors == parent2.ancestors)
-                    or (parent1.id in parent2.ancestors)
-                    or (parent2.id in parent1.ancestors)
-                    )
-                )
+        """Private method:
+            Check in the lineage that two animals are not related
+
+        Args:
+            parent1 (Animal): first potential parent
+            parent2 (Animal): second potential parent
+
+        Returns:
+            bool: the animals can mate
+        """
+        return not self.state.lineage.are_kin(entity1_id=parent1.id,
+                                              entity2_id=parent2.id)
 
     def _on_animal_status(self, animal: Animal) -> None:
         """Private method:
@@ -722,8 +900,9 @@ class Environment:
                 self._on_animal_death(animal=animal)
 
             case Status.FERTILE:
-                entities_around = self.grid.find_animal_instances(coordinates=animal.position,
-                                                                  radius=config['Simulation']['Animal']['reproduction_range'])
+                entities_around = self.spatial_index.find_around(kinds=CellKind.ANIMAL,
+                                                                 coordinates=animal.position,
+                                                                 radius=self.context['Simulation']['Animal']['reproduction_range'])
 
                 energy_stock: int = 0
                 most_suitable_mate: Animal = None
@@ -731,7 +910,7 @@ class Environment:
                     # if other_entity.status == Status.FERTILE:
                     if other_entity.fitness > energy_stock:
 
-                        if (not config['Simulation']['Animal']['incest']
+                        if (not self.context['Simulation']['Animal']['incest']
                          and self._check_incest(parent1=animal,
                                                 parent2=other_entity)):
 
@@ -858,7 +1037,46 @@ class Environment:
             new_resource (Resource): new resource to register
         """
         if self.grid.place_resource(value=new_resource):
+            self._register_new_resource(new_resource=new_resource)
+
+    def _add_new_resources_to_world(self, new_resources: List[Resource],
+                                    coordinates: npt.NDArray[np.int64]) -> None:
+        """Private method:
+            Place many resources on the grid in one pass
+            and register them into the simulation state
+
+        Args:
+            new_resources (List[Resource]):         new resources to register
+            coordinates (npt.NDArray[np.int64]):    N×2 vacant coordinates of the resources
+        """
+        self.grid.place_resources(values=new_resources,
+                                  coordinates=coordinates)
+        self.spatial_index.insert_many(objects=new_resources,
+                                       coordinates=coordinates)
+
+        expiries: Dict[int, List[Resource]] = {}
+        for new_resource in new_resources:
             self.state.add_resource(new_resource=new_resource)
+            new_resource.birth_cycle = self.state.cycle
+            expiries.setdefault(new_resource.expiry_cycle, []).append(new_resource)
+
+        for cycle, resources in expiries.items():
+            self.expiries.schedule_many(resources=resources,
+                                        cycle=cycle)
+
+    def _register_new_resource(self, new_resource: Resource) -> None:
+        """Private method:
+            Register a resource placed on the grid into the simulation state
+
+        Args:
+            new_resource (Resource): new resource to register
+        """
+        self.spatial_index.insert(obj=new_resource)
+        self.state.add_resource(new_resource=new_resource)
+
+        new_resource.birth_cycle = self.state.cycle
+        self.expiries.schedule(resource=new_resource,
+                               cycle=new_resource.expiry_cycle)
 
     def _add_new_entity_to_world(self, new_entity: Entity):
         """Private method:
@@ -868,7 +1086,41 @@ class Environment:
             new_entity (Entity): new entity to register
         """
         if self.grid.place_entity(value=new_entity):
-            self.state.add_entity(new_entity=new_entity)
+            self.spatial_index.insert(obj=new_entity)
+            self._register_new_entity(new_entity=new_entity)
+
+    def _add_new_entities_to_world(self, new_entities: List[Entity],
+                                   coordinates: npt.NDArray[np.int64]) -> None:
+        """Private method:
+            Place many entities on the grid in one pass
+            and register them into the simulation state
+
+        Args:
+            new_entities (List[Entity]):            new entities to register
+            coordinates (npt.NDArray[np.int64]):    N×2 vacant coordinates of the entities
+        """
+        self.grid.place_entities(values=new_entities,
+                                 coordinates=coordinates)
+        self.spatial_index.insert_many(objects=new_entities,
+                                       coordinates=coordinates)
+
+        for new_entity in new_entities:
+            self._register_new_entity(new_entity=new_entity)
+
+    def _register_new_entity(self, new_entity: Entity) -> None:
+        """Private method:
+            Register an entity placed on the grid and indexed into the simulation state
+
+        Args:
+            new_entity (Entity): new entity to register
+        """
+        self.state.add_entity(new_entity=new_entity)
+        new_entity.lineage = self.state.lineage
+        new_entity.context = self.context
+
+        brain = self._get_brain(entity=new_entity)
+        if brain and brain.arena is None:
+            brain.register(arena=self._get_brain_arena(entity=new_entity))
 
     def _reproduce_entities(self, parent1: Entity, parent2: Entity) -> Optional[Entity]:
         """Private method:
@@ -882,11 +1134,11 @@ class Environment:
             Entity: born child
         """
         if (parent1.can_reproduce() and parent2.can_reproduce()
-            and random()<config['Simulation']['Animal']['success_reproduction']):
+            and random()<self.context['Simulation']['Animal']['success_reproduction']):
 
             parent1.on_reproduction()
             parent2.on_reproduction()
-            # config['Simulation']['Animal']['max_number_offsping']
+            # self.context['Simulation']['Animal']['max_number_offsping']
             for _ in range(1, randint(1, parent1.size) + 1):
 
                 free_cells = self.grid.entity_grid.select_free_coordinates(coordinates=parent1.position,
@@ -894,13 +1146,13 @@ class Environment:
                 birth_position = free_cells.pop() if free_cells else None
 
                 if birth_position:
-                    init_adult_size = config['Simulation']['Animal']['init_adult_size']
+                    init_adult_size = self.context['Simulation']['Animal']['init_adult_size']
                     adult_size = max(init_adult_size, int((parent1.size + parent2.size)/2))
 
                     child = self.spawn_animal(coordinates=birth_position,
                                               size=1,
-                                              blue_energy=Animal.INITIAL_ANIMAL_BLUE_ENERGY,
-                                              red_energy=int(Animal.INITIAL_ANIMAL_RED_ENERGY),
+                                              blue_energy=self.context['Simulation']['Animal']['init_blue_energy'],
+                                              red_energy=int(self.context['Simulation']['Animal']['init_red_energy']),
                                               adult_size=adult_size,
                                               birthday=self.state.cycle)
 
@@ -908,7 +1160,7 @@ class Environment:
                         child.on_birth(parent1=parent1,
                                        parent2=parent2)
 
-                        if config['Log']['birth']:
+                        if self.context['Log']['birth']:
                             print(f"{child} was born from {parent1} and {parent2}")
 
             # return child
@@ -930,6 +1182,7 @@ class Environment:
 
         animal = Animal(animal_id=animal_id,
                         position=coordinates,
+                        context=self.context,
                         **kwargs)
 
         self._add_new_entity_to_world(new_entity=animal)
@@ -953,12 +1206,104 @@ class Environment:
         tree_id = self.state.get_entity_id(increment=True)
         tree = Tree(tree_id=tree_id,
                     position=coordinates,
+                    context=self.context,
                     **kwargs)
 
         self._add_new_entity_to_world(new_entity=tree)
 
         return tree
 
+    def _select_vacant_entity_coordinates(self, coordinates: npt.ArrayLike) -> Tuple[npt.NDArray[np.int64], range]:
+        """Private method:
+            Keep the vacant coordinates of the entity layer
+            and allocate a block of entity ids for them
+
+        Args:
+            coordinates (npt.ArrayLike): N×2 coordinates where to spawn entities
+
+        Returns:
+            Tuple[npt.NDArray[np.int64], range]:    vacant coordinates,
+                                                    ids of the entities
+        """
+        coordinates = np.asarray(coordinates, dtype=np.int64).reshape(-1, 2)
+        coordinates = coordinates[self.grid.entity_grid.find_vacant_coordinates(coordinates=coordinates)]
+
+        return coordinates, self.state.allocate_entity_ids(amount=len(coordinates))
+
+    def spawn_animals(self, coordinates: npt.ArrayLike, **kwargs) -> List[Animal]:
+        """Public method:
+            Create animals at many coordinates at once and add them to the world,
+            occupied or out of bounds coordinates are skipped
+
+        Args:
+            coordinates (npt.ArrayLike): N×2 coordinates where the animals should be created
+
+        Returns:
+            List[Animal]: animals that were created
+        """
+        coordinates, ids = self._select_vacant_entity_coordinates(coordinates=coordinates)
+
+        animals = [Animal(animal_id=animal_id,
+                          position=(x, y),
+                          context=self.context,
+                          **kwargs)
+                   for animal_id, (x, y) in zip(ids, coordinates.tolist())]
+
+        self._add_new_entities_to_world(new_entities=animals,
+                                        coordinates=coordinates)
+
+        return animals
+
+    def spawn_immigrants(self, genomes: Sequence[Genome], **kwargs) -> List[Animal]:
+        """Public method:
+            Create animals around genotypes evolved in another world,
+            on free cells drawn at random
+
+        Args:
+            genomes (Sequence[Genome]): genotypes of the brains of the animals
+
+        Returns:
+            List[Animal]: animals that were created, fewer than the genotypes if the grid is full
+        """
+        free_cells = np.argwhere(self.grid.entity_kinds == CellKind.EMPTY)
+        cells = np.random.choice(len(free_cells),
+                                 size=min(len(genomes), len(free_cells)),
+                                 replace=False)
+
+        animals = self.spawn_animals(coordinates=free_cells[cells],
+                                     **kwargs)
+        for animal, genome in zip(animals, genomes):
+            animal._transplant_brain(brain=Brain.from_genome(brain_id=animal.id,
+                                                             genome=genome,
+                                                             arena=animal.brain.arena,
+                                                             settings=self.context['NEAT']))
+
+        return animals
+
+    def spawn_trees(self, coordinates: npt.ArrayLike, **kwargs) -> List[Tree]:
+        """Public method:
+            Create trees at many coordinates at once and add them to the world,
+            occupied or out of bounds coordinates are skipped
+
+        Args:
+            coordinates (npt.ArrayLike): N×2 coordinates where the trees should be created
+
+        Returns:
+            List[Tree]: trees that were created
+        """
+        coordinates, ids = self._select_vacant_entity_coordinates(coordinates=coordinates)
+
+        trees = [Tree(tree_id=tree_id,
+                      position=(x, y),
+                      context=self.context,
+                      **kwargs)
+                 for tree_id, (x, y) in zip(ids, coordinates.tolist())]
+
+        self._add_new_entities_to_world(new_entities=trees,
+                                        coordinates=coordinates)
+
+        return trees
+
     def _create_seed_from_tree(self, tree: Tree) -> Seed:
         """Private method:
             Create a seed from a tree remove the tree from the world
@@ -972,7 +1317,7 @@ class Environment:
         """
 
         # Create a seed from a tree
-        seed = tree.create_seed(data={'size': Tree.INITIAL_SIZE,
+        seed = tree.create_seed(data={'size': self.context['Simulation']['Entity']['initial_size'],
                                       'action_cost': 1})
 
         # Add the seed to the world
@@ -992,7 +1337,7 @@ class Environment:
             Energy: energy created
         """
         # Spawn the tree
-        tree = seed.germinate()
+        tree = seed.germinate(context=self.context)
 
         # Move tree to proper position
         tree.position = position
@@ -1023,7 +1368,9 @@ class Environment:
         if not self.grid.resource_grid.are_vacant_coordinates(coordinates=coordinates):
             return None
 
-        if config['Log']['grid_resources']:
+        kwargs.setdefault('expiry', self.context['Simulation']['Resource']['expiry_date'])
+
+        if self.context['Log']['grid_resources']:
             print(f"{energy_type}:{quantity} was created at {coordinates}")
 
         energy_id = self.state.get_energy_id(increment=True)
@@ -1045,6 +1392,54 @@ class Environment:
 
         return energy
 
+    def create_energies(self, energy_types: Sequence[EnergyType], quantities: npt.ArrayLike,
+                        coordinates: npt.ArrayLike, **kwargs) -> List[Energy]:
+        """Public method:
+            Create energies at many coordinates at once on the grid,
+            empty quantities and occupied or out of bounds coordinates are skipped
+
+        Args:
+            energy_types (Sequence[EnergyType]):    type of each energy to be created
+            quantities (npt.ArrayLike):             amount of each energy to be created
+            coordinates (npt.ArrayLike):            N×2 cells of the grid on which the energies should be created
+
+        Returns:
+            List[Energy]: energies that were created
+        """
+        quantities = np.asarray(quantities, dtype=np.int64).reshape(-1)
+        coordinates = np.asarray(coordinates, dtype=np.int64).reshape(-1, 2)
+
+        created = quantities >= 1
+        created[created] = self.grid.resource_grid.find_vacant_coordinates(coordinates=coordinates[created])
+        indices = np.flatnonzero(created)
+        coordinates = coordinates[indices]
+
+        ids = self.state.allocate_energy_ids(amount=len(indices))
+        kwargs.setdefault('expiry', self.context['Simulation']['Resource']['expiry_date'])
+
+        energy_classes = {EnergyType.BLUE.value: BlueEnergy,
+                          EnergyType.RED.value: RedEnergy}
+
+        energies = []
+        for energy_id, index, (x, y) in zip(ids,
+                                            indices.tolist(),
+                                            coordinates.tolist()):
+
+            energy_type = energy_types[index]
+            energy = energy_classes[energy_type.value](energy_id=energy_id,
+                                                       position=(x, y),
+                                                       quantity=int(quantities[index]),
+                                                       **kwargs)
+            energies.append(energy)
+
+            if self.context['Log']['grid_resources']:
+                print(f"{energy_type}:{energy.quantity} was created at {(x, y)}")
+
+        self._add_new_resources_to_world(new_resources=energies,
+                                         coordinates=coordinates)
+
+        return energies
+
     def remove_resource(self, resource: Resource) -> None:
         """Public method:
             Remove resource from the grid
@@ -1054,9 +1449,11 @@ class Environment:
         """
         position = resource.position
         self.grid.remove_resource(resource=resource)
+        self.spatial_index.remove(obj=resource)
+        self.expiries.cancel(resource=resource)
 
         self.state.remove_resource(resource=resource)
-        if config['Log']['grid_resources']:
+        if self.context['Log']['grid_resources']:
             print(f"{resource} was deleted at {position}")
 
     def remove_entity(self, entity: Entity):
@@ -1069,9 +1466,15 @@ class Environment:
         entity_grid = self.grid.entity_grid
         position = entity.position
         entity_grid.empty_cell(coordinates=position)
+        self.spatial_index.remove(obj=entity)
 
+        brain = self._get_brain(entity=entity)
+        if brain:
+            brain.release()
+
+        self.state.lineage.forget(entity_id=entity.id)
         self.state.remove_entity(entity=entity)
-        if config['Log']['grid_entities']:
+        if self.context['Log']['grid_entities']:
             print(f"{entity} was deleted at {position}")
 
     def _entity_died(self, entity: Entity) -> None:
@@ -1209,8 +1612,9 @@ class Environment:
         Returns:
             Set[Tuple[int, int]]: set of animals in search area
         """
-        return self.grid.find_close_animal_instances(coordinates=coordinates,
-                                                     radius=radius)
+        return self.spatial_index.find_closest(kinds=CellKind.ANIMAL,
+                                               coordinates=coordinates,
+                                               radius=radius)
 
     def find_energies_around(self, coordinates: Tuple[int, int], radius: int=1) -> Set(Energy):
         """Public method:
@@ -1223,8 +1627,9 @@ class Environment:
         Returns:
             Set[Tuple[int, int]]: set of energies in search area
         """
-        return self.grid.find_close_energy_instances(coordinates=coordinates,
-                                                     radius=radius)
+        return self.spatial_index.find_closest(kinds=CellKind.ENERGY,
+                                               coordinates=coordinates,
+                                               radius=radius)
 
     def find_tree_cells_around(self, coordinates: Tuple[int, int], radius: int=1) -> Set[Tuple[int, int]]:
         """Public method:
@@ -1241,6 +1646,202 @@ class Environment:
         return self.grid.find_occupied_cells_by_trees(coordinates=coordinates,
                                                       radius=radius)
 
+    def sense(self) -> None:
+        """Public method:
+            Compute the inputs of all the animals and trees
+            of the simulation in one batch
+        """
+        self.senses.sense(grid=self.grid,
+                          animals=self.state.animals.values(),
+                          trees=self.state.trees.values(),
+                          columns=self.state.columns,
+                          settings=self.context['Simulation'])
+
+    def age_entities(self) -> None:
+        """Public method:
+            Age the whole population at once,
+            entities too old or without blue energy die
+        """
+        columns = self.state.columns
+        columns.age()
+
+        too_old, starving = columns.find_dying()
+        for entity in too_old:
+            entity._die(cause="old age")
+
+        for entity in starving:
+            entity._die(cause="lack of energy")
+
+    def expire_resources(self) -> None:
+        """Public method:
+            Remove the resources expiring this cycle
+        """
+        for resource in self.expiries.pop_expired(cycle=self.state.cycle):
+            self.remove_resource(resource=resource)
+
+    def get_sensed_inputs(self, entity: Entity) -> Optional[npt.NDArray[np.float64]]:
+        """Public method:
+            Get the inputs sensed for an entity at the start of the cycle
+
+        Args:
+            entity (Entity): entity to get the inputs of
+
+        Returns:
+            Optional[npt.NDArray[np.float64]]: inputs of the entity, None if it was not sensed
+        """
+        return self.senses.get_inputs(entity=entity)
+
+    @staticmethod
+    def _get_brain(entity: Entity) -> Optional[Brain]:
+        """Private static method:
+            Get the brain of an entity, entities born from a parent
+            only get one when transplanted
+
+        Args:
+            entity (Entity): entity to get the brain of
+
+        Returns:
+            Optional[Brain]: brain of the entity, None if it has none yet
+        """
+        return getattr(entity, 'brain', None)
+
+    def _get_brain_arena(self, entity: Entity) -> BrainArena:
+        """Private method:
+            Get the arena evaluating the brains of the kind of an entity
+
+        Args:
+            entity (Entity): entity to get the arena for
+
+        Returns:
+            BrainArena: arena of the animals or of the trees
+        """
+        return self.animal_arena if isinstance(entity, Animal) else self.tree_arena
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Pools can not be pickled, a new one is started when needed
+        state = self.__dict__.copy()
+        state['_executor'] = None
+
+        return state
+
+    def _get_executor(self) -> Optional[Executor]:
+        """Private method:
+            Get the pool evaluating the brains in chunks,
+            starting it the first time it is needed,
+            the "pool" backend starts instead worker processes owning
+            a partition of the networks of each arena
+
+        Returns:
+            Optional[Executor]: pool of threads or processes, None to evaluate in the main thread
+                                or in the workers of the arenas
+        """
+        workers = self.context['Simulation']['think_workers'] or cpu_count()
+        match self.context['Simulation']['think_executor']:
+            case 'thread' if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=workers)
+            case 'process' if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=workers)
+            case 'pool':
+                for arena in (self.animal_arena, self.tree_arena):
+                    arena.start_pool(n_workers=workers)
+
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Public method:
+            Stop the pools evaluating the brains, if any
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+        for arena in (self.animal_arena, self.tree_arena):
+            arena.stop_pool()
+
+    def think(self) -> None:
+        """Public method:
+            Evaluate in one pass per arena the brains of the animals
+            and of the trees, with the inputs sensed at the start of the cycle,
+            spreading them in chunks over a pool if one is configured
+        """
+        executor = self._get_executor()
+        self._thinkers = set()
+        for arena, entities, inputs in ((self.animal_arena,
+                                         self.state.animals.values(),
+                                         self.senses.animal_inputs),
+                                        (self.tree_arena,
+                                         self.state.trees.values(),
+                                         self.senses.tree_inputs)):
+
+            thinkers, slots, rows = [], [], []
+            for row, entity in enumerate(entities):
+                brain = self._get_brain(entity=entity)
+                if (brain and brain.arena is arena
+                    and self.senses.get_inputs(entity=entity) is not None):
+                    thinkers.append(entity.id)
+                    slots.append(brain.slot)
+                    rows.append(row)
+
+            if slots:
+                workers = ((self.context['Simulation']['think_workers'] or cpu_count())
+                           if executor is not None else 1)
+                chunk_size = (self.context['Simulation']['think_chunk_size']
+                              or ceil(len(slots) / workers))
+
+                arena.evaluate(slots=np.array(slots, dtype=np.int64),
+                               inputs=inputs[rows],
+                               executor=executor,
+                               chunk_size=chunk_size)
+                self._thinkers.update(thinkers)
+
+    def get_thoughts(self, entity: Entity) -> Optional[Dict[int, float]]:
+        """Public method:
+            Get the outputs of the brain of an entity evaluated this cycle,
+            the values outputs being written back to the output nodes
+
+        Args:
+            entity (Entity): entity to get the outputs of
+
+        Returns:
+            Optional[Dict[int, float]]: activated values of the trigger outputs,
+                                        None if the brain was not evaluated
+        """
+        if entity.id not in self._thinkers:
+            return None
+
+        # Thoughts are only read once
+        self._thinkers.discard(entity.id)
+
+        return entity.brain.phenotype.flat.read_outputs()
+
+    def decide(self, entities: List[Entity]) -> None:
+        """Public method:
+            First phase of a two-phase cycle, every entity decides
+            on its actions before any of them is applied,
+            so that all decisions are taken from the state of the start of the cycle
+
+        Args:
+            entities (List[Entity]): entities of the cycle
+        """
+        for entity in entities:
+            entity.update(environment=self,
+                          age=False)
+
+    def act(self, entities: List[Entity]) -> None:
+        """Public method:
+            Second phase of a two-phase cycle, apply the decided actions
+            by increasing entity id, so that conflicts over a cell or a resource
+            are always won by the oldest entity, skipping entities
+            removed from the world by the actions applied before theirs
+
+        Args:
+            entities (List[Entity]): entities of the cycle
+        """
+        registered = self.state.entities
+        for entity in sorted(entities, key=attrgetter('id')):
+            if registered.get(entity.id) is entity:
+                self._event_on_action(entity=entity)
+
 
 class Simulation:
     """Class:
@@ -1251,17 +1852,22 @@ class Simulation:
             state (SimState):               state of the simulation
             environment (Environment):      environment with which entities can interact
             dimensions (: Tuple[int, int]): dimensions of the world
+            context (SimContext):           settings of the simulation
+            innov_table (InnovTable):       table numbering the innovations of the simulation
     """
     def __init__(self,
                  sim_id: int,
-                 dimensions: Tuple[int, int] = (20, 20)):
+                 dimensions: Tuple[int, int] = (20, 20),
+                 context: Optional[SimContext] = None):
 
         self.__id: int = sim_id                         # unique identifier
+        self.context: SimContext = (context if context is not None  # settings of the simulation
+                                    else SimContext.from_config())
 
         self.state: SimState                            # simulation's state
         self.environment: Environment                   # environment with which entities can interact
         self.dimensions: Tuple[int, int] = dimensions   # dimensions of the world
-        self.innov_table: InnovTable = InnovTable
+        self.innov_table: InnovTable = self.context.innov_table     # table numbering the innovations
         self.update_counter: int = 0
 
 
@@ -1276,9 +1882,11 @@ class Simulation:
         Returns:
             SimState: state of the simulation after initialization
         """
-        self.state = SimState(sim_id=self.__id)
+        self.state = SimState(sim_id=self.__id,
+                                context=self.context)
         self.environment = Environment(env_id=self.__id,
                                        dimensions=self.dimensions,
+                                       context=self.context,
                                        sim_state=self.state)
 
         self.environment.init(populate=populate)
@@ -1297,35 +1905,52 @@ class Simulation:
         """
         self.update_counter += 1
         self.state.new_cycle()
-        frequency = (config['Simulation']['spawn_energy_frequency']
-                   * config['Simulation']['difficulty_level'])
+        frequency = (self.context['Simulation']['spawn_energy_frequency']
+                   * self.context.difficulty_level)
 
-        config['Simulation']['energy_expiry'] = frequency
+        self.context.energy_expiry = frequency
 
         if  (
-                config['Simulation']['spawn_energy']
+                self.context['Simulation']['spawn_energy']
             and self.update_counter%frequency == 0
             ):
             self.environment._populate_energy()
             self.update_counter = 0
 
-        for entity in self.state.get_entities():
-            entity.update(environment=self.environment)
-            self.environment._event_on_action(entity=entity)
+        # Perceive the world and think once for the whole population
+        self.environment.sense()
+        self.environment.think()
+        self.environment.age_entities()
 
-        for resource in self.state.get_resources():
-            resource.update(environment=self.environment)
+        entities = self.state.get_entities()
+        if self.context['Simulation']['cycle_mode'] == 'two_phase':
+            self.environment.decide(entities=entities)
+            self.environment.act(entities=entities)
+
+        else:
+            for entity in entities:
+                entity.update(environment=self.environment,
+                              age=False)
+                self.environment._event_on_action(entity=entity)
+
+        self.environment.expire_resources()
         # Update state of the simulation
         return self.environment.grid, self.state
 
+    def shutdown(self) -> None:
+        """Public method:
+            Release the resources of the simulation
+        """
+        self.environment.shutdown()
+
     def save(self):
-        self.innovations = {"innovations" : self.innov_table.innovations,
+        self.innovations = {"innovations" : self.innov_table.export_innovations(),
                             "node_number" : self.innov_table.node_number,
                             "link_number" : self.innov_table.link_number
         }
 
     def load_innovations(self) -> None:
-        InnovTable.load_innovations_infos(**self.innovations)
+        self.innov_table.load_innovations_infos(**self.innovations)
 
     @property
     def id(self) -> int:
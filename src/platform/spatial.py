@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from universal import SimulatedObject
+
+from typing import Dict, Final, Iterator, Sequence, Set, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .grid import CellKind, get_cell_kind
+
+
+class SpatialIndex:
+    """Class:
+        Bucketed index of the positions of the simulated objects,
+        answer radius and nearest-neighbour queries by kind of object
+        without scanning every cell of the search window
+
+        Attributes:
+            bucket_size (int):                                  side of the square buckets
+            _buckets (Dict[CellKind, Dict[Tuple[int, int],
+                                          Dict[int, Tuple[SimulatedObject, int, int]]]]):
+                                                                objects and their cell by kind, bucket and id
+            _cells (Dict[Tuple[CellKind, int], Tuple[int, int]]):
+                                                                indexed cell of each object
+
+        Methods:
+            insert:         add an object to the index
+            insert_many:    add many objects to the index at once
+            remove:         remove an object from the index
+            move:           update the indexed cell of an object
+            find_around:    find all the objects of some kinds in a radius
+            find_closest:   find the objects of some kinds on the closest ring
+    """
+    BUCKET_SIZE: Final[int] = 8
+
+    def __init__(self, bucket_size: int = BUCKET_SIZE):
+        """Constructor:
+            Initialize an empty spatial index
+
+        Args:
+            bucket_size (int, optional): side of the square buckets. Defaults to BUCKET_SIZE.
+        """
+        self.bucket_size: int = bucket_size                                 # side of the square buckets
+        self._buckets: Dict[CellKind, Dict[Tuple[int, int],                 # objects and their cell
+                                           Dict[int, Tuple[SimulatedObject,  # by kind, bucket and id
+                                                           int, int]]]] = {}
+        self._cells: Dict[Tuple[CellKind, int], Tuple[int, int]] = {}       # indexed cell of each object
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, obj: SimulatedObject) -> bool:
+        return (get_cell_kind(type(obj)), obj.id) in self._cells
+
+    def _get_bucket(self, coordinates: Tuple[int, int]) -> Tuple[int, int]:
+        """Private method:
+            Get the bucket containing some coordinates
+
+        Args:
+            coordinates (Tuple[int, int]): coordinates of the cell
+
+        Returns:
+            Tuple[int, int]: coordinates of the bucket
+        """
+        return (coordinates[0] // self.bucket_size,
+                coordinates[1] // self.bucket_size)
+
+    def insert(self, obj: SimulatedObject) -> None:
+        """Public method:
+            Add an object to the index at its current position
+
+        Args:
+            obj (SimulatedObject): object to index
+        """
+        kind = get_cell_kind(type(obj))
+        coordinates = tuple(obj.position)
+
+        self._cells[(kind, obj.id)] = coordinates
+        (self._buckets.setdefault(kind, {})
+                      .setdefault(self._get_bucket(coordinates), {}))[obj.id] = (obj, *coordinates)
+
+    def insert_many(self, objects: Sequence[SimulatedObject],
+                    coordinates: npt.NDArray[np.int64]) -> None:
+        """Public method:
+            Add many objects to the index at once,
+            their buckets being computed in one array operation
+
+        Args:
+            objects (Sequence[SimulatedObject]):    objects to index
+            coordinates (npt.NDArray[np.int64]):    N×2 positions of the objects
+        """
+        coordinates = np.asarray(coordinates, dtype=np.int64).reshape(-1, 2)
+        kinds: Dict[type, CellKind] = {}
+
+        for obj, (x, y), bucket in zip(objects,
+                                       coordinates.tolist(),
+                                       (coordinates // self.bucket_size).tolist()):
+            kind = kinds.get(type(obj))
+            if kind is None:
+                kind = kinds[type(obj)] = get_cell_kind(type(obj))
+
+            self._cells[(kind, obj.id)] = (x, y)
+            (self._buckets.setdefault(kind, {})
+                          .setdefault(tuple(bucket), {}))[obj.id] = (obj, x, y)
+
+    def remove(self, obj: SimulatedObject) -> None:
+        """Public method:
+            Remove an object from the index, if indexed
+
+        Args:
+            obj (SimulatedObject): object to remove
+        """
+        kind = get_cell_kind(type(obj))
+        coordinates = self._cells.pop((kind, obj.id), None)
+        if coordinates is None:
+            return
+
+        buckets = self._buckets[kind]
+        bucket = self._get_bucket(coordinates)
+        del buckets[bucket][obj.id]
+        if not buckets[bucket]:
+            del buckets[bucket]
+
+    def move(self, obj: SimulatedObject, coordinates: Tuple[int, int]) -> None:
+        """Public method:
+            Update the indexed cell of an object
+
+        Args:
+            obj (SimulatedObject):          object that moved
+            coordinates (Tuple[int, int]):  new coordinates of the object
+        """
+        kind = get_cell_kind(type(obj))
+        old_coordinates = self._cells.get((kind, obj.id))
+        if old_coordinates is None:
+            return
+
+        coordinates = tuple(coordinates)
+        self._cells[(kind, obj.id)] = coordinates
+
+        buckets = self._buckets[kind]
+        old_bucket, new_bucket = (self._get_bucket(old_coordinates),
+                                  self._get_bucket(coordinates))
+        if old_bucket != new_bucket:
+            del buckets[old_bucket][obj.id]
+            if not buckets[old_bucket]:
+                del buckets[old_bucket]
+
+        buckets.setdefault(new_bucket, {})[obj.id] = (obj, *coordinates)
+
+    def _iter_window(self, kinds: CellKind, coordinates: Tuple[int, int],
+                     radius: int) -> Iterator[Tuple[SimulatedObject, int]]:
+        """Private method:
+            Iterate over the objects of some kinds in a square window,
+            with their ring (Chebyshev distance) from the center
+
+        Args:
+            kinds (CellKind):               mask of the kinds of objects to search
+            coordinates (Tuple[int, int]):  center of the window
+            radius (int):                   radius of the window
+
+        Yields:
+            Iterator[Tuple[SimulatedObject, int]]: objects in the window and their ring
+        """
+        x, y = coordinates
+        bx1, by1 = self._get_bucket((x - radius, y - radius))
+        bx2, by2 = self._get_bucket((x + radius, y + radius))
+
+        for kind, buckets in self._buckets.items():
+            if not kind & kinds:
+                continue
+
+            for bx in range(bx1, bx2 + 1):
+                for by in range(by1, by2 + 1):
+                    for obj, ox, oy in buckets.get((bx, by), {}).values():
+                        ring = max(abs(ox - x), abs(oy - y))
+                        if ring <= radius:
+                            yield obj, ring
+
+    def find_around(self, kinds: CellKind, coordinates: Tuple[int, int],
+                    radius: int = 1, include_self: bool = False) -> Set[SimulatedObject]:
+        """Public method:
+            Find all the objects of some kinds in a radius around some coordinates
+
+        Args:
+            kinds (CellKind):               mask of the kinds of objects to search
+            coordinates (Tuple[int, int]):  coordinates to search around
+            radius (int, optional):         radius of search. Defaults to 1.
+            include_self (bool, optional):  include the coordinates in the search. Defaults to False.
+
+        Returns:
+            Set[SimulatedObject]: set of objects found
+        """
+        return {obj for obj, ring in self._iter_window(kinds=kinds,
+                                                       coordinates=coordinates,
+                                                       radius=radius)
+                if include_self or ring}
+
+    def find_closest(self, kinds: CellKind, coordinates: Tuple[int, int],
+                     radius: int = 1) -> Set[SimulatedObject]:
+        """Public method:
+            Find the objects of some kinds on the closest ring
+            around some coordinates containing at least one of them,
+            rings are searched up to radius - 1 as on the grid
+
+        Args:
+            kinds (CellKind):               mask of the kinds of objects to search
+            coordinates (Tuple[int, int]):  coordinates to search around
+            radius (int, optional):         radius of search. Defaults to 1.
+
+        Returns:
+            Set[SimulatedObject]: set of objects on the closest ring
+        """
+        closest_ring = radius
+        closest: Set[SimulatedObject] = set()
+        for obj, ring in self._iter_window(kinds=kinds,
+                                           coordinates=coordinates,
+                                           radius=radius - 1):
+            if not ring or ring > closest_ring:
+                continue
+
+            if ring < closest_ring:
+                closest_ring = ring
+                closest = set()
+
+            closest.add(obj)
+
+        return closest
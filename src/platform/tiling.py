@@ -0,0 +1,719 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+import multiprocessing
+import pickle
+import random
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .energies import Energy, Resource
+from .entities import Entity
+from .running.config import SimContext, default_context
+from .simulation import Simulation
+from .universal import Position, SimulatedObject
+
+Rect = Tuple[int, int, int, int]
+
+
+def get_halo_width(context: Optional[SimContext] = None) -> int:
+    """Function:
+        Get the width of the strips exchanged between neighbouring tiles,
+        the largest distance at which an entity senses or acts
+
+    Args:
+        context (Optional[SimContext], optional): settings of the simulation.
+                                                  Defaults to None, the process configuration.
+
+    Returns:
+        int: width of the halo, in cells
+    """
+    context = context or default_context
+    animal = context['Simulation']['Animal']
+    tree = context['Simulation']['Tree']
+
+    return max(animal['entity_sight_range'],
+               animal['energy_sight_range'],
+               animal['reproduction_range'],
+               tree['energy_sight_range'],
+               3)  # radius in which a newborn is placed
+
+
+def intersect(rect1: Rect, rect2: Rect) -> Optional[Rect]:
+    """Function:
+        Intersect two rectangles of cells
+
+    Args:
+        rect1 (Rect): cells x1, y1, x2, y2 of the first rectangle
+        rect2 (Rect): cells x1, y1, x2, y2 of the second rectangle
+
+    Returns:
+        Optional[Rect]: cells of the intersection, None if empty
+    """
+    x1, y1 = max(rect1[0], rect2[0]), max(rect1[1], rect2[1])
+    x2, y2 = min(rect1[2], rect2[2]), min(rect1[3], rect2[3])
+
+    return (x1, y1, x2, y2) if x1 < x2 and y1 < y2 else None
+
+
+class TileLayout:
+    """Class:
+        Division of a world into rectangular tiles,
+        each one simulated with a halo of the cells of its neighbours
+
+        Attributes:
+            dimensions (Tuple[int, int]):   dimensions of the world
+            shape (Tuple[int, int]):        number of tiles along each axis
+            halo (int):                     width of the strips exchanged between tiles
+            x_edges (npt.NDArray[np.int64]):first x coordinate of each column of tiles, then the width
+            y_edges (npt.NDArray[np.int64]):first y coordinate of each row of tiles, then the height
+
+        Methods:
+            get_interior:   get the cells owned by a tile
+            get_extent:     get the cells simulated by a tile, its halo included
+            find_owners:    find the tiles owning some coordinates
+            get_overlaps:   get the cells of a tile in the halo of each of the other tiles
+    """
+    def __init__(self, dimensions: Tuple[int, int], shape: Tuple[int, int],
+                 halo: Optional[int] = None):
+        """Constructor:
+            Split a world into tiles of about the same size
+
+        Args:
+            dimensions (Tuple[int, int]):   dimensions of the world
+            shape (Tuple[int, int]):        number of tiles along each axis
+            halo (Optional[int], optional): width of the exchanged strips,
+                                            from the configuration if None. Defaults to None.
+        """
+        self.dimensions: Tuple[int, int] = dimensions                       # dimensions of the world
+        self.shape: Tuple[int, int] = shape                                 # number of tiles along each axis
+        self.halo: int = get_halo_width() if halo is None else halo         # width of the exchanged strips
+        self.x_edges: npt.NDArray[np.int64] = np.linspace(0, dimensions[0], shape[0] + 1).round().astype(np.int64)
+        self.y_edges: npt.NDArray[np.int64] = np.linspace(0, dimensions[1], shape[1] + 1).round().astype(np.int64)
+
+    def __len__(self) -> int:
+        return self.shape[0] * self.shape[1]
+
+    def get_interior(self, tile: int) -> Rect:
+        """Public method:
+            Get the cells owned by a tile
+
+        Args:
+            tile (int): index of the tile
+
+        Returns:
+            Rect: cells x1, y1, x2, y2 of the tile
+        """
+        i, j = divmod(tile, self.shape[1])
+
+        return (int(self.x_edges[i]), int(self.y_edges[j]),
+                int(self.x_edges[i + 1]), int(self.y_edges[j + 1]))
+
+    def get_extent(self, tile: int) -> Rect:
+        """Public method:
+            Get the cells simulated by a tile,
+            its halo included on the sides it has neighbours
+
+        Args:
+            tile (int): index of the tile
+
+        Returns:
+            Rect: cells x1, y1, x2, y2 simulated by the tile
+        """
+        x1, y1, x2, y2 = self.get_interior(tile=tile)
+        width, height = self.dimensions
+
+        return (max(0, x1 - self.halo), max(0, y1 - self.halo),
+                min(width, x2 + self.halo), min(height, y2 + self.halo))
+
+    def find_owners(self, coordinates: npt.ArrayLike) -> npt.NDArray[np.int64]:
+        """Public method:
+            Find the tiles owning some coordinates of the world
+
+        Args:
+            coordinates (npt.ArrayLike): N×2 coordinates in the world
+
+        Returns:
+            npt.NDArray[np.int64]: index of the tile owning each of them
+        """
+        coordinates = np.asarray(coordinates, dtype=np.int64).reshape(-1, 2)
+        i = np.searchsorted(self.x_edges, coordinates[:, 0], side='right') - 1
+        j = np.searchsorted(self.y_edges, coordinates[:, 1], side='right') - 1
+
+        return (np.clip(i, 0, self.shape[0] - 1) * self.shape[1]
+                + np.clip(j, 0, self.shape[1] - 1))
+
+    def get_overlaps(self, tile: int) -> Dict[int, Rect]:
+        """Public method:
+            Get the cells owned by a tile that are in the halo of each of the other tiles
+
+        Args:
+            tile (int): index of the tile
+
+        Returns:
+            Dict[int, Rect]: cells x1, y1, x2, y2 of the overlap, by index of the other tile
+        """
+        interior = self.get_interior(tile=tile)
+        overlaps: Dict[int, Rect] = {}
+        for other in range(len(self)):
+            overlap = intersect(interior, self.get_extent(tile=other))
+            if other != tile and overlap is not None:
+                overlaps[other] = overlap
+
+        return overlaps
+
+
+class Tile:
+    """Class:
+        Part of a world simulated on its own, with a halo of copies
+        of the objects of its neighbours, exchanged after each cycle
+
+        Attributes:
+            index (int):                                    index of the tile in the layout
+            layout (TileLayout):                            division of the world into tiles
+            simulation (Simulation):                        simulation of the cells of the tile and its halo
+            origin (Tuple[int, int]):                       coordinates in the world of the first cell of the tile
+            interior (Rect):                                cells x1, y1, x2, y2 owned by the tile, in its own coordinates
+            seed (Optional[int]):                           seed of the random generators of the tile
+            _ghost_entities (List[Entity]):                 copies of the entities of the neighbours in the halo
+            _ghost_resources (List[Tuple[int, Resource]]):  copies of the resources of the neighbours in the halo,
+                                                            with the tile owning them
+
+        Methods:
+            init:       create the simulation and populate the interior
+            step:       run a cycle, then collect what the other tiles need
+            collect:    take out the objects that left the interior and copy the ones in the halo of the others
+            exchange:   apply what the other tiles sent
+            count:      count the objects owned by the tile
+    """
+    def __init__(self, index: int, layout: TileLayout, sim_id: int = 0,
+                 seed: Optional[int] = None, context: Optional[SimContext] = None):
+        """Constructor:
+            Initialize a tile of a layout
+
+        Args:
+            index (int):                            index of the tile in the layout
+            layout (TileLayout):                    division of the world into tiles
+            sim_id (int, optional):                 id of the simulation. Defaults to 0.
+            seed (Optional[int], optional):         seed of the random generators of the tile. Defaults to None.
+            context (Optional[SimContext], optional): settings of the simulation. Defaults to None.
+        """
+        self.index: int = index                                             # index of the tile in the layout
+        self.layout: TileLayout = layout                                    # division of the world into tiles
+
+        x1, y1, x2, y2 = layout.get_extent(tile=index)
+        ix1, iy1, ix2, iy2 = layout.get_interior(tile=index)
+        self.origin: Tuple[int, int] = (x1, y1)                             # first cell of the tile in the world
+        self.interior: Rect = (ix1 - x1, iy1 - y1, ix2 - x1, iy2 - y1)      # cells owned by the tile
+        self.simulation: Simulation = Simulation(sim_id=sim_id,             # simulation of the tile and its halo
+                                                 dimensions=(x2 - x1, y2 - y1),
+                                                 context=context)
+        self.seed: Optional[int] = seed                                     # seed of the random generators
+
+        self._ghost_entities: List[Entity] = []                             # copies of the neighbours' entities
+        self._ghost_resources: List[Tuple[int, Resource]] = []              # copies of the neighbours' resources
+
+    def init(self, populate: bool = True) -> None:
+        """Public method:
+            Create the simulation of the tile, its ids interleaved
+            with the ones of the other tiles, and populate its interior
+
+        Args:
+            populate (bool, optional): should populate the interior. Defaults to True.
+        """
+        if self.seed is not None:
+            random.seed(self.seed * len(self.layout) + self.index)
+            np.random.seed(self.seed * len(self.layout) + self.index)
+
+        self.simulation.init(populate=False)
+
+        state = self.simulation.state
+        state.id_stride = len(self.layout)
+        state.next_entity_id = state.next_energy_id = self.index + 1
+
+        environment = self.simulation.environment
+        environment.populated_area = self.interior
+        environment.init(populate=populate)
+
+    def _is_inside(self, position: Tuple[int, int]) -> bool:
+        """Private method:
+            Check if a position is in the interior of the tile
+
+        Args:
+            position (Tuple[int, int]): coordinates in the tile
+
+        Returns:
+            bool: the tile owns the position
+        """
+        x1, y1, x2, y2 = self.interior
+
+        return x1 <= position[0] < x2 and y1 <= position[1] < y2
+
+    def _to_world(self, position: Tuple[int, int]) -> Tuple[int, int]:
+        return position[0] + self.origin[0], position[1] + self.origin[1]
+
+    def _to_tile(self, position: Tuple[int, int]) -> Tuple[int, int]:
+        return position[0] - self.origin[0], position[1] - self.origin[1]
+
+    def _copy(self, obj: SimulatedObject, ghost: bool = False) -> SimulatedObject:
+        """Private method:
+            Copy an object detached from the simulation, at its coordinates
+            in the world, without the lineage, context and arena of the tile,
+            the copy of an entity seen in a halo only keeping the genotype of its brain
+
+        Args:
+            obj (SimulatedObject):  entity or resource to copy
+            ghost (bool, optional): the copy is only seen in a halo. Defaults to False.
+
+        Returns:
+            SimulatedObject: shallow copy of the object
+        """
+        if isinstance(obj, Entity):
+            values = self.simulation.state.columns.export(entity=obj)
+            brain = object.__new__(type(obj.brain))
+            brain.__dict__.update(obj.brain.__dict__,
+                                  arena=None,
+                                  slot=-1)
+            if ghost:
+                brain.__dict__.pop('phenotype', None)
+                values.pop('mind', None)
+
+            values.update(actions=[],
+                          lineage=None,
+                          context=None,
+                          brain=brain)
+        else:
+            values = dict(obj.__dict__)
+
+        values['_position'] = Position(*self._to_world(position=obj.position))
+        copy = object.__new__(type(obj))
+        copy.__dict__.update(values)
+
+        return copy
+
+    def _get_register(self, resource: Resource, is_energy: Optional[bool] = None) -> Dict[int, Resource]:
+        """Private method:
+            Get the register of the state holding a type of resource,
+            energies and seeds having ids of their own
+
+        Args:
+            resource (Resource):                    resource to find the register of
+            is_energy (Optional[bool], optional):   the resource is an energy, from its type if None. Defaults to None.
+
+        Returns:
+            Dict[int, Resource]: register of the energies or of the seeds
+        """
+        state = self.simulation.state
+        if is_energy is None:
+            is_energy = isinstance(resource, Energy)
+
+        return state.energies if is_energy else state.seeds
+
+    def step(self) -> Dict[int, Dict[str, Any]]:
+        """Public method:
+            Run a cycle of the simulation of the tile,
+            then collect what the other tiles need
+
+        Returns:
+            Dict[int, Dict[str, Any]]: messages to the other tiles, by index
+        """
+        self.simulation.update()
+
+        return self.collect()
+
+    def _clear_ghosts(self) -> Dict[int, List[Tuple[bool, int]]]:
+        """Private method:
+            Remove the copies of the objects of the neighbours
+
+        Returns:
+            Dict[int, List[Tuple[bool, int]]]:  resources consumed in the halo, by owning tile,
+                                                if they are energies and their ids
+        """
+        environment = self.simulation.environment
+        entity_grid = environment.grid.entity_grid
+        for ghost in self._ghost_entities:
+            if entity_grid.get_cell_value(coordinates=ghost.position) is ghost:
+                entity_grid.empty_cell(coordinates=ghost.position)
+            environment.spatial_index.remove(obj=ghost)
+
+        consumed: Dict[int, List[Tuple[bool, int]]] = {}
+        for owner, ghost in self._ghost_resources:
+            if self._get_register(resource=ghost).get(ghost.id) is ghost:
+                environment.remove_resource(resource=ghost)
+            else:
+                consumed.setdefault(owner, []).append((isinstance(ghost, Energy), ghost.id))
+
+        self._ghost_entities = []
+        self._ghost_resources = []
+
+        return consumed
+
+    def collect(self) -> Dict[int, Dict[str, Any]]:
+        """Public method:
+            Take out the objects that left the interior of the tile,
+            for the tiles now owning them, and copy the objects and colors
+            of the interior in the halo of the other tiles
+
+        Returns:
+            Dict[int, Dict[str, Any]]: messages to the other tiles, by index, with
+                                        their resources consumed,
+                                        the pickled migrating objects and their ancestries,
+                                        the pickled copies of the objects in their halo,
+                                        the colors of their halo
+        """
+        environment = self.simulation.environment
+        state = self.simulation.state
+        messages: Dict[int, Dict[str, Any]] = {}
+
+        def message(tile: int) -> Dict[str, Any]:
+            return messages.setdefault(tile, {'consumed': [],
+                                              'migrants': [],
+                                              'ghosts': [],
+                                              'colors': []})
+
+        for owner, resources in self._clear_ghosts().items():
+            message(owner)['consumed'] = resources
+
+        # Objects that moved or were born out of the interior
+        leaving = [obj for obj in (*state.get_entities(), *state.get_resources())
+                   if not self._is_inside(position=obj.position)]
+        if leaving:
+            owners = self.layout.find_owners([self._to_world(position=obj.position)
+                                              for obj in leaving]).tolist()
+            for obj, owner in zip(leaving, owners):
+                if isinstance(obj, Entity):
+                    migrant = (self._copy(obj=obj), state.lineage.export_ancestry(entity_id=obj.id))
+                    environment.remove_entity(entity=obj)
+                else:
+                    migrant = (self._copy(obj=obj), None)
+                    environment.remove_resource(resource=obj)
+
+                message(owner)['migrants'].append(migrant)
+
+        # Copies of the objects in the halo of the other tiles
+        grid = environment.grid
+        for other, (x1, y1, x2, y2) in self.layout.get_overlaps(tile=self.index).items():
+            x1, y1 = self._to_tile(position=(x1, y1))
+            x2, y2 = self._to_tile(position=(x2, y2))
+            objects = [obj for sub_grid in (grid.entity_grid, grid.resource_grid)
+                       for obj in sub_grid.array[x1:x2, y1:y2].ravel().tolist()
+                       if obj is not None]
+
+            message(other)['ghosts'] = [self._copy(obj=obj, ghost=True) for obj in objects]
+            message(other)['colors'] = [(self._to_world(position=(x1, y1)),
+                                         grid.color_grid.array[x1:x2, y1:y2].copy())]
+
+        for content in messages.values():
+            content['migrants'] = pickle.dumps(content['migrants'], protocol=pickle.HIGHEST_PROTOCOL)
+            content['ghosts'] = pickle.dumps(content['ghosts'], protocol=pickle.HIGHEST_PROTOCOL)
+
+        return messages
+
+    def _find_place(self, position: Tuple[int, int], resource: bool) -> Optional[Tuple[int, int]]:
+        """Private method:
+            Find the closest free cell of the interior to a position
+
+        Args:
+            position (Tuple[int, int]): coordinates in the tile
+            resource (bool):            look for a cell free of resources, else of entities
+
+        Returns:
+            Optional[Tuple[int, int]]: coordinates of the free cell, None if there is none close enough
+        """
+        grid = self.simulation.environment.grid
+        sub_grid = grid.resource_grid if resource else grid.entity_grid
+
+        for radius in range(self.layout.halo + 1):
+            free = [cell for cell in sub_grid.find_free_coordinates(coordinates=position,
+                                                                   radius=radius)
+                    if self._is_inside(position=cell)]
+            if free:
+                return min(free, key=lambda cell: (abs(cell[0] - position[0])
+                                                   + abs(cell[1] - position[1]), cell))
+
+        return None
+
+    def _adopt(self, obj: SimulatedObject, ancestry: Optional[npt.NDArray[np.int64]]) -> None:
+        """Private method:
+            Add an object that moved into the tile to its simulation,
+            at the closest free cell of the interior
+
+        Args:
+            obj (SimulatedObject):                          migrating entity or resource
+            ancestry (Optional[npt.NDArray[np.int64]]):     parents of a migrating entity and of its ancestors
+        """
+        environment = self.simulation.environment
+        is_entity = isinstance(obj, Entity)
+        position = self._find_place(position=self._to_tile(position=obj.position),
+                                    resource=not is_entity)
+        if position is None:
+            return
+
+        obj.position = position
+        if is_entity:
+            obj.context = self.simulation.context
+            self.simulation.state.lineage.import_ancestry(records=ancestry)
+            environment._add_new_entity_to_world(new_entity=obj)
+
+        elif environment.grid.place_resource(value=obj):
+            # Keep the cycle it was placed in, to expire as it would have
+            environment.spatial_index.insert(obj=obj)
+            self.simulation.state.add_resource(new_resource=obj)
+            environment.expiries.schedule(resource=obj,
+                                          cycle=obj.expiry_cycle)
+
+    def _add_ghost(self, obj: SimulatedObject, owner: int) -> None:
+        """Private method:
+            Place the copy of an object of a neighbour in the halo,
+            visible to the entities of the tile but not simulated
+
+        Args:
+            obj (SimulatedObject):  copy of an entity or resource
+            owner (int):            index of the tile owning the object
+        """
+        environment = self.simulation.environment
+        obj.position = self._to_tile(position=obj.position)
+
+        if isinstance(obj, Entity):
+            obj.lineage = self.simulation.state.lineage
+            obj.context = self.simulation.context
+            if environment.grid.place_entity(value=obj):
+                environment.spatial_index.insert(obj=obj)
+                self._ghost_entities.append(obj)
+
+        elif environment.grid.place_resource(value=obj):
+            environment.spatial_index.insert(obj=obj)
+            self.simulation.state.add_resource(new_resource=obj)
+            self._ghost_resources.append((owner, obj))
+
+    def exchange(self, inbox: Dict[int, Dict[str, Any]]) -> None:
+        """Public method:
+            Apply the messages of the other tiles: remove the resources consumed
+            in their halo, adopt the objects that moved in,
+            then copy their objects and colors in the halo
+
+        Args:
+            inbox (Dict[int, Dict[str, Any]]): messages of the other tiles, by index
+        """
+        environment = self.simulation.environment
+        for content in inbox.values():
+            for is_energy, resource_id in content['consumed']:
+                resource = self._get_register(resource=None,
+                                              is_energy=is_energy).get(resource_id)
+                if resource is not None:
+                    environment.remove_resource(resource=resource)
+
+        for sender in sorted(inbox):
+            for obj, ancestry in pickle.loads(inbox[sender]['migrants']):
+                self._adopt(obj=obj,
+                            ancestry=ancestry)
+
+        color_grid = environment.grid.color_grid
+        for sender in sorted(inbox):
+            for obj in pickle.loads(inbox[sender]['ghosts']):
+                self._add_ghost(obj=obj,
+                                owner=sender)
+
+            for corner, colors in inbox[sender]['colors']:
+                x1, y1 = self._to_tile(position=corner)
+                color_grid.array[x1:x1 + colors.shape[0], y1:y1 + colors.shape[1]] = colors
+
+    def count(self) -> Dict[str, int]:
+        """Public method:
+            Count the objects owned by the tile, without the copies in its halo
+
+        Returns:
+            Dict[str, int]: number of animals, trees and energies
+        """
+        state = self.simulation.state
+        ghost_energies = sum(isinstance(ghost, Energy) for _, ghost in self._ghost_resources)
+
+        return {'animals': state.n_animals,
+                'trees': state.n_trees,
+                'energies': state.n_energies - ghost_energies}
+
+
+def route(outboxes: List[Dict[int, Dict[str, Any]]]) -> List[Dict[int, Dict[str, Any]]]:
+    """Function:
+        Turn the messages sent by each tile into the messages received by each tile
+
+    Args:
+        outboxes (List[Dict[int, Dict[str, Any]]]): messages sent by each tile, by receiving tile
+
+    Returns:
+        List[Dict[int, Dict[str, Any]]]: messages received by each tile, by sending tile
+    """
+    inboxes: List[Dict[int, Dict[str, Any]]] = [{} for _ in outboxes]
+    for sender, outbox in enumerate(outboxes):
+        for receiver, content in outbox.items():
+            inboxes[receiver][sender] = content
+
+    return inboxes
+
+
+def serve(connection: Connection, index: int, layout: TileLayout, sim_id: int,
+          seed: Optional[int], populate: bool, context: SimContext) -> None:
+    """Function:
+        Loop of a worker process, simulating one tile
+
+        Commands received:
+            ('step',):              run a cycle, then reply the messages to the other tiles
+            ('exchange', inbox):    apply the messages of the other tiles, then reply the counts
+            ('close',):             stop the worker
+
+    Args:
+        connection (Connection):    end of the pipe with the main process
+        index (int):                index of the tile in the layout
+        layout (TileLayout):        division of the world into tiles
+        sim_id (int):               id of the simulation
+        seed (Optional[int]):       seed of the random generators
+        populate (bool):            should populate the tile
+        context (SimContext):       settings of the simulation
+    """
+    tile = Tile(index=index,
+                layout=layout,
+                sim_id=sim_id,
+                seed=seed,
+                context=context)
+    tile.init(populate=populate)
+    connection.send(tile.count())
+
+    while True:
+        command, *args = connection.recv()
+        match command:
+            case 'step':
+                connection.send(tile.step())
+
+            case 'exchange':
+                tile.exchange(inbox=args[0])
+                connection.send(tile.count())
+
+            case 'close':
+                break
+
+    tile.simulation.shutdown()
+
+
+def _release(processes: List[multiprocessing.Process], connections: List[Connection]) -> None:
+    """Function:
+        Stop the workers of a tiled simulation
+
+    Args:
+        processes (List[multiprocessing.Process]):  worker processes
+        connections (List[Connection]):             pipes to the workers
+    """
+    for connection in connections:
+        try:
+            connection.send(('close',))
+        except (BrokenPipeError, OSError):
+            pass
+
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+
+
+class TiledSimulation:
+    """Class:
+        Simulation of a world divided into tiles, each one simulated
+        by a worker process, exchanging the objects crossing their borders
+        and the strips of cells their neighbours see after each cycle
+
+        Attributes:
+            layout (TileLayout):                        division of the world into tiles
+            context (SimContext):                       settings of the simulation, shared by its tiles
+            counts (Dict[str, int]):                    number of animals, trees and energies in the world
+            cycle (int):                                current cycle
+            _connections (List[Connection]):            pipes to the workers
+            _processes (List[multiprocessing.Process]): worker processes
+
+        Methods:
+            update: run a cycle in every tile, then exchange their borders
+            close:  stop the workers
+    """
+    def __init__(self, sim_id: int, dimensions: Tuple[int, int], shape: Tuple[int, int],
+                 seed: Optional[int] = None, populate: bool = True,
+                 context: Optional[SimContext] = None):
+        """Constructor:
+            Start a worker for each tile and populate them
+
+        Args:
+            sim_id (int):                   id of the simulation
+            dimensions (Tuple[int, int]):   dimensions of the world
+            shape (Tuple[int, int]):        number of tiles along each axis
+            seed (Optional[int], optional): seed of the random generators. Defaults to None.
+            populate (bool, optional):      should populate the world. Defaults to True.
+            context (Optional[SimContext], optional): settings of the simulation. Defaults to None.
+        """
+        self.context: SimContext = (context if context is not None      # settings shared by the tiles
+                                    else SimContext.from_config())
+        self.layout: TileLayout = TileLayout(dimensions=dimensions,     # division of the world into tiles
+                                             shape=shape,
+                                             halo=get_halo_width(context=self.context))
+        self.cycle: int = 0                                             # current cycle
+
+        self._connections: List[Connection] = []                        # pipes to the workers
+        self._processes: List[multiprocessing.Process] = []             # worker processes
+        for index in range(len(self.layout)):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=serve,
+                                              args=(worker_connection, index, self.layout,
+                                                    sim_id, seed, populate, self.context),
+                                              daemon=True)
+            process.start()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+        self._finalizer = weakref.finalize(self, _release, self._processes,
+                                           self._connections)
+
+        self.counts: Dict[str, int] = self._sum_counts(counts=[connection.recv() for connection
+                                                               in self._connections])
+
+    @staticmethod
+    def _sum_counts(counts: List[Dict[str, int]]) -> Dict[str, int]:
+        """Private static method:
+            Add up the counts of the tiles
+
+        Args:
+            counts (List[Dict[str, int]]): counts of each tile
+
+        Returns:
+            Dict[str, int]: counts of the world
+        """
+        return {key: sum(count[key] for count in counts) for key in counts[0]}
+
+    def update(self) -> Dict[str, int]:
+        """Public method:
+            Run a cycle in every tile at once,
+            then route the messages between them
+
+        Returns:
+            Dict[str, int]: number of animals, trees and energies in the world
+        """
+        for connection in self._connections:
+            connection.send(('step',))
+
+        inboxes = route(outboxes=[connection.recv() for connection in self._connections])
+        for connection, inbox in zip(self._connections, inboxes):
+            connection.send(('exchange', inbox))
+
+        self.cycle += 1
+        self.counts = self._sum_counts(counts=[connection.recv() for connection
+                                               in self._connections])
+
+        return self.counts
+
+    def close(self) -> None:
+        """Public method:
+            Stop the workers
+        """
+        self._finalizer()
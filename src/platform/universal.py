@@ -2,9 +2,13 @@ from __future__ import annotations
 
 import enum
 from dataclasses import dataclass
+from functools import lru_cache
 from math import acos, pi, sqrt
 from typing import Any, Tuple
 
+import numpy as np
+import numpy.typing as npt
+
 
 class EntityType(enum.Enum):
     """Enum:
@@ -116,6 +120,62 @@ class Position:
         return round(distance, 2)
 
 
+@lru_cache
+def get_offset_tables(radius: int) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """Function:
+        Get the distance and normalized angle of every offset (dx, dy)
+        up to a radius, computed once with Position.distance and Position.norm_angle
+        so that looking them up gives exactly the same values
+
+    Args:
+        radius (int): maximum absolute value of dx and dy
+
+    Returns:
+        Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+            distances: distance of each offset, indexed by [dx + radius, dy + radius]
+            norm_angles: normalized angle of each offset, nan for (0, 0)
+    """
+    side = 2 * radius + 1
+    distances = np.zeros((side, side))
+    norm_angles = np.full((side, side), np.nan)
+
+    origin = Position(0, 0)
+    for dx in range(-radius, radius + 1):
+        for dy in range(-radius, radius + 1):
+            if dx or dy:
+                offset = Position(dx, dy)
+                distances[dx + radius, dy + radius] = origin.distance(other_pos=offset)
+                norm_angles[dx + radius, dy + radius] = origin.norm_angle(other_pos=offset)
+
+    distances.flags.writeable = norm_angles.flags.writeable = False
+
+    return distances, norm_angles
+
+
+@lru_cache
+def get_ring_offsets(radius: int) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Function:
+        Get the offsets of the cells on the rings 1 to radius
+        around a cell, ordered by ring so that a search can stop at the first hit
+
+    Args:
+        radius (int): outermost ring
+
+    Returns:
+        Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:    offsets: K×2 offsets of the cells
+                                                                rings: ring of each offset
+    """
+    span = np.arange(-radius, radius + 1)
+    offsets = np.stack(np.meshgrid(span, span, indexing='ij'), axis=-1).reshape(-1, 2)
+    rings = np.abs(offsets).max(axis=1)
+
+    order = np.argsort(rings, kind='stable')[1:]    # skip the center
+    offsets, rings = offsets[order], rings[order]
+    offsets.flags.writeable = rings.flags.writeable = False
+
+    return offsets, rings
+
+
 class SimulatedObject:
     """Class:
         Object being modified during simulation execution's cycles
@@ -6,12 +6,12 @@ if TYPE_CHECKING:
     from grid import Grid
 
 import pickle
-from typing import Final, Tuple
+from typing import Final, Optional, Tuple
 
 from .display import Display
 from .probe import Probe
 from .running.analyze import Evaluator
-from .running.config import config
+from .running.config import SimContext, config
 from .simulation import SimState, Simulation
 
 INITIAL_ANIMAL_POPULATION: Final[int] = 10
@@ -31,11 +31,13 @@ class World:
             running (bool):                 is currently running
             simulation (Simulation):        computation of the world
             display (Display):              visual representation of simulation
+            context (SimContext):           settings of the simulation
+            max_cycle (int):                cycle at which the simulation stops
 
         Methods:
             init:       Initialize the world
             shutdown:   Shutdown the simulation
-            run:        run the simulation until shutdown is called
+            run:        run the simulation until shutdown is called, or for a number of cycles
     """
     GRID_HEIGHT: Final[int] = config['Simulation']['grid_height']
     GRID_WIDTH: Final[int] = config['Simulation']['grid_width']
@@ -46,15 +48,19 @@ class World:
 
     def __init__(self,
                  world_id: int,
-                 dimensions: Tuple[int, int] = (GRID_HEIGHT,
-                                                GRID_WIDTH),
+                 dimensions: Optional[Tuple[int, int]] = None,
                  block_size: int = BLOCK_SIZE,
                  sim_speed: int = SIMULATION_SPEED,
                  display_active: bool = False,
-                 probe: bool = False):
+                 probe: bool = False,
+                 context: Optional[SimContext] = None):
 
         self.__id: int = world_id
-        self.dimensions: Tuple[int, int] = dimensions
+        self.context: SimContext = (context if context is not None
+                                    else SimContext.from_config())
+        self.dimensions: Tuple[int, int] = dimensions or (self.context['Simulation']['grid_height'],
+                                                          self.context['Simulation']['grid_width'])
+        self.max_cycle: int = self.context['Simulation']['max_cycle']
         self.block_size: int = block_size
         self.sim_speed: int = sim_speed
         self.display_active: bool = display_active
@@ -95,8 +101,9 @@ class World:
             self.simulation = pickle.load(open('simulations/' + config.loaded_simulation, "rb"))
             sim_state = self.simulation.state
             self.simulation.load_innovations()
+            self.context = self.simulation.context
 
-            World.MAX_CYCLE += sim_state.cycle
+            self.max_cycle = self.context['Simulation']['max_cycle'] + sim_state.cycle
             # self.display_active: bool = False
             """ phase = sim_state.cycle//1000 + 1
             config.set_difficulty_range(phase=phase) """
@@ -105,7 +112,8 @@ class World:
             """ if config.loaded_simulation:
                 print(f"the file {config.loaded_simulation} does not exist") """
             self.simulation = Simulation(sim_id=self.id,
-                                         dimensions=self.dimensions)
+                                         dimensions=self.dimensions,
+                                         context=self.context)
             sim_state = self.simulation.init()
 
         if self.probe_active:
@@ -145,8 +153,8 @@ class World:
         """ if sim_state.cycle%1000 == 0:
             self.save_simulation() """
             
-        if (sim_state.cycle == World.MAX_CYCLE or
-            len(sim_state.entities) == 0):
+        if (sim_state.cycle == self.max_cycle or
+            sim_state.n_entities == 0):
             self.shutdown()
 
     def save_metrics(self, sim_name: str="sim"):
@@ -170,16 +178,17 @@ class World:
         
 
     def set_difficulty(self, sim_state) -> None:
-        if sim_state.cycle > config['Simulation']['difficulty_cycle_factor_threshold']:
-            difficulty_factor: float = ((sim_state.n_animals  - config['Simulation']['difficulty_pop_threshold'])
-                                        /config['Simulation']['difficulty_pop_factor']) + 1
+        settings = self.context['Simulation']
+        if sim_state.cycle > settings['difficulty_cycle_factor_threshold']:
+            difficulty_factor: float = ((sim_state.n_animals  - settings['difficulty_pop_threshold'])
+                                        /settings['difficulty_pop_factor']) + 1
             
-            config.set_difficulty_factor(difficulty_factor * config['Simulation']['difficulty_pop_coefficient'])
+            self.context.set_difficulty_factor(difficulty_factor * settings['difficulty_pop_coefficient'])
         
-        difficulty = ((sim_state.cycle//config['Simulation']['diffulty_cycles_step'])
-                     * config['Simulation']['diffulty_factor_coefficient']) + 1
+        difficulty = ((sim_state.cycle//settings['diffulty_cycles_step'])
+                     * settings['diffulty_factor_coefficient']) + 1
              
-        diff: float = config.set_difficulty(difficulty)
+        diff: float = self.context.set_difficulty(difficulty)
 
         print(f"{sim_state.cycle}: {sim_state.n_animals} {diff:.2f}")
 
@@ -191,15 +200,22 @@ class World:
             self.save_metrics() """
             
         # self.write_metrics()
+        self.simulation.shutdown()
         self.running = False
 
-    def run(self) -> None:
+    def run(self, n_cycles: Optional[int] = None) -> None:
         """Public method:
-            Run the simulation until shutdown is called
+            Run the simulation until shutdown is called,
+            or for a number of cycles
+
+        Args:
+            n_cycles (Optional[int], optional): number of cycles to run, until shutdown if None. Defaults to None.
         """
         self.running = True
-        while self.running:
+        cycle = 0
+        while self.running and (n_cycles is None or cycle < n_cycles):
             self._update()
+            cycle += 1
 
     def write_metrics(self) -> None:
         metrics = {'cycles': True,
@@ -207,8 +223,8 @@ class World:
                    'born_animals': True,
                    }
 
-        self.probe.write(parameter=config['Run']['parameter'],
-                           variation=config['Run']['value'],
+        self.probe.write(parameter=self.context['Run']['parameter'],
+                           variation=self.context['Run']['value'],
                            **metrics)
 
     def graph_metrics(self) -> None:
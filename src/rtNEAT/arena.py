@@ -0,0 +1,444 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .network import FlatNetwork, Network
+    from .pool import ArenaPool, PackedNetwork
+
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
+from numba import njit
+
+from .genes import sigmoid
+
+
+@njit(nogil=True)
+def evaluate_segments(values: npt.NDArray[np.float64], order: npt.NDArray[np.int64],
+                      bias: npt.NDArray[np.float64], link_start: npt.NDArray[np.int64],
+                      link_end: npt.NDArray[np.int64], sources: npt.NDArray[np.int64],
+                      weights: npt.NDArray[np.float64], node_start: npt.NDArray[np.int64],
+                      node_end: npt.NDArray[np.int64]) -> None:
+    """Function:
+        Evaluate the schedules of several flat networks packed in the same arrays
+
+    Args:
+        values (npt.NDArray[np.float64]):       activation value of every node of the arena
+        order (npt.NDArray[np.int64]):          value index of the nodes to evaluate
+        bias (npt.NDArray[np.float64]):         bias of each evaluated node
+        link_start (npt.NDArray[np.int64]):     first link of each evaluated node
+        link_end (npt.NDArray[np.int64]):       end of the links of each evaluated node
+        sources (npt.NDArray[np.int64]):        value index of the in node of each link
+        weights (npt.NDArray[np.float64]):      weight of each link
+        node_start (npt.NDArray[np.int64]):     first scheduled node of each network to evaluate
+        node_end (npt.NDArray[np.int64]):       end of the schedule of each network to evaluate
+    """
+    for s in range(node_start.size):
+        for i in range(node_start[s], node_end[s]):
+            total = bias[i]
+            for k in range(link_start[i], link_end[i]):
+                total += values[sources[k]] * weights[k]
+
+            values[order[i]] = sigmoid(total)
+
+
+def concatenate_ranges(starts: npt.NDArray[np.int64], ends: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+    """Function:
+        Concatenate the integer ranges [start, end) of several segments
+
+    Args:
+        starts (npt.NDArray[np.int64]): first index of each segment
+        ends (npt.NDArray[np.int64]):   end of each segment
+
+    Returns:
+        npt.NDArray[np.int64]: indices of all the segments, in order
+    """
+    lengths = ends - starts
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+
+    return offsets + np.arange(lengths.sum(), dtype=np.int64)
+
+
+def evaluate_chunk(arrays: Dict[str, npt.NDArray], node_start: npt.NDArray[np.int64],
+                   node_end: npt.NDArray[np.int64], input_index: npt.NDArray[np.int64],
+                   inputs: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """Function:
+        Evaluate a chunk of the networks packed in the arrays of an arena,
+        either in a thread sharing the arrays or in a process given a copy of them
+
+    Args:
+        arrays (Dict[str, npt.NDArray]):        packed schedules, values and links
+        node_start (npt.NDArray[np.int64]):     first scheduled node of each network of the chunk
+        node_end (npt.NDArray[np.int64]):       end of the schedule of each network of the chunk
+        input_index (npt.NDArray[np.int64]):    value index of the inputs of each network of the chunk
+        inputs (npt.NDArray[np.float64]):       input values of each network of the chunk
+
+    Returns:
+        npt.NDArray[np.float64]: values of the scheduled nodes of the chunk, in schedule order
+    """
+    values = arrays['values']
+    values[input_index] = inputs
+    evaluate_segments(values, arrays['order'], arrays['bias'],
+                      arrays['link_start'], arrays['link_end'],
+                      arrays['sources'], arrays['weights'],
+                      node_start, node_end)
+
+    return values[arrays['order'][concatenate_ranges(starts=node_start,
+                                                     ends=node_end)]]
+
+
+class BrainArena:
+    """Class:
+        Compiled networks of a population packed into shared CSR-style arrays,
+        so that all of them are evaluated in a single call.
+        Entries of dead brains are recycled through a free list of slots,
+        their space is reclaimed by compacting the arrays
+
+        Attributes:
+            n_inputs (int):                         number of inputs of each network
+            n_outputs (int):                        number of outputs of each network
+            networks (List[Optional[FlatNetwork]]): compiled network in each slot
+            free_slots (List[int]):                 slots available for new entries
+            _arrays (Dict[str, npt.NDArray]):       packed schedules, values and links
+            _slots (Dict[str, npt.NDArray]):        position of each slot in the packed arrays
+            _sizes (Dict[str, int]):                used length of the packed arrays
+            _garbage (int):                         number of values left by removed entries
+            pool (Optional[ArenaPool]):             worker processes evaluating the networks, if started
+
+        Methods:
+            add:            pack a compiled network into a slot
+            add_compiled:   pack the arrays of a compiled network into a slot
+            remove:         free the slot of a network
+            evaluate:       evaluate the networks of some slots from an input matrix
+            start_pool:     evaluate the networks in worker processes from now on
+            stop_pool:      evaluate the networks in this process again
+    """
+    ARRAYS: Dict[str, type] = {'values': np.float64,        # by value
+                               'order': np.int64,           # by scheduled node
+                               'bias': np.float64,
+                               'link_start': np.int64,
+                               'link_end': np.int64,
+                               'sources': np.int64,         # by link
+                               'weights': np.float64}
+
+    def __init__(self, n_inputs: int, n_outputs: int, capacity: int = 64):
+        """Constructor:
+            Initialize an empty arena
+
+        Args:
+            n_inputs (int):             number of inputs of each network
+            n_outputs (int):            number of outputs of each network
+            capacity (int, optional):   initial number of slots. Defaults to 64.
+        """
+        self.n_inputs: int = n_inputs                       # number of inputs of each network
+        self.n_outputs: int = n_outputs                     # number of outputs of each network
+        self.networks: List[Optional[FlatNetwork]] = []     # compiled network in each slot
+        self.free_slots: List[int] = []                     # slots available for new entries
+
+        self._arrays: Dict[str, npt.NDArray] = {            # packed schedules, values and links
+            name: np.zeros(capacity * 16, dtype=dtype)
+            for name, dtype in BrainArena.ARRAYS.items()}
+
+        self._slots: Dict[str, npt.NDArray] = {             # position of each slot in the packed arrays
+            'value_start': np.zeros(capacity, dtype=np.int64),
+            'node_start': np.zeros(capacity, dtype=np.int64),
+            'node_end': np.zeros(capacity, dtype=np.int64),
+            'inputs': np.zeros((capacity, n_inputs), dtype=np.int64),
+            'outputs': np.zeros((capacity, n_outputs), dtype=np.int64)}
+
+        self._sizes: Dict[str, int] = {'values': 0,         # used length of the packed arrays
+                                       'nodes': 0,
+                                       'links': 0}
+        self._garbage: int = 0                              # number of values left by removed entries
+        self.pool: Optional[ArenaPool] = None               # worker processes evaluating the networks
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes can not be pickled, the pool is started again when needed
+        state = self.__dict__.copy()
+        state['pool'] = None
+
+        return state
+
+    def __len__(self) -> int:
+        return len(self.networks) - len(self.free_slots)
+
+    @staticmethod
+    def _grow(array: npt.NDArray, size: int) -> npt.NDArray:
+        """Private static method:
+            Return the array, or a copy with at least twice its length
+            if it is shorter than the size
+
+        Args:
+            array (npt.NDArray):    array to grow
+            size (int):             length required
+
+        Returns:
+            npt.NDArray: array long enough
+        """
+        if size <= len(array):
+            return array
+
+        grown = np.zeros((max(size, 2 * len(array)), *array.shape[1:]), dtype=array.dtype)
+        grown[:len(array)] = array
+
+        return grown
+
+    def _reserve(self, n_values: int, n_nodes: int, n_links: int, slot: int) -> None:
+        """Private method:
+            Make room in the packed arrays for a new entry
+
+        Args:
+            n_values (int): number of values of the entry
+            n_nodes (int):  number of scheduled nodes of the entry
+            n_links (int):  number of links of the entry
+            slot (int):     slot of the entry
+        """
+        required = {'values': self._sizes['values'] + n_values,
+                    'order': self._sizes['nodes'] + n_nodes,
+                    'bias': self._sizes['nodes'] + n_nodes,
+                    'link_start': self._sizes['nodes'] + n_nodes,
+                    'link_end': self._sizes['nodes'] + n_nodes,
+                    'sources': self._sizes['links'] + n_links,
+                    'weights': self._sizes['links'] + n_links}
+
+        for name, size in required.items():
+            self._arrays[name] = self._grow(array=self._arrays[name], size=size)
+
+        for name, array in self._slots.items():
+            self._slots[name] = self._grow(array=array, size=slot + 1)
+
+    def _point_networks(self) -> None:
+        """Private method:
+            Make the values of the networks views into the packed values,
+            so that activating a network alone keeps the arena up to date
+        """
+        values = self._arrays['values']
+        for slot, network in enumerate(self.networks):
+            if network is not None:
+                start = self._slots['value_start'][slot]
+                network.values = values[start:start + len(network.values)]
+
+    def _pack(self, network: FlatNetwork, slot: int) -> None:
+        """Private method:
+            Append the arrays of a compiled network at the end of the packed arrays
+
+        Args:
+            network (FlatNetwork):  compiled network to pack
+            slot (int):             slot of the network
+        """
+        n_values, n_nodes, n_links = len(network.values), len(network.order), len(network.sources)
+        self._reserve(n_values=n_values,
+                      n_nodes=n_nodes,
+                      n_links=n_links,
+                      slot=slot)
+
+        v0, n0, l0 = self._sizes['values'], self._sizes['nodes'], self._sizes['links']
+        arrays = self._arrays
+
+        arrays['values'][v0:v0 + n_values] = network.values
+        arrays['order'][n0:n0 + n_nodes] = network.order + v0
+        arrays['bias'][n0:n0 + n_nodes] = network.bias
+        arrays['link_start'][n0:n0 + n_nodes] = network.pointers[:-1] + l0
+        arrays['link_end'][n0:n0 + n_nodes] = network.pointers[1:] + l0
+        arrays['sources'][l0:l0 + n_links] = network.sources + v0
+        arrays['weights'][l0:l0 + n_links] = network.weights
+
+        self._slots['value_start'][slot] = v0
+        self._slots['node_start'][slot] = n0
+        self._slots['node_end'][slot] = n0 + n_nodes
+        self._slots['inputs'][slot] = network.input_index + v0
+        self._slots['outputs'][slot] = network.output_index + v0
+
+        self._sizes['values'] += n_values
+        self._sizes['nodes'] += n_nodes
+        self._sizes['links'] += n_links
+
+        network.values = arrays['values'][v0:v0 + n_values]
+
+    def _compact(self) -> None:
+        """Private method:
+            Repack the live networks, reclaiming the space of removed ones
+        """
+        self._sizes = dict.fromkeys(self._sizes, 0)
+        self._arrays = {name: np.zeros_like(array) for name, array in self._arrays.items()}
+        self._garbage = 0
+
+        for slot, network in enumerate(self.networks):
+            if network is not None:
+                self._pack(network=network,
+                           slot=slot)
+
+        self._point_networks()
+
+    def add(self, network: Network) -> int:
+        """Public method:
+            Pack the compiled version of a network into a free slot
+
+        Args:
+            network (Network): network to add, compiled if it is not yet
+
+        Returns:
+            int: slot of the network, -1 if it can not be compiled
+        """
+        if network.flat is None and not network.compile():
+            return -1
+
+        if (network.n_inputs, network.n_outputs) != (self.n_inputs, self.n_outputs):
+            raise ValueError(f"""Network {network.n_inputs}x{network.n_outputs} does not fit
+                             in arena {self.n_inputs}x{self.n_outputs}""")
+
+        slot = self.add_compiled(network=network.flat)
+        if self.pool is not None:
+            self.pool.add(slot=slot,
+                          network=network.flat)
+
+        return slot
+
+    def add_compiled(self, network: Union[FlatNetwork, PackedNetwork]) -> int:
+        """Public method:
+            Pack the arrays of a compiled network into a free slot
+
+        Args:
+            network (Union[FlatNetwork, PackedNetwork]): compiled network to add
+
+        Returns:
+            int: slot of the network
+        """
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.networks[slot] = network
+        else:
+            slot = len(self.networks)
+            self.networks.append(network)
+
+        values = self._arrays['values']
+        self._pack(network=network,
+                   slot=slot)
+
+        # Networks packed earlier still view the previous values if they moved
+        if self._arrays['values'] is not values:
+            self._point_networks()
+
+        return slot
+
+    def remove(self, slot: int) -> None:
+        """Public method:
+            Free the slot of a network,
+            its space is reclaimed once removed entries outweigh live ones
+
+        Args:
+            slot (int): slot to free
+        """
+        network = self.networks[slot]
+        if network is None:
+            return
+
+        # Detach the network from the packed values
+        network.values = network.values.copy()
+        self.networks[slot] = None
+        self.free_slots.append(slot)
+
+        if self.pool is not None:
+            self.pool.remove(slot=slot)
+
+        self._garbage += len(network.values)
+        if self._garbage > self._sizes['values'] - self._garbage:
+            self._compact()
+
+    def evaluate(self, slots: npt.NDArray[np.int64],
+                 inputs: npt.NDArray[np.float64],
+                 executor: Optional[Executor] = None,
+                 chunk_size: int = 0) -> npt.NDArray[np.float64]:
+        """Public method:
+            Evaluate the networks of some slots in one pass,
+            or in chunks spread over the workers of an executor
+
+        Args:
+            slots (npt.NDArray[np.int64]):          N slots to evaluate
+            inputs (npt.NDArray[np.float64]):       N×n_inputs input matrix, one row per slot
+            executor (Optional[Executor], optional): pool of threads or processes
+                                                     to evaluate the chunks with. Defaults to None.
+            chunk_size (int, optional):             number of slots of each chunk, 0 for a single chunk.
+                                                    Defaults to 0.
+
+        Returns:
+            npt.NDArray[np.float64]: N×n_outputs output values, one row per slot
+        """
+        slots = np.asarray(slots, dtype=np.int64)
+        arrays = self._arrays
+        values = arrays['values']
+
+        if self.pool is not None:
+            outputs = self.pool.evaluate(slots=slots,
+                                         inputs=inputs)
+
+            # Keep the outputs readable from the networks of this process
+            values[self._slots['inputs'][slots]] = inputs
+            values[self._slots['outputs'][slots]] = outputs
+
+            return outputs
+
+        if executor is None:
+            values[self._slots['inputs'][slots]] = inputs
+            evaluate_segments(values, arrays['order'], arrays['bias'],
+                              arrays['link_start'], arrays['link_end'],
+                              arrays['sources'], arrays['weights'],
+                              self._slots['node_start'][slots],
+                              self._slots['node_end'][slots])
+
+            return values[self._slots['outputs'][slots]]
+
+        chunk_size = max(chunk_size or len(slots), 1)
+        chunks = [slice(start, start + chunk_size)
+                  for start in range(0, len(slots), chunk_size)]
+
+        node_start = self._slots['node_start'][slots]
+        node_end = self._slots['node_end'][slots]
+        input_index = self._slots['inputs'][slots]
+
+        futures = [executor.submit(evaluate_chunk, arrays,
+                                   node_start[chunk], node_end[chunk],
+                                   input_index[chunk], inputs[chunk])
+                   for chunk in chunks]
+
+        # Processes evaluate copies of the arrays, write their results back
+        values[input_index] = inputs
+        for chunk, future in zip(chunks, futures):
+            scheduled = arrays['order'][concatenate_ranges(starts=node_start[chunk],
+                                                           ends=node_end[chunk])]
+            values[scheduled] = future.result()
+
+        return values[self._slots['outputs'][slots]]
+
+    def start_pool(self, n_workers: int) -> None:
+        """Public method:
+            Evaluate the networks in worker processes from now on,
+            shipping them the networks already packed
+
+        Args:
+            n_workers (int): number of worker processes
+        """
+        from .pool import ArenaPool
+
+        if self.pool is not None:
+            return
+
+        self.pool = ArenaPool(n_inputs=self.n_inputs,
+                              n_outputs=self.n_outputs,
+                              n_workers=n_workers)
+
+        for slot, network in enumerate(self.networks):
+            if network is not None:
+                self.pool.add(slot=slot,
+                              network=network)
+
+    def stop_pool(self) -> None:
+        """Public method:
+            Stop the worker processes and evaluate the networks in this process again
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
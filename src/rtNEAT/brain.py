@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Mapping, Optional
 
+from project.src.platform.running.config import config
+
+from .arena import BrainArena
 from .genome import Genome
+from .innovation import InnovTable
 from .network import Network
 
 
@@ -13,60 +17,142 @@ class Brain:
         self.__id = brain_id
         self.genotype: Genome
         self.phenotype: Network
-
+        self.arena: Optional[BrainArena] = None     # arena evaluating the phenotype
+        self.slot: int = -1                         # slot of the phenotype in the arena
 
     @classmethod
-    def genesis(cls, brain_id: int, genome_data: Dict[str, Any]) -> Brain:
+    def genesis(cls, brain_id: int, genome_data: Dict[str, Any],
+                arena: Optional[BrainArena] = None,
+                settings: Optional[Mapping[str, Any]] = None,
+                innov_table: Optional[InnovTable] = None) -> Brain:
         """Class method:
             Create a brain with genotype and phenotype for the given entity type
 
         Args:
-            brain_id (int):                 id of the entity
-            genome_data (Dict[str, Any]):   contain the brain's genome information
+            brain_id (int):                         id of the entity
+            genome_data (Dict[str, Any]):           contain the brain's genome information
+            arena (Optional[BrainArena], optional): arena to add the phenotype to. Defaults to None.
+            settings (Optional[Mapping[str, Any]], optional): NEAT settings, the configuration's if None. Defaults to None.
+            innov_table (Optional[InnovTable], optional): table numbering the innovations, the default one if None. Defaults to None.
 
         Returns:
             Brain: created brain
         """
-
+        settings = settings if settings is not None else config["NEAT"]
         brain = cls(brain_id=brain_id)
 
         # Create the genome
         brain.genotype = Genome.genesis(genome_id=brain_id,
-                                        genome_data=genome_data)
+                                        genome_data=genome_data,
+                                        settings=settings,
+                                        innov_table=innov_table)
 
         # Create the phenotype from the genome
-        brain.phenotype = Network.genesis(genome=brain.genotype)
+        brain.phenotype = Network.genesis(genome=brain.genotype,
+                                          compiled=settings["compile_network"])
+
+        if arena is not None:
+            brain.register(arena=arena)
+
+        return brain
+
+    @classmethod
+    def from_genome(cls, brain_id: int, genome: Genome,
+                    arena: Optional[BrainArena] = None,
+                    settings: Optional[Mapping[str, Any]] = None) -> Brain:
+        """Class method:
+            Create a brain around an existing genotype,
+            such as one evolved in another world
+
+        Args:
+            brain_id (int):                         id of the entity
+            genome (Genome):                        genotype of the brain
+            arena (Optional[BrainArena], optional): arena to add the phenotype to. Defaults to None.
+            settings (Optional[Mapping[str, Any]], optional): NEAT settings, the configuration's if None. Defaults to None.
+
+        Returns:
+            Brain: created brain
+        """
+        settings = settings if settings is not None else config["NEAT"]
+        brain = cls(brain_id=brain_id)
+
+        brain.genotype = genome
+        brain.phenotype = Network.genesis(genome=brain.genotype,
+                                          compiled=settings["compile_network"])
+
+        if arena is not None:
+            brain.register(arena=arena)
 
         return brain
 
     @classmethod
-    def crossover(cls, brain_id: int,  parent1: Brain, parent2: Brain) -> Brain:
+    def crossover(cls, brain_id: int,  parent1: Brain, parent2: Brain,
+                  arena: Optional[BrainArena] = None, difficulty: Optional[float] = None,
+                  settings: Optional[Mapping[str, Any]] = None,
+                  innov_table: Optional[InnovTable] = None) -> Brain:
         """Class method:
             Crossover two parents brain into a new brain,
             apply mutation to the new genome before creating its phenotype
 
         Args:
-            brain_id (int):     baby's id
-            parent1 (Brain):    first parent's brain
-            parent2 (Brain):    second parent's brain
+            brain_id (int):                         baby's id
+            parent1 (Brain):                        first parent's brain
+            parent2 (Brain):                        second parent's brain
+            arena (Optional[BrainArena], optional): arena to add the phenotype to,
+                                                    the first parent's one if None. Defaults to None.
+            difficulty (Optional[float], optional): difficulty of the simulation,
+                                                    the configuration's if None. Defaults to None.
+            settings (Optional[Mapping[str, Any]], optional): NEAT settings, the configuration's if None. Defaults to None.
+            innov_table (Optional[InnovTable], optional): table numbering the innovations, the default one if None. Defaults to None.
 
         Returns:
             Brain: baby's brain
         """
+        settings = settings if settings is not None else config["NEAT"]
         brain = cls(brain_id=brain_id)
 
         genome = Genome.crossover(genome_id=brain_id,
                                   parent1=parent1.genotype,
                                   parent2=parent2.genotype)
 
-        genome.crossover_mutate()
+        genome.crossover_mutate(difficulty=difficulty,
+                                settings=settings,
+                                innov_table=innov_table)
 
         brain.genotype = genome
 
-        brain.phenotype = Network.genesis(genome=brain.genotype)
+        brain.phenotype = Network.genesis(genome=brain.genotype,
+                                          compiled=settings["compile_network"])
+
+        arena = arena if arena is not None else parent1.arena
+        if arena is not None:
+            brain.register(arena=arena)
 
         return brain
 
+    def register(self, arena: BrainArena) -> None:
+        """Public method:
+            Add the phenotype to an arena, leaving the previous one
+
+        Args:
+            arena (BrainArena): arena evaluating the phenotype
+        """
+        self.release()
+
+        self.slot = arena.add(network=self.phenotype)
+        if self.slot >= 0:
+            self.arena = arena
+
+    def release(self) -> None:
+        """Public method:
+            Free the slot of the phenotype in its arena
+        """
+        if self.arena is not None:
+            self.arena.remove(slot=self.slot)
+
+        self.arena = None
+        self.slot = -1
+
     @property
     def id(self):
         return self.__id
@@ -4,14 +4,14 @@ import enum
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from functools import partial
-from typing import Dict, Optional, Set
+from typing import Any, Dict, Mapping, Optional, Set
 
 import numpy as np
 from numba import njit
 from numpy.random import random, uniform
 from project.src.platform.running.config import config
 
-from .innovation import InnovTable
+from .innovation import default_innov_table
 
 
 class NodeType(enum.Enum):
@@ -152,7 +152,7 @@ class BaseGene(ABC):
         """
 
     @abstractmethod
-    def mutate(self) -> None:
+    def mutate(self, settings: Optional[Mapping[str, Any]] = None) -> None:
         """Mutate the gene
 
         Raises:
@@ -237,7 +237,7 @@ class LinkGene(BaseGene):
         """
 
         # If no id is given, check the next link number
-        link_id: int = link_id or InnovTable.get_link_number(increment=True)
+        link_id: int = link_id or default_innov_table.get_link_number(increment=True)
 
         super().__init__(gene_id=link_id,
                          name=name,
@@ -260,28 +260,32 @@ class LinkGene(BaseGene):
                 'in_node':self.in_node, 'out_node':self.out_node,
                 'enabled':self.enabled}
 
-    def mutate(self) -> None:
+    def mutate(self, settings: Optional[Mapping[str, Any]] = None) -> None:
         """Mutate the LinkGene
+
+        Args:
+            settings (Optional[Mapping[str, Any]], optional): NEAT settings, the configuration's if None. Defaults to None.
         """
         # if frozen can't be mutated
         if self.frozen:
             return
 
+        settings = settings if settings is not None else config["NEAT"]
         # link is being reset
-        if random() < config["NEAT"]["new_link_prob"]:
+        if random() < settings["new_link_prob"]:
             self.weight = uniform(-1,1)
         # value is being added to current weight
         else:
-            self.weight += uniform(-1,1) * config["NEAT"]["weight_mutate_power"]
+            self.weight += uniform(-1,1) * settings["weight_mutate_power"]
 
             # associate new weight to mutation number
             self.mutation_number = self.weight
 
         # disable the link
-        if random() < config["NEAT"]["disable_prob"]:
+        if random() < settings["disable_prob"]:
             self.enabled = False
         # enable the link
-        elif random() < config["NEAT"]["enable_prob"]:
+        elif random() < settings["enable_prob"]:
             self.enabled = True
 
     def duplicate(self) -> LinkGene:
@@ -368,7 +372,7 @@ class NodeGene(BaseGene):
             frozen (bool, optional):                                can not mutate. Defaults to False.
         """
 
-        node_id: int = node_id or InnovTable.get_node_number(increment=True)
+        node_id: int = node_id or default_innov_table.get_node_number(increment=True)
 
         super().__init__(gene_id=node_id,
                          name=name,
@@ -395,23 +399,27 @@ class NodeGene(BaseGene):
                 'aggregation_function':self.aggregation_function,
                 'bias':self.bias, 'enabled':self.enabled}
 
-    def mutate(self) -> None:
+    def mutate(self, settings: Optional[Mapping[str, Any]] = None) -> None:
         """Mutate the NodeGene
+
+        Args:
+            settings (Optional[Mapping[str, Any]], optional): NEAT settings, the configuration's if None. Defaults to None.
         """
         # if frozen can't be mutated
         if self.frozen:
             return
 
+        settings = settings if settings is not None else config["NEAT"]
         # modify bias value
-        if (random() < config["NEAT"]["mutate_bias_prob"] and
+        if (random() < settings["mutate_bias_prob"] and
             not self.is_sensor()):
             self.bias = uniform(-1,1)
 
         # disable the node
-        if random() < config["NEAT"]["disable_prob"]:
+        if random() < settings["disable_prob"]:
             self.enabled= False
         # enable the node
-        elif random() < config["NEAT"]["enable_prob"]:
+        elif random() < settings["enable_prob"]:
             self.enabled = True
 
     def mutation_distance(self, other_gene: NodeGene) -> float:
@@ -516,6 +524,7 @@ class OutputNodeGene(NodeGene):
 
 def reset_innovation_table():
     """Public method:
-        Reset the innovation table to initial values
+        Reset the innovation table of the genomes evolved
+        outside of any simulation to initial values
     """
-    InnovTable.reset_innovation_table()
+    default_innov_table.reset_innovation_table()
@@ -1,16 +1,501 @@
 from __future__ import annotations
 
 from random import choice, randint, random, sample
-from typing import Any, Dict, Optional, Set, Tuple, TypeVar
+from typing import (Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple,
+                    TypeVar)
 
+import numpy as np
+import numpy.typing as npt
 from project.src.platform.running.config import config
 
 from .genes import (BaseGene, LinkGene, NodeGene, NodeType, OutputNodeGene,
-                    OutputType)
-from .innovation import InnovationType, InnovTable
+                    OutputType, relu, sigmoid)
+from .innovation import InnovationType, InnovTable, default_innov_table
 
 Gene = TypeVar('Gene', bound=BaseGene)
 
+LINK_DTYPE = np.dtype([('innovation', np.int64),
+                       ('in_node', np.int64),
+                       ('out_node', np.int64),
+                       ('weight', np.float64),
+                       ('mutation_number', np.float64),
+                       ('enabled', np.bool_),
+                       ('frozen', np.bool_)])
+
+NODE_DTYPE = np.dtype([('id', np.int64),
+                       ('type', np.int8),
+                       ('bias', np.float64),
+                       ('activation', np.int8),
+                       ('enabled', np.bool_),
+                       ('frozen', np.bool_)])
+
+ACTIVATION_FUNCTIONS = (sigmoid, relu)
+
+
+def gene_arrays(genes: Dict[int, Gene]) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+    """Function:
+        Sort the innovation numbers and mutation numbers of genes
+
+    Args:
+        genes (Dict[int, Gene]): genes by innovation number
+
+    Returns:
+        Tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:  sorted innovation numbers
+                                                                mutation number of each gene
+    """
+    ids = np.fromiter(genes.keys(), dtype=np.int64, count=len(genes))
+    mutation_numbers = np.fromiter((gene.mutation_number for gene in genes.values()),
+                                   dtype=np.float64,
+                                   count=len(genes))
+    order = np.argsort(ids, kind='stable')
+
+    return ids[order], mutation_numbers[order]
+
+
+def compatibility(num_excess: npt.ArrayLike, num_disjoint: npt.ArrayLike,
+                  mutation_difference: npt.ArrayLike, num_matching: npt.ArrayLike) -> npt.ArrayLike:
+    """Function:
+        Apply the genetic distance formula, with coefficients from settings
+
+    Args:
+        num_excess (npt.ArrayLike):             number of excess genes
+        num_disjoint (npt.ArrayLike):           number of disjoint genes
+        mutation_difference (npt.ArrayLike):    total mutation difference of matching genes
+        num_matching (npt.ArrayLike):           number of matching genes
+
+    Returns:
+        npt.ArrayLike: genetic distance
+    """
+    return (num_excess * config["NEAT"]["excess_coeff"]
+          + num_disjoint * config["NEAT"]["disjoint_coeff"]
+          + config["NEAT"]["mutation_difference_coeff"]
+            * mutation_difference / np.maximum(num_matching, 1))
+
+
+def _pairwise_gene_distance(gene_dicts: Sequence[Dict[int, Gene]]) -> npt.NDArray[np.float64]:
+    """Private function:
+        Calculate the genetic distance between all the pairs of a sequence of genes
+
+    Args:
+        gene_dicts (Sequence[Dict[int, Gene]]): genes of each genome
+
+    Returns:
+        npt.NDArray[np.float64]: N×N genetic distances
+    """
+    arrays = [gene_arrays(genes=genes) for genes in gene_dicts]
+    innovations = np.unique(np.concatenate([ids for ids, _ in arrays]))
+
+    # Genes of each genome by column of innovation number
+    n_genomes = len(arrays)
+    present = np.zeros((n_genomes, len(innovations)), dtype=np.bool_)
+    values = np.zeros((n_genomes, len(innovations)))
+    columns: List[npt.NDArray[np.int64]] = []
+    for row, (ids, mutation_numbers) in enumerate(arrays):
+        columns.append(np.searchsorted(innovations, ids))
+        present[row, columns[row]] = True
+        values[row, columns[row]] = mutation_numbers
+
+    # Only the columns of a genome's genes can match
+    num_matching = np.empty((n_genomes, n_genomes), dtype=np.int64)
+    mutation_difference = np.empty((n_genomes, n_genomes))
+    for row, row_columns in enumerate(columns):
+        matching = present[:, row_columns]
+        num_matching[row] = matching.sum(axis=1)
+        mutation_difference[row] = (np.abs(values[row, row_columns] - values[:, row_columns])
+                                    * matching).sum(axis=1)
+
+    # Genes above the lowest of the two highest innovation numbers are in excess
+    sizes = present.sum(axis=1)
+    last = np.array([ids[-1] for ids, _ in arrays])
+    threshold_columns = np.searchsorted(innovations, np.minimum.outer(last, last))
+    below = np.take_along_axis(np.cumsum(present, axis=1), threshold_columns, axis=1)
+    num_excess = (sizes[:, np.newaxis] - below) + (sizes[np.newaxis, :] - below.T)
+
+    num_disjoint = sizes[:, np.newaxis] + sizes[np.newaxis, :] - 2 * num_matching - num_excess
+
+    return compatibility(num_excess=num_excess,
+                         num_disjoint=num_disjoint,
+                         mutation_difference=mutation_difference,
+                         num_matching=num_matching)
+
+
+def pairwise_compatibility(genomes: Sequence[Genome]) -> npt.NDArray[np.float64]:
+    """Function:
+        Calculate the genetic distance between all the pairs of genomes,
+        as Genome.genetic_distance does for one pair
+
+    Args:
+        genomes (Sequence[Genome]): genomes to compare
+
+    Returns:
+        npt.NDArray[np.float64]: N×N genetic distances
+    """
+    if not genomes:
+        return np.zeros((0, 0))
+
+    return (_pairwise_gene_distance(gene_dicts=[genome.node_genes for genome in genomes])
+          + _pairwise_gene_distance(gene_dicts=[genome.link_genes for genome in genomes]))
+
+
+class GenomeArrays:
+    """Class:
+        Genes of a genome stored in structured arrays,
+        one row per gene, mutated with masked array operations
+
+        Attributes:
+            links (npt.NDArray):            innovation, in/out node, weight and enabled flag of the LinkGenes
+            nodes (npt.NDArray):            id, type, bias and activation of the NodeGenes
+            link_genes (List[LinkGene]):    LinkGene of each row of links
+            node_genes (List[NodeGene]):    NodeGene of each row of nodes
+            _link_keys (npt.NDArray):       keys of the connected pairs of nodes, in both directions
+            _keys_sorted (bool):            whether the keys are sorted for searching
+            _mutated_links (npt.NDArray):   rows of links changed since creation
+            _mutated_nodes (npt.NDArray):   rows of nodes changed since creation
+
+        Methods:
+            add_link:           append a LinkGene
+            add_node:           append a NodeGene
+            disable_link:       disable the row of a LinkGene
+            link_exists:        check if a LinkGene connects two NodeGenes, in any direction
+            find_open_link:     draw pairs of NodeGenes until one is not connected yet
+            find_random_link:   choose a random enabled LinkGene
+            mutate_links:       mutate the weights and enabled flags of the LinkGenes
+            mutate_nodes:       mutate the biases and enabled flags of the NodeGenes
+            apply:              write the mutated rows back to their genes
+    """
+    KEY_SHIFT: int = 32
+
+    def __init__(self, link_genes: List[LinkGene], node_genes: List[NodeGene]):
+        """Constructor:
+            Store genes into structured arrays
+
+        Args:
+            link_genes (List[LinkGene]):    LinkGenes to store
+            node_genes (List[NodeGene]):    NodeGenes to store
+        """
+        self.link_genes: List[LinkGene] = link_genes                    # LinkGene of each row of links
+        self.node_genes: List[NodeGene] = node_genes                    # NodeGene of each row of nodes
+
+        n_links, n_nodes = len(link_genes), len(node_genes)
+
+        self._links: npt.NDArray = np.zeros(2 * n_links + 16,          # rows of LinkGenes, with room to grow
+                                            dtype=LINK_DTYPE)
+        self._links[:n_links] = np.fromiter(map(self._link_row, link_genes),
+                                            dtype=LINK_DTYPE,
+                                            count=n_links)
+        self._nodes: npt.NDArray = np.zeros(2 * n_nodes + 16,          # rows of NodeGenes, with room to grow
+                                            dtype=NODE_DTYPE)
+        self._nodes[:n_nodes] = np.fromiter(map(self._node_row, node_genes),
+                                            dtype=NODE_DTYPE,
+                                            count=n_nodes)
+
+        self._mutated_links: npt.NDArray = np.zeros(len(self._links),  # rows of links changed
+                                                    dtype=np.bool_)
+        self._mutated_nodes: npt.NDArray = np.zeros(len(self._nodes),  # rows of nodes changed
+                                                    dtype=np.bool_)
+
+        links = self.links
+        self._link_keys: npt.NDArray = np.zeros(2 * len(self._links),  # keys of the connected pairs
+                                                dtype=np.int64)
+        self._link_keys[:2 * n_links] = np.concatenate((
+                                    self._pair_keys(links['in_node'], links['out_node']),
+                                    self._pair_keys(links['out_node'], links['in_node'])))
+        self._keys_sorted: bool = False                                 # whether the keys are sorted
+
+    @property
+    def links(self) -> npt.NDArray:
+        """Property:
+            Return the rows of the LinkGenes
+
+        Returns:
+            npt.NDArray: rows of the LinkGenes
+        """
+        return self._links[:len(self.link_genes)]
+
+    @property
+    def nodes(self) -> npt.NDArray:
+        """Property:
+            Return the rows of the NodeGenes
+
+        Returns:
+            npt.NDArray: rows of the NodeGenes
+        """
+        return self._nodes[:len(self.node_genes)]
+
+    @staticmethod
+    def _grow(array: npt.NDArray) -> npt.NDArray:
+        """Private static method:
+            Return a copy of the array with twice its length
+
+        Args:
+            array (npt.NDArray): array to grow
+
+        Returns:
+            npt.NDArray: grown array
+        """
+        grown = np.zeros(2 * len(array), dtype=array.dtype)
+        grown[:len(array)] = array
+
+        return grown
+
+    @classmethod
+    def from_genome(cls, genome: Genome) -> GenomeArrays:
+        """Class method:
+            Store the genes of a genome into structured arrays
+
+        Args:
+            genome (Genome): genome to store
+
+        Returns:
+            GenomeArrays: arrays of the genome's genes
+        """
+        return cls(link_genes=list(genome.link_genes.values()),
+                   node_genes=list(genome.node_genes.values()))
+
+    @staticmethod
+    def _pair_keys(in_nodes: npt.NDArray[np.int64],
+                   out_nodes: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+        """Private static method:
+            Encode pairs of node ids as single keys
+
+        Args:
+            in_nodes (npt.NDArray[np.int64]):   ids of the incoming nodes
+            out_nodes (npt.NDArray[np.int64]):  ids of the outgoing nodes
+
+        Returns:
+            npt.NDArray[np.int64]: keys of the pairs
+        """
+        return (np.asarray(in_nodes, dtype=np.int64) << GenomeArrays.KEY_SHIFT) | out_nodes
+
+    def _are_linked(self, in_nodes: npt.NDArray[np.int64],
+                    out_nodes: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
+        """Private method:
+            Check which pairs of nodes are connected, in any direction
+
+        Args:
+            in_nodes (npt.NDArray[np.int64]):   ids of the first nodes
+            out_nodes (npt.NDArray[np.int64]):  ids of the second nodes
+
+        Returns:
+            npt.NDArray[np.bool_]: whether each pair is connected
+        """
+        link_keys = self._link_keys[:2 * len(self.link_genes)]
+        if not self._keys_sorted:
+            link_keys.sort()
+            self._keys_sorted = True
+
+        keys = self._pair_keys(in_nodes, out_nodes)
+        found = np.searchsorted(link_keys, keys)
+
+        return (link_keys.take(found, mode='clip') == keys) & (found < len(link_keys))
+
+    @staticmethod
+    def _link_row(link: LinkGene) -> Tuple:
+        return (link.id, link.in_node, link.out_node, link.weight,
+                link.mutation_number, link.enabled, link.frozen)
+
+    @staticmethod
+    def _node_row(node: NodeGene) -> Tuple:
+        activation = getattr(node.activation_function, 'func', node.activation_function)
+        code = (ACTIVATION_FUNCTIONS.index(activation)
+                if activation in ACTIVATION_FUNCTIONS else -1)
+
+        return (node.id, node.type.value, node.bias, code,
+                node.enabled, node.frozen)
+
+    def add_link(self, link: LinkGene) -> None:
+        """Public method:
+            Append a LinkGene
+
+        Args:
+            link (LinkGene): LinkGene to append
+        """
+        row = len(self.link_genes)
+        if row == len(self._links):
+            self._links = self._grow(array=self._links)
+            self._mutated_links = self._grow(array=self._mutated_links)
+            self._link_keys = self._grow(array=self._link_keys)
+
+        self.link_genes.append(link)
+        self._links[row] = self._link_row(link)
+
+        self._link_keys[2 * row] = (link.in_node << GenomeArrays.KEY_SHIFT) | link.out_node
+        self._link_keys[2 * row + 1] = (link.out_node << GenomeArrays.KEY_SHIFT) | link.in_node
+        self._keys_sorted = False
+
+    def add_node(self, node: NodeGene) -> None:
+        """Public method:
+            Append a NodeGene
+
+        Args:
+            node (NodeGene): NodeGene to append
+        """
+        row = len(self.node_genes)
+        if row == len(self._nodes):
+            self._nodes = self._grow(array=self._nodes)
+            self._mutated_nodes = self._grow(array=self._mutated_nodes)
+
+        self.node_genes.append(node)
+        self._nodes[row] = self._node_row(node)
+
+    def disable_link(self, link: LinkGene) -> None:
+        """Public method:
+            Disable the row of a LinkGene, already disabled in the gene
+
+        Args:
+            link (LinkGene): disabled LinkGene
+        """
+        links = self.links
+        links['enabled'][links['innovation'] == link.id] = False
+
+    def link_exists(self, node1: int, node2: int) -> bool:
+        """Public method:
+            Check if a LinkGene connects two NodeGenes, in any direction
+
+        Args:
+            node1 (int): id of the first NodeGene
+            node2 (int): id of the second NodeGene
+
+        Returns:
+            bool: True if such a LinkGene exists
+        """
+        return bool(self._are_linked(in_nodes=np.array([node1]),
+                                     out_nodes=np.array([node2]))[0])
+
+    def find_open_link(self, in_nodes: npt.NDArray[np.int64], out_nodes: npt.NDArray[np.int64],
+                       tries: int) -> Tuple[Optional[int], Optional[int]]:
+        """Public method:
+            Draw all the tries at once and keep the first pair
+            of distinct NodeGenes not connected in any direction
+
+        Args:
+            in_nodes (npt.NDArray[np.int64]):   ids of the possible incoming NodeGenes
+            out_nodes (npt.NDArray[np.int64]):  ids of the possible outgoing NodeGenes
+            tries (int):                        number of pairs to draw
+
+        Returns:
+            Tuple[Optional[int], Optional[int]]: ids of the NodeGenes, None if every try failed
+        """
+        ins = np.random.choice(in_nodes, tries)
+        outs = np.random.choice(out_nodes, tries)
+
+        valid = (ins != outs) & ~self._are_linked(in_nodes=ins,
+                                                  out_nodes=outs)
+        if not valid.any():
+            return None, None
+
+        first = valid.argmax()
+
+        return int(ins[first]), int(outs[first])
+
+    def find_random_link(self) -> Optional[LinkGene]:
+        """Public method:
+            Choose a random enabled LinkGene
+
+        Returns:
+            Optional[LinkGene]: LinkGene chosen, None if all are disabled
+        """
+        enabled = np.flatnonzero(self.links['enabled'])
+        if not enabled.size:
+            return None
+
+        return self.link_genes[choice(enabled)]
+
+    def mutate_links(self, settings: Optional[Mapping[str, Any]] = None) -> None:
+        """Public method:
+            Mutate the LinkGenes chosen with probability link_mutate_prob,
+            as LinkGene.mutate does for each of them
+
+        Args:
+            settings (Optional[Mapping[str, Any]], optional): NEAT settings, the configuration's if None. Defaults to None.
+        """
+        settings = settings if settings is not None else config["NEAT"]
+        links = self.links
+        draws = np.random.random((4, len(links)))
+
+        mutated = ~links['frozen'] & (draws[0] < settings["link_mutate_prob"])
+
+        # link is being reset
+        reset = mutated & (draws[1] < settings["new_link_prob"])
+        links['weight'][reset] = np.random.uniform(-1, 1, np.count_nonzero(reset))
+
+        # value is being added to current weight,
+        # associated to the mutation number
+        shifted = mutated & ~reset
+        links['weight'][shifted] += (np.random.uniform(-1, 1, np.count_nonzero(shifted))
+                                     * settings["weight_mutate_power"])
+        links['mutation_number'][shifted] = links['weight'][shifted]
+
+        self._mutate_enabled(genes=links,
+                             mutated=mutated,
+                             draws=draws[2:],
+                             settings=settings)
+
+        self._mutated_links[:len(links)] |= mutated
+
+    def mutate_nodes(self, settings: Optional[Mapping[str, Any]] = None) -> None:
+        """Public method:
+            Mutate the NodeGenes chosen with probability node_mutate_prob,
+            as NodeGene.mutate does for each of them
+
+        Args:
+            settings (Optional[Mapping[str, Any]], optional): NEAT settings, the configuration's if None. Defaults to None.
+        """
+        settings = settings if settings is not None else config["NEAT"]
+        nodes = self.nodes
+        draws = np.random.random((4, len(nodes)))
+
+        mutated = ~nodes['frozen'] & (draws[0] < settings["node_mutate_prob"])
+
+        # modify bias value
+        sensors = np.isin(nodes['type'], (NodeType.INPUT.value, NodeType.BIAS.value))
+        reset = mutated & ~sensors & (draws[1] < settings["mutate_bias_prob"])
+        nodes['bias'][reset] = np.random.uniform(-1, 1, np.count_nonzero(reset))
+
+        self._mutate_enabled(genes=nodes,
+                             mutated=mutated,
+                             draws=draws[2:],
+                             settings=settings)
+
+        self._mutated_nodes[:len(nodes)] |= mutated
+
+    @staticmethod
+    def _mutate_enabled(genes: npt.NDArray, mutated: npt.NDArray[np.bool_],
+                        draws: npt.NDArray[np.float64], settings: Mapping[str, Any]) -> None:
+        """Private static method:
+            Disable the mutated genes with probability disable_prob,
+            enable the others with probability enable_prob
+
+        Args:
+            genes (npt.NDArray):                rows of genes
+            mutated (npt.NDArray[np.bool_]):    mask of the mutated rows
+            draws (npt.NDArray[np.float64]):    2×n random draws
+            settings (Mapping[str, Any]):       NEAT settings
+        """
+        disabled = mutated & (draws[0] < settings["disable_prob"])
+        enabled = mutated & ~disabled & (draws[1] < settings["enable_prob"])
+
+        genes['enabled'][disabled] = False
+        genes['enabled'][enabled] = True
+
+    def apply(self) -> None:
+        """Public method:
+            Write the mutated rows back to their genes
+        """
+        for row in np.flatnonzero(self._mutated_links):
+            link, values = self.link_genes[row], self.links[row]
+            link.weight = float(values['weight'])
+            link.mutation_number = float(values['mutation_number'])
+            link.enabled = bool(values['enabled'])
+
+        for row in np.flatnonzero(self._mutated_nodes):
+            node, values = self.node_genes[row], self.nodes[row]
+            node.bias = float(values['bias'])
+            node.enabled = bool(values['enabled'])
+
+        self._mutated_links[:] = False
+        self._mutated_nodes[:] = False
+
 class Genome:
     """Class:
         Genotype containing the information to build a network
@@ -20,6 +505,7 @@ class Genome:
             _node_genes (Dict[int, NodeGene]):  dictionary of NodeGenes
             _link_genes (Dict[int, LinkGene]):  dictionary of LinkGenes
             complete (bool):                    whether the network is fully connected
+            _arrays (Optional[GenomeArrays]):   genes stored in arrays while mutating
 
         Methods:
             add_link:       Add a LinkGene to the dictionary of LinkGenes
@@ -54,6 +540,7 @@ class Genome:
         self.complete = complete                                    # wheter the network is fully connected
         self.n_inputs = n_inputs                                    # number of input nodes
         self.n_outputs = n_outputs                                  # number of output nodes
+        self._arrays: Optional[GenomeArrays] = None                 # genes stored in arrays while mutating
 
     @property
     def id(self) -> int:
@@ -102,6 +589,8 @@ class Genome:
             link (LinkGene): LinkGene to add
         """
         self.link_genes[link.id] = link
+        if self._arrays is not None:
+            self._arrays.add_link(link=link)
 
     def add_node(self, node: NodeGene) -> None:
         """Public method:
@@ -111,6 +600,8 @@ class Genome:
             link (NodeGene): NodeGene to add
         """
         self.node_genes[node.id] = node
+        if self._arrays is not None:
+            self._arrays.add_node(node=node)
 
     @staticmethod
     def insert_gene(genes_dict: Dict[int, Gene],
@@ -145,7 +636,9 @@ class Genome:
         return set(self.node_genes.values())
 
     @classmethod
-    def genesis(cls, genome_id: int, genome_data: Dict[str, Any]) -> Genome:
+    def genesis(cls, genome_id: int, genome_data: Dict[str, Any],
+                settings: Optional[Mapping[str, Any]] = None,
+                innov_table: Optional[InnovTable] = None) -> Genome:
         """Constructor:
             Initialize a genome based on configuration.
             Create the input GeneNodes, output GeneNodes and
@@ -154,10 +647,14 @@ class Genome:
         Args:
             genome_id (int):                id of the genome to initialize
             genome_data (Dict[str, Any]):   contain the brain's genome information
+            settings (Optional[Mapping[str, Any]], optional): NEAT settings, the configuration's if None. Defaults to None.
+            innov_table (Optional[InnovTable], optional):   table numbering the innovations, the default one if None. Defaults to None.
 
         Returns:
             Genome: genome created
         """
+        settings = settings if settings is not None else config["NEAT"]
+        innov_table = innov_table if innov_table is not None else default_innov_table
 
         complete: bool = genome_data.get('complete', True)
         n_inputs: int = genome_data['n_inputs']
@@ -209,7 +706,7 @@ class Genome:
                 count_link_id += 1
 
                 if  (not complete
-                 and random() < config["NEAT"]["skip_connection"]):
+                 and random() < settings["skip_connection"]):
                     continue
 
                 links = Genome.insert_gene(genes_dict=links,
@@ -226,8 +723,8 @@ class Genome:
 
         # Set the innovation tables to the number
         # of links and nodes craeted
-        InnovTable.node_number = count_node_id + 1
-        InnovTable.link_number = count_link_id + 1
+        innov_table.node_number = count_node_id + 1
+        innov_table.link_number = count_link_id + 1
 
         genome = cls(genome_id=genome_id,
                      node_genes=inputs|outputs,
@@ -317,107 +814,128 @@ class Genome:
         Returns:
             float: calculated genetic distance
         """
-        # Find the maximum innovation numbers for each genome
-        max_g1: int = max(gene_dict1.keys())
-        max_g2: int = max(gene_dict2.keys())
+        ids1, mutation_numbers1 = gene_arrays(genes=gene_dict1)
+        ids2, mutation_numbers2 = gene_arrays(genes=gene_dict2)
 
-        # Order the genomes depending on which has the highest innovation number
-        if max_g1 > max_g2:
-           big_genome, small_genome = gene_dict1, gene_dict2
-        else:
-            small_genome, big_genome = gene_dict1, gene_dict2
-
-        # Threshold above which genes are in excess in the big genome
-        # (meaning all ids above this threshold are above
-        # the max ids from the small genome)
-        excess_threshold: int = min(max_g1, max_g2)
-
-        num_excess: int = 0               # number of excess genes
-        num_disjoint: int = 0             # number of disjoint genes
-        num_matching: int = 0             # number of matching genes
-        mutation_difference: float = 0.0  # total mutation difference
-
-        # Loop through all the genes from the big genome
-        for node_id, gene_node in big_genome.items():
-            # genes with ids above the threshold are excess genes
-            if node_id > excess_threshold:
-                num_excess += 1
-            # genes present only in the big genome
-            # below the excess threshold are disjoint
-            elif node_id not in small_genome:
-                num_disjoint += 1
-            # deal with genes present in both genomes
-            elif node_id in small_genome:
-                num_matching += 1
-                other_node = small_genome[node_id]
-                # Calculate the mutation difference between same innovation genes
-                mutation_difference += gene_node.mutation_distance(other_gene=other_node)
-
-        # Add the disjoint genes present in small genome
-        # but not in the big genome,
-        # obtained by subtracting the number of matching genome
-        # from the total size of genome
-        num_disjoint += len(small_genome) - num_matching
-
-        # Calulate the final genetic distance by applying formula,
-        # with coefficient from settings
-        genetic_distance: float = (num_excess * config["NEAT"]["excess_coeff"]
-                                 + num_disjoint * config["NEAT"]["disjoint_coeff"]
-                                 + config["NEAT"]["mutation_difference_coeff"]
-                                    * mutation_difference/max(num_matching, 1))
-
-        return genetic_distance
-
-
-    def crossover_mutate(self) -> None:
+        # Genes above the highest innovation number
+        # of the other genome are in excess
+        excess_threshold: int = min(ids1[-1], ids2[-1])
+        num_excess: int = (np.count_nonzero(ids1 > excess_threshold)
+                         + np.count_nonzero(ids2 > excess_threshold))
+
+        # Merge-join of the sorted innovation numbers
+        _, rows1, rows2 = np.intersect1d(ids1, ids2,
+                                         assume_unique=True,
+                                         return_indices=True)
+        num_matching: int = len(rows1)
+
+        # Genes present in only one genome below the threshold are disjoint
+        num_disjoint: int = len(ids1) + len(ids2) - 2 * num_matching - num_excess
+
+        # Mutation difference between same innovation genes
+        mutation_difference: float = np.abs(mutation_numbers1[rows1]
+                                          - mutation_numbers2[rows2]).sum()
+
+        return compatibility(num_excess=num_excess,
+                             num_disjoint=num_disjoint,
+                             mutation_difference=mutation_difference,
+                             num_matching=num_matching)
+
+
+    def crossover_mutate(self, difficulty: Optional[float] = None,
+                         settings: Optional[Mapping[str, Any]] = None,
+                         innov_table: Optional[InnovTable] = None) -> None:
+        """Public method:
+            Mutate a newborn genome, many times over
+            with probability turbo_prob when the difficulty is low
+
+        Args:
+            difficulty (Optional[float], optional):             difficulty of the simulation,
+                                                                the configuration's if None. Defaults to None.
+            settings (Optional[Mapping[str, Any]], optional):   NEAT settings, the configuration's if None. Defaults to None.
+            innov_table (Optional[InnovTable], optional):       table numbering the innovations, the default one if None. Defaults to None.
+        """
+        difficulty = difficulty if difficulty is not None else config['Simulation']['difficulty_level']
+        settings = settings if settings is not None else config['NEAT']
         if (
                 (
-                config['Simulation']['difficulty_level']
-             <= config['NEAT']['turbo_threshold']
+                difficulty
+             <= settings['turbo_threshold']
                 )
-            and random() < config['NEAT']['turbo_prob']
+            and random() < settings['turbo_prob']
             ):
 
-            factor = config['NEAT']['turbo_factor']
+            factor = settings['turbo_factor']
 
         else:
             factor = 1
 
-        self.mutate(factor=factor)
+        self.mutate(factor=factor,
+                    settings=settings,
+                    innov_table=innov_table)
 
-    def mutate(self, factor: int) -> None:
+    def mutate(self, factor: int, settings: Optional[Mapping[str, Any]] = None,
+               innov_table: Optional[InnovTable] = None) -> None:
         """Public method:
-            Mutate the genome
+            Mutate the genome, on the genes stored in arrays
+            if vectorized_mutation is set
+
+        Args:
+            factor (int):                                       number of rounds of structural mutations
+            settings (Optional[Mapping[str, Any]], optional):   NEAT settings, the configuration's if None. Defaults to None.
+            innov_table (Optional[InnovTable], optional):       table numbering the innovations, the default one if None. Defaults to None.
         """
+        settings = settings if settings is not None else config["NEAT"]
+        innov_table = innov_table if innov_table is not None else default_innov_table
+        vectorized = settings["vectorized_mutation"]
+        if vectorized:
+            self._arrays = GenomeArrays.from_genome(genome=self)
+
         for _ in range(factor):
             # Add a node to the genome
-            if random() < config["NEAT"]["add_node_prob"]:
-                self._mutate_add_node()
+            if random() < settings["add_node_prob"]:
+                self._mutate_add_node(innov_table=innov_table)
             # Add a link to the genome
             for _ in range(0, 5):
-                if random() < config["NEAT"]["add_link_prob"]:
-                    self._mutate_add_link(tries=config["NEAT"]["add_link_tries"])
+                if random() < settings["add_link_prob"]:
+                    self._mutate_add_link(tries=settings["add_link_tries"],
+                                          innov_table=innov_table)
 
         # Modify the weights of the links
         # and their enabled status
-        self._mutate_links()
-        self._mutate_nodes()
+        if vectorized:
+            self._arrays.mutate_links(settings=settings)
+            self._arrays.mutate_nodes(settings=settings)
+            self._arrays.apply()
+            self._arrays = None
+
+        else:
+            self._mutate_links(settings=settings)
+            self._mutate_nodes(settings=settings)
 
-    def _mutate_links(self) -> None:
+    def _mutate_links(self, settings: Optional[Mapping[str, Any]] = None) -> None:
         """Private method:
             mutate the LinkGenes
+
+        Args:
+            settings (Optional[Mapping[str, Any]], optional): NEAT settings, the configuration's if None. Defaults to None.
         """
+        settings = settings if settings is not None else config["NEAT"]
         for link in self.get_link_genes():
-            if random() < config["NEAT"]["link_mutate_prob"]:
-                link.mutate()
+            if random() < settings["link_mutate_prob"]:
+                link.mutate(settings=settings)
 
-    def _mutate_nodes(self) -> None:
+    def _mutate_nodes(self, settings: Optional[Mapping[str, Any]] = None) -> None:
         """Private method:
             mutate the NodeGenes
+
+        Args:
+            settings (Optional[Mapping[str, Any]], optional): NEAT settings, the configuration's if None. Defaults to None.
         """
+        settings = settings if settings is not None else config["NEAT"]
         for node in self.get_node_genes():
-            if random() < config["NEAT"]["node_mutate_prob"]:
-                node.mutate()
+            if random() < settings["node_mutate_prob"]:
+                node.mutate(settings=settings)
 
     def _find_random_link(self) -> Optional[LinkGene]:
         """Pivate method:
@@ -426,6 +944,9 @@ class Genome:
         Returns:
             LinkGene: LinkGene containing the NodeGene to mutate
         """
+        if self._arrays is not None:
+            return self._arrays.find_random_link()
+
         enabled_links = [link for link in self.get_link_genes() if link.enabled]
 
         if enabled_links:
@@ -470,12 +991,14 @@ class Genome:
 
         return new_node, new_link1, new_link2
 
-    def _new_node_innovation(self, old_link: LinkGene) -> Tuple[NodeGene, LinkGene, LinkGene]:
+    def _new_node_innovation(self, old_link: LinkGene,
+                             innov_table: InnovTable) -> Tuple[NodeGene, LinkGene, LinkGene]:
         """Private method:
             Check to see if this innovation has already been done in another genome
 
         Args:
-            old_link (LinkGene): LinkGene which innovation to check
+            old_link (LinkGene):        LinkGene which innovation to check
+            innov_table (InnovTable):   table numbering the innovations
 
         Returns:
             Tuple[Node, LinkGene, LinkGene]:    NodeGene: new NodeGene created
@@ -489,7 +1012,7 @@ class Genome:
         in_node: int = old_link.in_node
         out_node: int = old_link.out_node
 
-        the_innovation = InnovTable.get_innovation( in_node=in_node,
+        the_innovation = innov_table.get_innovation(in_node=in_node,
                                                     out_node=out_node,
                                                     innovation_type=InnovationType.NEW_NODE,
                                                     old_innovation_number=old_link.id)
@@ -503,10 +1026,14 @@ class Genome:
 
         return  new_node, new_link1, new_link2
 
-    def _mutate_add_node(self) -> bool:
+    def _mutate_add_node(self, innov_table: Optional[InnovTable] = None) -> bool:
         """Private method:
             Mutate genome by adding a NodeGene
 
+        Args:
+            innov_table (Optional[InnovTable], optional): table numbering the innovations,
+                                                          the default one if None. Defaults to None.
+
         Returns:
             bool: True if mutation was successful
                   False if failure
@@ -519,8 +1046,13 @@ class Genome:
 
         # Disabled the old link
         link.enabled = False
+        if self._arrays is not None:
+            self._arrays.disable_link(link=link)
 
-        new_node, new_link1, new_link2 = self._new_node_innovation(old_link=link)
+        new_node, new_link1, new_link2 = self._new_node_innovation(
+                                            old_link=link,
+                                            innov_table=(innov_table if innov_table is not None
+                                                         else default_innov_table))
 
         # Add the new NodeGene and
         # the two new LinkGenes
@@ -543,6 +1075,10 @@ class Genome:
             bool: True if a similar LinkGene already exists
                   False if it's novel
         """
+        if self._arrays is not None:
+            return self._arrays.link_exists(node1=node1.id,
+                                            node2=node2.id)
+
         for link in self.get_link_genes():
             if (
                 (
@@ -558,18 +1094,20 @@ class Genome:
 
         return False
 
-    def _new_link_gene(self, in_node: NodeGene, out_node: NodeGene) -> LinkGene:
+    def _new_link_gene(self, in_node: NodeGene, out_node: NodeGene,
+                       innov_table: InnovTable) -> LinkGene:
         """Private method:
             Create a new LinkGene between two NodeGenes, and return it
 
         Args:
-            in_node (NodeGene):     incoming NodeGene
-            out_node (NodeGene):    outgoing NodeGene
+            in_node (NodeGene):         incoming NodeGene
+            out_node (NodeGene):        outgoing NodeGene
+            innov_table (InnovTable):   table numbering the innovations
 
         Returns:
             LinkGene: newly created LinkGene
         """
-        the_innovation = InnovTable.get_innovation( in_node=in_node.id,
+        the_innovation = innov_table.get_innovation(in_node=in_node.id,
                                                     out_node=out_node.id,
                                                     innovation_type=InnovationType.NEW_LINK)
 
@@ -620,8 +1158,20 @@ class Genome:
         """
         in_nodes = list(range(1, self.n_inputs + 1))
         hidden_threshold = self.n_inputs + 1 + self.n_outputs
-        hiddens =  [i for i in self.node_genes if i > hidden_threshold]
         out_nodes = list(range(self.n_inputs + 1, hidden_threshold))
+
+        if self._arrays is not None:
+            node_ids = self._arrays.nodes['id']
+            hiddens = node_ids[node_ids > hidden_threshold].tolist()
+            node1, node2 = self._arrays.find_open_link(in_nodes=np.array(in_nodes + hiddens),
+                                                       out_nodes=np.array(hiddens + out_nodes),
+                                                       tries=tries)
+            if node1 is None:
+                return None, None
+
+            return self.node_genes[node1], self.node_genes[node2]
+
+        hiddens =  [i for i in self.node_genes if i > hidden_threshold]
         # Try until it's time to give up
         for _ in range(tries):
             # Select two NodeGenes at random
@@ -641,13 +1191,16 @@ class Genome:
 
         return None, None
 
-    def _mutate_add_link(self, tries: int=20) -> bool:
+    def _mutate_add_link(self, tries: int=20,
+                         innov_table: Optional[InnovTable] = None) -> bool:
         """Private method:
             Mutate the genome by adding a new LinkGene
             between 2 random NodeGenes
 
         Args:
-            tries (int): Amount of tries before giving up
+            tries (int):                                    Amount of tries before giving up
+            innov_table (Optional[InnovTable], optional):   table numbering the innovations,
+                                                            the default one if None. Defaults to None.
 
         Returns:
             bool: True if mutation was successful
@@ -659,7 +1212,9 @@ class Genome:
         # Continue only if an open link was found
         if node1 and node2:
             new_link = self._new_link_gene(in_node=node1,
-                                           out_node=node2)
+                                           out_node=node2,
+                                           innov_table=(innov_table if innov_table is not None
+                                                        else default_innov_table))
 
             self.add_link(new_link)
             return True
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import enum
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
+import numpy as np
+import numpy.typing as npt
 from numpy.random import choice, random
 
 
@@ -13,171 +15,286 @@ class InnovationType(enum.Enum):
     NEW_NODE = "new_node"
     NEW_LINK = "new_link"
 
-class InnovTableProperties(type):
-    """Meta class:
-        Containt the information properties of InnovTable
+INNOVATION_TYPES: Tuple[InnovationType, ...] = (InnovationType.NEW_NODE, InnovationType.NEW_LINK)
+
+# Compact record of an innovation, the type is its index in INNOVATION_TYPES
+INNOVATION_DTYPE = np.dtype([('type', np.int8),
+                             ('in_node', np.int64),
+                             ('out_node', np.int64),
+                             ('innovation_number1', np.int64),
+                             ('innovation_number2', np.int64),
+                             ('old_innovation_number', np.int64),
+                             ('new_node_id', np.int64),
+                             ('weight', np.float64)])
+
+InnovationKey = Tuple[InnovationType, int, int]
+
+class InnovTable:
+    """Class:
+        Keep track of innovations through a simulation,
+        each simulation numbering its own innovations
+
+    Attributes:
+        innovations (Dict[InnovationKey, Innovation]):  innovations by type, incoming and outgoing node,
+                                                        in order of creation
+        _node_number (int):                             current node number
+        _link_number (int):                             current link number
+        stride (int):                                   step between the numbers created,
+                                                        to share them between tables
+        offset (int):                                   remainder of the numbers created by the stride
+
+    Methods:
+        get_link_number:        Get the current link number
+        increment_link:         Increment the current link number by a given amount
+        get_node_number:        Get the current node number
+        increment_node:         Increment the current node number by a given amount
+        add_innovation:         Add an innovation to the history's list of innovations
+        reset_innovation_table: Reset the values of the innovation table
+        set_numbering:          Create numbers of their own, interleaved with other tables'
+        align_number:           Round a number up to the numbers created by the table
+        merge_innovations:      Add the innovations of another table unknown to this one
+        export_innovations:     Export the history as an array of compact records
+        import_innovations:     Rebuild the history from an array of compact records
+        load_innovations_infos: Load the information for the innovation table
+        get_innovation:         Look if innovation already exists in table else create new one
+
     """
-    _instances = {}
-    def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super().__call__(*args, **kwargs)
-        return cls._instances[cls]
+    def __init__(self):
+        """Constructor:
+            Create an empty innovation table
+        """
+        self.innovations: Dict[InnovationKey, Innovation] = {}  # innovations by type and nodes
+        self._node_number: int = 1                              # current node number
+        self._link_number: int = 1                              # current link number
+        self.stride: int = 1                                    # step between the numbers created
+        self.offset: int = 0                                    # remainder of the numbers by the stride
 
     @property
-    def node_number(cls) -> int:
+    def node_number(self) -> int:
         """Poperty:
             return the number of nodes already existing
 
         Returns:
             int: number of nodes already existing
         """
-        return cls._node_number
+        return self._node_number
 
     @node_number.setter
-    def node_number(cls, value: int) -> None:
+    def node_number(self, value: int) -> None:
         """Setter:
             Set the node number to the given value
-            if it's not below the current number
+            if it's not below the current number,
+            rounded up to the numbers of the table
 
         Args:
             value (int): new node number
         """
-        cls._node_number = max(cls.node_number, value)
+        self._node_number = self.align_number(max(self.node_number, value))
 
     @property
-    def link_number(cls) -> int:
+    def link_number(self) -> int:
         """Poperty:
             return the number of links already existing
 
         Returns:
             int: number of links already existing
         """
-        return cls._link_number
+        return self._link_number
 
     @link_number.setter
-    def link_number(cls, value: int) -> None:
+    def link_number(self, value: int) -> None:
         """Setter:
             Set the link number to the given value
-            if it's not below the current number
+            if it's not below the current number,
+            rounded up to the numbers of the table
 
         Args:
             value (int): new link number
         """
-        cls._link_number = max(cls.link_number, value)
-
-class InnovTable(metaclass=InnovTableProperties):
-    """Static class:
-        Keep track of innovations through the simulation
-
-    Attributes:
-        _node_number (int): current node number
-        _link_number (int): current link number
-
-    Static methods:
-        get_link_number:        Get the current link number
-        increment_link:         Increment the current link number by a given amount
-        get_node_number:        Get the current node number
-        increment_node:         Increment the current node number by a given amount
-        add_innovation:         Add an innovation to the history's list of innovations
-        reset_innovation_table: Reset the values of the innovation table
-        get_innovation:         Look if innovation already exists in table else create new one
-
-    """
-    innovations: Dict = {
-                            "new_node":{},
-                            "new_link":{},
-                        }
-
-    _node_number: int = 1
-    _link_number: int = 1
-
+        self._link_number = self.align_number(max(self.link_number, value))
 
-    @staticmethod
-    def get_link_number(increment: bool=False) -> int:
-        """Static method:
+    def get_link_number(self, increment: bool=False) -> int:
+        """Public method:
             Get the current link number
 
         Returns:
             int: current link number
         """
-        number = InnovTable._link_number
+        number = self._link_number
 
         if increment:
-            InnovTable.increment_link()
+            self.increment_link()
 
         return number
 
-    @staticmethod
-    def increment_link(amount: int=1) -> None:
-        """Static method:
+    def increment_link(self, amount: int=1) -> None:
+        """Public method:
             Increment the current link number by a given amount
 
         Args:
             number (int, optional): link number's increment. Defaults to 1.
         """
-        InnovTable._link_number += amount
+        self._link_number += amount * self.stride
 
-    @staticmethod
-    def get_node_number(increment: bool=False) -> int:
-        """Static method:
+    def get_node_number(self, increment: bool=False) -> int:
+        """Public method:
             Get the current node number
 
         Returns:
             int: current node number
         """
-        number = InnovTable._node_number
+        number = self._node_number
 
         if increment:
-            InnovTable.increment_node()
+            self.increment_node()
 
         return number
 
-    @staticmethod
-    def increment_node(amount: int=1) -> None:
-        """Static method:
+    def increment_node(self, amount: int=1) -> None:
+        """Public method:
             Increment the current node number by a given amount
 
         Args:
             number (int, optional): node number's increment. Defaults to 1.
         """
-        InnovTable._node_number += amount
+        self._node_number += amount * self.stride
 
-    @staticmethod
-    def add_innovation(new_innovation: Innovation) -> None:
-        """Static method:
+    def add_innovation(self, new_innovation: Innovation) -> None:
+        """Public method:
             Add an innovation to the history's list of innovations
 
         Args:
             new_innovation (Innovation): innovation to add to the list
         """
-        InnovTable.innovations[new_innovation.innovation_type.value].setdefault(new_innovation.node_in_id, []).append(new_innovation)
-        
-    @staticmethod
-    def reset_innovation_table() -> None:
-        """Static method:
+        key = (new_innovation.innovation_type, new_innovation.node_in_id, new_innovation.node_out_id)
+        self.innovations.setdefault(key, new_innovation)
+
+    def reset_innovation_table(self) -> None:
+        """Public method:
             Reset the values of the innovation table
         """
-        InnovTable.innovations = {
-                                    "new_node":{},
-                                    "new_link":{},
-                                }
-        InnovTable._node_number = 1
-        InnovTable._link_number = 1
-
-    @staticmethod
-    def load_innovations_infos(**infos) -> None:
-        """Static method:
-            Load the information for the innovation table
+        self.innovations = {}
+        self._node_number = self.align_number(number=1)
+        self._link_number = self.align_number(number=1)
+
+    def set_numbering(self, stride: int, offset: int) -> None:
+        """Public method:
+            Create numbers of their own, interleaved with the ones of other tables
+            evolving apart, so that the innovations of all of them can be merged
+
+        Args:
+            stride (int):   number of tables sharing the numbers
+            offset (int):   index of this table, below the stride
+        """
+        self.stride = stride
+        self.offset = offset
+        self._node_number = self.align_number(number=self._node_number)
+        self._link_number = self.align_number(number=self._link_number)
+
+    def align_number(self, number: int) -> int:
+        """Public method:
+            Round a number up to the next one created by the table
+
+        Args:
+            number (int): number to round
+
+        Returns:
+            int: smallest number created by the table not below it
         """
-        InnovTable.innovations = infos['innovations']
-        InnovTable.node_number = infos['node_number']
-        InnovTable.link_number = infos['link_number']
+        return number + (self.offset - number) % self.stride
+
+    def merge_innovations(self, records: npt.NDArray) -> int:
+        """Public method:
+            Add the innovations of another table unknown to this one,
+            an innovation created by both keeps the number given here
 
+        Args:
+            records (npt.NDArray): INNOVATION_DTYPE records exported by the other table
+
+        Returns:
+            int: number of innovations added
+        """
+        n_innovations = len(self.innovations)
+        for (type_index, in_node, out_node, number1,
+             number2, old_number, node_id, weight) in records.tolist():
+            innovation_type = INNOVATION_TYPES[type_index]
+            self.innovations.setdefault((innovation_type, in_node, out_node),
+                                        Innovation(node_in_id=in_node,
+                                                   node_out_id=out_node,
+                                                   innovation_type=innovation_type,
+                                                   innovation_number1=number1,
+                                                   innovation_number2=number2,
+                                                   old_innovation_number=old_number,
+                                                   new_node_id=node_id,
+                                                   new_weight=weight))
+
+        return len(self.innovations) - n_innovations
+
+    def export_innovations(self) -> npt.NDArray:
+        """Public method:
+            Export the history of innovations as an array of compact records,
+            in order of creation
 
-    @staticmethod
-    def _check_innovation_already_exists(innovation_type: InnovationType,
+        Returns:
+            npt.NDArray: one INNOVATION_DTYPE record per innovation
+        """
+        return np.array([(INNOVATION_TYPES.index(innovation.innovation_type),
+                          innovation.node_in_id,
+                          innovation.node_out_id,
+                          innovation.innovation_number1,
+                          innovation.innovation_number2,
+                          innovation.old_innovation_number,
+                          innovation.new_node_id,
+                          innovation.weight)
+                         for innovation in self.innovations.values()],
+                        dtype=INNOVATION_DTYPE)
+
+    def import_innovations(self, records: npt.NDArray) -> None:
+        """Public method:
+            Rebuild the history of innovations and its index
+            from an array of compact records in one pass
+
+        Args:
+            records (npt.NDArray): INNOVATION_DTYPE records, in order of creation
+        """
+        innovations = {}
+        for (type_index, in_node, out_node, number1,
+             number2, old_number, node_id, weight) in records.tolist():
+            innovation_type = INNOVATION_TYPES[type_index]
+            innovations.setdefault((innovation_type, in_node, out_node),
+                                   Innovation(node_in_id=in_node,
+                                              node_out_id=out_node,
+                                              innovation_type=innovation_type,
+                                              innovation_number1=number1,
+                                              innovation_number2=number2,
+                                              old_innovation_number=old_number,
+                                              new_node_id=node_id,
+                                              new_weight=weight))
+
+        self.innovations = innovations
+
+    def load_innovations_infos(self, **infos) -> None:
+        """Public method:
+            Load the information for the innovation table,
+            innovations saved as lists by input node are still accepted
+        """
+        innovations = infos['innovations']
+        if isinstance(innovations, dict):
+            self.innovations = {}
+            for by_node in innovations.values():
+                for node_innovations in by_node.values():
+                    for innovation in node_innovations:
+                        self.add_innovation(new_innovation=innovation)
+        else:
+            self.import_innovations(records=innovations)
+
+        self.node_number = infos['node_number']
+        self.link_number = infos['link_number']
+
+
+    def _check_innovation_already_exists(self, innovation_type: InnovationType,
                                          in_node: int, out_node: int) -> Optional[Innovation]:
-        """Private static method:
+        """Private method:
             See if an innovation already exists
 
         Args:
@@ -189,20 +306,11 @@ class InnovTable(metaclass=InnovTableProperties):
         Returns:
             Optional[Innovation]: the innovation if it exists
         """
-        innovations = InnovTable.innovations[innovation_type.value].get(in_node, [])
-        
-        for innovation in innovations:
-            if (innovation.innovation_type == innovation_type and
-                innovation.node_out_id == out_node):
-        
-                return innovation
-        
-        return None
+        return self.innovations.get((innovation_type, in_node, out_node))
 
-    @staticmethod
-    def _create_innovation(in_node: int, out_node: int, innovation_type: InnovationType,
+    def _create_innovation(self, in_node: int, out_node: int, innovation_type: InnovationType,
                            old_innovation_number: int=-1) -> Innovation:
-        """Private static method:
+        """Private method:
             Create a new innovation
 
         Args:
@@ -215,26 +323,26 @@ class InnovTable(metaclass=InnovTableProperties):
             Innovation: innovation created
         """
 
-        current_innovation: int = InnovTable.link_number                # current innovation number
+        current_innovation: int = self.link_number                # current innovation number
         # NEWNODE parameters
         innovation_number2: int = -1                                    # second innovation number
-        current_node: int = InnovTable.node_number                      # current node number
+        current_node: int = self.node_number                      # current node number
         # NEWLINK parameter
         new_weight: float = -1                                          # new weight
 
         # New node
         if innovation_type == InnovationType.NEW_NODE:
             # one innovation number per new link created
-            innovation_number2 = current_innovation + 1
+            innovation_number2 = current_innovation + self.stride
             # increment the current innovation number by 2 (1 for each new link created)
-            InnovTable.increment_link(amount=2)
+            self.increment_link(amount=2)
             # increment the current node number
-            InnovTable.increment_node()
+            self.increment_node()
 
         # New link
         elif innovation_type == InnovationType.NEW_LINK:
             # increment the current innovation number
-            InnovTable.increment_link(amount=1)
+            self.increment_link(amount=1)
             # generate a random weight
             new_weight = choice([-1,1]) * random()
             # new_node_id not applicable
@@ -251,14 +359,13 @@ class InnovTable(metaclass=InnovTableProperties):
                                     old_innovation_number=old_innovation_number)
 
         # add the innovation to the table's history
-        InnovTable.add_innovation(new_innovation=new_innovation)
+        self.add_innovation(new_innovation=new_innovation)
 
         return new_innovation
 
-    @staticmethod
-    def get_innovation(in_node: int, out_node: int, innovation_type: InnovationType,
+    def get_innovation(self, in_node: int, out_node: int, innovation_type: InnovationType,
                        old_innovation_number: int=-1) -> Innovation:
-        """Static method:
+        """Public method:
             Look if the innovation already exists in the table else create a new innovation
 
         Args:
@@ -273,19 +380,19 @@ class InnovTable(metaclass=InnovTableProperties):
 
         # Check in history if an equivalent innovation already exists
         
-        innovation = InnovTable._check_innovation_already_exists(innovation_type=innovation_type,
-                                                                 in_node=in_node,
-                                                                 out_node=out_node)
+        innovation = self._check_innovation_already_exists(innovation_type=innovation_type,
+                                                           in_node=in_node,
+                                                           out_node=out_node)
         if innovation:
             return innovation
 
         # No existing innovation wa corresponding
         else:
             # Novel innovation
-            new_innovation = InnovTable._create_innovation(in_node=in_node,
-                                                           out_node=out_node,
-                                                           innovation_type=innovation_type,
-                                                           old_innovation_number=old_innovation_number)
+            new_innovation = self._create_innovation(in_node=in_node,
+                                                     out_node=out_node,
+                                                     innovation_type=innovation_type,
+                                                     old_innovation_number=old_innovation_number)
             return new_innovation
 
 class Innovation:
@@ -337,3 +444,7 @@ class Innovation:
         self.old_innovation_number: int = old_innovation_number # In case of NEW_NODE a link is being disabled
 
         self.weight: float = new_weight                         # In case of NEW_LINK the weight associated to the link
+
+
+# Table of the genomes evolved outside of any simulation
+default_innov_table = InnovTable()
@@ -1,18 +1,161 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Dict, Set
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
 
-from project.src.rtNEAT.genes import OutputType
+from project.src.rtNEAT.genes import OutputType, sigmoid
 
 if TYPE_CHECKING:
     from genome import Genome
     from genes import NodeGene, LinkGene
 
+import numpy as np
 import numpy.typing as npt
+from numba import njit
 
 from .phenes import Link, Node
 
 
+@njit
+def evaluate_schedule(values: npt.NDArray[np.float64], order: npt.NDArray[np.int64],
+                      bias: npt.NDArray[np.float64], pointers: npt.NDArray[np.int64],
+                      sources: npt.NDArray[np.int64], weights: npt.NDArray[np.float64]) -> None:
+    """Function:
+        Evaluate the nodes of a flat network in order, in place,
+        summing bias and weighted incoming values in the same order as Node.get_activation
+
+    Args:
+        values (npt.NDArray[np.float64]):   activation value of each node, by index
+        order (npt.NDArray[np.int64]):      index of the nodes to evaluate, in order
+        bias (npt.NDArray[np.float64]):     bias of each evaluated node
+        pointers (npt.NDArray[np.int64]):   start of each evaluated node's links in sources and weights
+        sources (npt.NDArray[np.int64]):    index of the in node of each link
+        weights (npt.NDArray[np.float64]):  weight of each link
+    """
+    for i in range(order.size):
+        total = bias[i]
+        for k in range(pointers[i], pointers[i + 1]):
+            total += values[sources[k]] * weights[k]
+
+        values[order[i]] = sigmoid(total)
+
+
+class FlatNetwork:
+    """Class:
+        Network compiled into contiguous arrays,
+        evaluated in the order the recursive activation would visit the nodes
+
+        Attributes:
+            values (npt.NDArray[np.float64]):   activation value of each node, by index
+            input_index (npt.NDArray[np.int64]):index of the input nodes, in order of the input values
+            order (npt.NDArray[np.int64]):      index of the nodes to evaluate, in order
+            bias (npt.NDArray[np.float64]):     bias of each evaluated node
+            pointers (npt.NDArray[np.int64]):   start of each evaluated node's links
+            sources (npt.NDArray[np.int64]):    index of the in node of each link
+            weights (npt.NDArray[np.float64]):  weight of each link
+            outputs (List[Node]):               output nodes, in order of activation
+            output_index (npt.NDArray[np.int64]):index of the output nodes
+            triggers (List[bool]):              whether each output is a trigger
+    """
+    __slots__ = ('values', 'input_index', 'order', 'bias', 'pointers', 'sources',
+                 'weights', 'outputs', 'output_index', 'triggers')
+
+    def __init__(self, network: Network):
+        """Constructor:
+            Compile a network, replaying the depth-first traversal of Node.get_activation
+            so that recurrent links read the value of the previous activation as they do today
+
+        Args:
+            network (Network): network to compile
+        """
+        index: Dict[int, int] = {key: i for i, key in enumerate(network.all_nodes)}
+        self.values = np.array([node.activation_value                   # activation value of each node
+                                for node in network.all_nodes.values()], dtype=np.float64)
+        self.input_index = np.array([index[key] for key in network.inputs], dtype=np.int64)
+
+        schedule: List[Node] = []
+        visited: Set[int] = set()
+
+        def visit(node: Node) -> None:
+            if node.is_sensor() or node.id in visited:
+                return
+
+            visited.add(node.id)
+            for link in node.get_incoming():
+                if link.enabled:
+                    visit(node=link.in_node)
+
+            schedule.append(node)
+
+        self.outputs: List[Node] = list(network.get_outputs())          # output nodes, in order of activation
+        for node in self.outputs:
+            visit(node=node)
+
+        links = [[link for link in node.get_incoming() if link.enabled]
+                 for node in schedule]
+
+        self.order = np.array([index[node.id] for node in schedule], dtype=np.int64)
+        self.bias = np.array([node.bias for node in schedule], dtype=np.float64)
+        self.pointers = np.cumsum([0, *map(len, links)], dtype=np.int64)
+        self.sources = np.array([index[link.in_node.id] for node_links in links
+                                 for link in node_links], dtype=np.int64)
+        self.weights = np.array([link.weight for node_links in links
+                                 for link in node_links], dtype=np.float64)
+
+        self.output_index = np.array([index[node.id] for node in self.outputs], dtype=np.int64)
+        self.triggers: List[bool] = [node.output_type == OutputType.TRIGGER
+                                     for node in self.outputs]
+
+    @staticmethod
+    def is_compilable(network: Network) -> bool:
+        """Static method:
+            Check that all the nodes of a network are activated with a sigmoid
+
+        Args:
+            network (Network): network to check
+
+        Returns:
+            bool: True if the network can be compiled
+        """
+        return all(getattr(node.activation_function, 'func', node.activation_function) is sigmoid
+                   for node in network.all_nodes.values()
+                   if not node.is_sensor())
+
+    def activate(self, input_values: npt.NDArray) -> Dict[int, float]:
+        """Public method:
+            Evaluate the compiled network
+
+        Args:
+            input_values (npt.NDArray): input values
+
+        Returns:
+            Dict[int, float]: activated values of the trigger outputs
+        """
+        self.values[self.input_index] = input_values
+        evaluate_schedule(self.values, self.order, self.bias,
+                          self.pointers, self.sources, self.weights)
+
+        return self.read_outputs()
+
+    def read_outputs(self) -> Dict[int, float]:
+        """Public method:
+            Read the current values of the outputs,
+            writing them back to the output Nodes
+
+        Returns:
+            Dict[int, float]: activated values of the trigger outputs
+        """
+        output_values: Dict[int, float] = {}
+        for node, value, trigger in zip(self.outputs,
+                                        self.values[self.output_index].tolist(),
+                                        self.triggers):
+            if trigger:
+                output_values[node.id] = value
+
+            node.activation_value = value
+
+        return output_values
+
+
 class Network:
     """Class:
          Neural network, containing nodes and links
@@ -29,6 +172,7 @@ class Network:
             activation_phase (int):         Current activation phase
             frozen (bool):                  Frozen state (can't modify weights)
             complete (bool):                Whether the network is fully connected
+            flat (Optional[FlatNetwork]):   Compiled evaluator, if compiled
     """
     def __init__(self,
                  network_id: int = 0,
@@ -55,6 +199,7 @@ class Network:
         self.activation_phase: int = 0              # Current activation phase
         self.frozen: bool = frozen                  # Frozen state (can't modify weights)
         self.complete: bool
+        self.flat: Optional[FlatNetwork] = None     # Compiled evaluator
 
     @property
     def id(self) -> int:
@@ -67,12 +212,13 @@ class Network:
         return self.__id
 
     @classmethod
-    def genesis(cls, genome: Genome) -> Network:
+    def genesis(cls, genome: Genome, compiled: bool = False) -> Network:
         """Constructor:
             Create a new network corresponding to the given genome
 
         Args:
-            genome (Genome): genome containing the encoding for this network
+            genome (Genome):            genome containing the encoding for this network
+            compiled (bool, optional):  compile the network into a flat evaluator. Defaults to False.
 
         Returns:
             Network: created network
@@ -83,8 +229,24 @@ class Network:
         network._synthetize_nodes(node_genes=genome.node_genes)
         network._synthetize_links(link_genes=genome.link_genes)
 
+        if compiled:
+            network.compile()
+
         return network
 
+    def compile(self) -> bool:
+        """Public method:
+            Compile the network into a flat evaluator,
+            the structure and weights must not change afterwards
+
+        Returns:
+            bool: True if the network was compiled
+        """
+        if FlatNetwork.is_compilable(network=self):
+            self.flat = FlatNetwork(network=self)
+
+        return self.flat is not None
+
     def _synthetize_nodes(self, node_genes: Dict[int, NodeGene]):
         """Private method:
             Decode the NodeGenes to synthesize Nodes, and
@@ -282,6 +444,10 @@ class Network:
 
         # increment the activation_phase
         self.activation_phase += 1
+
+        if self.flat:
+            return self.flat.activate(input_values=input_values)
+
         # store the input values in the input nodes
         self._activate_inputs(values=input_values)
         # travel through the network to calculate the output values
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+    from .network import FlatNetwork
+
+import multiprocessing
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+
+class PackedNetwork:
+    """Class:
+        Arrays of a compiled network, without its nodes,
+        shipped once to the worker evaluating it
+
+        Attributes:
+            values (npt.NDArray[np.float64]):       activation value of each node, by index
+            input_index (npt.NDArray[np.int64]):    index of the input nodes
+            order (npt.NDArray[np.int64]):          index of the nodes to evaluate, in order
+            bias (npt.NDArray[np.float64]):         bias of each evaluated node
+            pointers (npt.NDArray[np.int64]):       start of each evaluated node's links
+            sources (npt.NDArray[np.int64]):        index of the in node of each link
+            weights (npt.NDArray[np.float64]):      weight of each link
+            output_index (npt.NDArray[np.int64]):   index of the output nodes
+    """
+    __slots__ = ('values', 'input_index', 'order', 'bias', 'pointers', 'sources',
+                 'weights', 'output_index')
+
+    def __init__(self, network: FlatNetwork):
+        """Constructor:
+            Copy the arrays of a compiled network
+
+        Args:
+            network (FlatNetwork): compiled network to pack
+        """
+        for name in PackedNetwork.__slots__:
+            setattr(self, name, np.array(getattr(network, name)))
+
+    def __getstate__(self) -> Dict[str, npt.NDArray]:
+        return {name: getattr(self, name) for name in PackedNetwork.__slots__}
+
+    def __setstate__(self, state: Dict[str, npt.NDArray]) -> None:
+        for name, array in state.items():
+            setattr(self, name, array)
+
+
+def _attach_buffers(names: Tuple[str, str], capacity: int, n_inputs: int,
+                    n_outputs: int) -> Tuple[List[SharedMemory], npt.NDArray, npt.NDArray]:
+    """Function:
+        Attach to the shared input and output matrices
+
+    Args:
+        names (Tuple[str, str]):    names of the input and output shared memories
+        capacity (int):             number of rows of the matrices
+        n_inputs (int):             number of inputs of each network
+        n_outputs (int):            number of outputs of each network
+
+    Returns:
+        Tuple[List[SharedMemory], npt.NDArray, npt.NDArray]:    shared memories,
+                                                                input matrix,
+                                                                output matrix
+    """
+    memories = [SharedMemory(name=name) for name in names]
+    inputs = np.ndarray((capacity, n_inputs), dtype=np.float64, buffer=memories[0].buf)
+    outputs = np.ndarray((capacity, n_outputs), dtype=np.float64, buffer=memories[1].buf)
+
+    return memories, inputs, outputs
+
+
+def serve(connection: Connection, n_inputs: int, n_outputs: int,
+          names: Tuple[str, str], capacity: int) -> None:
+    """Function:
+        Loop of a worker process, evaluating its partition of the networks
+        in its own arena, from the rows of the shared input matrix given
+        into the same rows of the shared output matrix
+
+        Commands received:
+            ('add', slot, network):             pack a network shipped for a slot
+            ('remove', slot):                   free the network of a slot
+            ('buffers', names, capacity):       attach to new shared matrices
+            ('evaluate', start, stop, slots):   evaluate the slots of some rows, then reply
+            ('close',):                         stop the worker
+
+    Args:
+        connection (Connection):    end of the pipe with the main process
+        n_inputs (int):             number of inputs of each network
+        n_outputs (int):            number of outputs of each network
+        names (Tuple[str, str]):    names of the input and output shared memories
+        capacity (int):             number of rows of the shared matrices
+    """
+    from .arena import BrainArena
+
+    arena = BrainArena(n_inputs=n_inputs,
+                       n_outputs=n_outputs)
+    local_slots: Dict[int, int] = {}
+    memories, inputs, outputs = _attach_buffers(names=names,
+                                                capacity=capacity,
+                                                n_inputs=n_inputs,
+                                                n_outputs=n_outputs)
+
+    while True:
+        command, *args = connection.recv()
+        match command:
+            case 'add':
+                slot, network = args
+                local_slots[slot] = arena.add_compiled(network=network)
+
+            case 'remove':
+                arena.remove(slot=local_slots.pop(args[0]))
+
+            case 'buffers':
+                del inputs, outputs
+                for memory in memories:
+                    memory.close()
+
+                memories, inputs, outputs = _attach_buffers(names=args[0],
+                                                            capacity=args[1],
+                                                            n_inputs=n_inputs,
+                                                            n_outputs=n_outputs)
+
+            case 'evaluate':
+                start, stop, slots = args
+                outputs[start:stop] = arena.evaluate(slots=np.array([local_slots[slot] for slot in slots],
+                                                                    dtype=np.int64),
+                                                     inputs=inputs[start:stop])
+                connection.send(stop)
+
+            case 'close':
+                break
+
+    del inputs, outputs
+    for memory in memories:
+        memory.close()
+
+
+def _release(processes: List[multiprocessing.Process], connections: List[Connection],
+             memories: List[SharedMemory]) -> None:
+    """Function:
+        Stop the workers of a pool and free its shared memory
+
+    Args:
+        processes (List[multiprocessing.Process]):  worker processes
+        connections (List[Connection]):             pipes to the workers
+        memories (List[SharedMemory]):              shared input and output matrices
+    """
+    for connection in connections:
+        try:
+            connection.send(('close',))
+        except (BrokenPipeError, OSError):
+            pass
+
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+
+    for memory in memories:
+        memory.close()
+        memory.unlink()
+
+
+class ArenaPool:
+    """Class:
+        Worker processes each owning a partition of the compiled networks of an arena,
+        networks are shipped once when added and the inputs and outputs of a cycle
+        go through shared memory, so that evaluating them does not pickle any network
+
+        Attributes:
+            n_inputs (int):                             number of inputs of each network
+            n_outputs (int):                            number of outputs of each network
+            owners (Dict[int, int]):                    worker owning the network of each slot
+            loads (List[int]):                          number of networks of each worker
+            capacity (int):                             number of rows of the shared matrices
+            _memories (List[SharedMemory]):             shared input and output matrices
+            _inputs (npt.NDArray[np.float64]):          capacity×n_inputs shared input matrix
+            _outputs (npt.NDArray[np.float64]):         capacity×n_outputs shared output matrix
+            _connections (List[Connection]):            pipes to the workers
+            _processes (List[multiprocessing.Process]): worker processes
+
+        Methods:
+            add:        ship a compiled network to the least loaded worker
+            remove:     free a network in its worker
+            evaluate:   evaluate the networks of some slots in all the workers at once
+            close:      stop the workers and free the shared memory
+    """
+    def __init__(self, n_inputs: int, n_outputs: int, n_workers: int, capacity: int = 256):
+        """Constructor:
+            Start the workers and create the shared matrices
+
+        Args:
+            n_inputs (int):             number of inputs of each network
+            n_outputs (int):            number of outputs of each network
+            n_workers (int):            number of worker processes
+            capacity (int, optional):   initial number of rows of the shared matrices. Defaults to 256.
+        """
+        self.n_inputs: int = n_inputs                       # number of inputs of each network
+        self.n_outputs: int = n_outputs                     # number of outputs of each network
+        self.owners: Dict[int, int] = {}                    # worker owning the network of each slot
+        self.loads: List[int] = [0] * n_workers             # number of networks of each worker
+        self.capacity: int = 0                              # number of rows of the shared matrices
+
+        self._memories: List[SharedMemory] = []             # shared input and output matrices
+        self._inputs: npt.NDArray[np.float64]               # shared input matrix
+        self._outputs: npt.NDArray[np.float64]              # shared output matrix
+        self._create_buffers(capacity=capacity)
+
+        self._connections: List[Connection] = []            # pipes to the workers
+        self._processes: List[multiprocessing.Process] = [] # worker processes
+        for _ in range(n_workers):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=serve,
+                                              args=(worker_connection, n_inputs, n_outputs,
+                                                    self._get_names(), self.capacity),
+                                              daemon=True)
+            process.start()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+        self._finalizer = weakref.finalize(self, _release, self._processes,
+                                           self._connections, self._memories)
+
+    def __len__(self) -> int:
+        return len(self.owners)
+
+    def _get_names(self) -> Tuple[str, str]:
+        """Private method:
+            Get the names of the shared input and output matrices
+
+        Returns:
+            Tuple[str, str]: names of the shared memories
+        """
+        return self._memories[0].name, self._memories[1].name
+
+    def _create_buffers(self, capacity: int) -> None:
+        """Private method:
+            Replace the shared matrices by new ones of a given number of rows
+
+        Args:
+            capacity (int): number of rows of the new matrices
+        """
+        old_memories = list(self._memories)
+        memories = [SharedMemory(create=True, size=capacity * n_values * 8)
+                    for n_values in (self.n_inputs, self.n_outputs)]
+
+        self._inputs = np.ndarray((capacity, self.n_inputs), dtype=np.float64, buffer=memories[0].buf)
+        self._outputs = np.ndarray((capacity, self.n_outputs), dtype=np.float64, buffer=memories[1].buf)
+        self._memories[:] = memories
+        self.capacity = capacity
+
+        for connection in getattr(self, '_connections', []):
+            connection.send(('buffers', self._get_names(), capacity))
+
+        for memory in old_memories:
+            memory.close()
+            memory.unlink()
+
+    def add(self, slot: int, network: FlatNetwork) -> None:
+        """Public method:
+            Ship a compiled network to the least loaded worker
+
+        Args:
+            slot (int):             slot of the network in the arena
+            network (FlatNetwork):  compiled network
+        """
+        worker = self.loads.index(min(self.loads))
+        self._connections[worker].send(('add', slot, PackedNetwork(network=network)))
+
+        self.owners[slot] = worker
+        self.loads[worker] += 1
+
+    def remove(self, slot: int) -> None:
+        """Public method:
+            Free a network in the worker owning it
+
+        Args:
+            slot (int): slot of the network in the arena
+        """
+        worker = self.owners.pop(slot, None)
+        if worker is None:
+            return
+
+        self._connections[worker].send(('remove', slot))
+        self.loads[worker] -= 1
+
+    def evaluate(self, slots: npt.NDArray[np.int64],
+                 inputs: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        """Public method:
+            Evaluate the networks of some slots in all the workers at once,
+            the rows of each worker being contiguous in the shared matrices
+
+        Args:
+            slots (npt.NDArray[np.int64]):      N slots to evaluate
+            inputs (npt.NDArray[np.float64]):   N×n_inputs input matrix, one row per slot
+
+        Returns:
+            npt.NDArray[np.float64]: N×n_outputs output values, one row per slot
+        """
+        slots = np.asarray(slots, dtype=np.int64)
+        if len(slots) > self.capacity:
+            self._create_buffers(capacity=max(len(slots), 2 * self.capacity))
+
+        owners = np.fromiter((self.owners[slot] for slot in slots.tolist()),
+                             dtype=np.int64, count=len(slots))
+        order = np.argsort(owners, kind='stable')
+        bounds = np.searchsorted(owners[order], np.arange(len(self.loads) + 1))
+
+        self._inputs[:len(slots)] = inputs[order]
+
+        busy = []
+        for worker, (start, stop) in enumerate(zip(bounds[:-1].tolist(), bounds[1:].tolist())):
+            if start < stop:
+                self._connections[worker].send(('evaluate', start, stop,
+                                                slots[order[start:stop]].tolist()))
+                busy.append(worker)
+
+        for worker in busy:
+            self._connections[worker].recv()
+
+        outputs = np.empty((len(slots), self.n_outputs), dtype=np.float64)
+        outputs[order] = self._outputs[:len(slots)]
+
+        return outputs
+
+    def close(self) -> None:
+        """Public method:
+            Stop the workers and free the shared memory
+        """
+        self._finalizer()
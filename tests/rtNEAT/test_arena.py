@@ -0,0 +1,185 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from project.src.rtNEAT.arena import BrainArena
+from project.src.rtNEAT.brain import Brain
+from project.src.rtNEAT.genes import reset_innovation_table
+from project.src.rtNEAT.genome import Genome
+from project.src.rtNEAT.network import Network
+
+
+class TestBrainArena:
+    def test_create_arena(self):
+        arena = BrainArena(n_inputs=8,
+                           n_outputs=9)
+
+        assert type(arena) == BrainArena
+        assert len(arena) == 0
+        assert arena.free_slots == []
+
+    class TestBrainArenaMethods:
+        @pytest.fixture(autouse=True)
+        def setup(self):
+            reset_innovation_table()
+            self.gen_data = {'n_inputs': 8,
+                             'n_outputs': 9,
+                             'n_actions': 6,
+                             'actions': {f"{i}": [] for i in range(6)}}
+
+            self.arena = BrainArena(n_inputs=8,
+                                    n_outputs=9,
+                                    capacity=2)
+
+        def create_genome(self, genome_id: int, n_nodes: int) -> Genome:
+            genome = Genome.genesis(genome_id=genome_id,
+                                    genome_data=self.gen_data)
+
+            for _ in range(n_nodes):
+                genome._mutate_add_node()
+                genome._mutate_add_link(tries=20)
+
+            return genome
+
+        def create_networks(self, n_networks: int):
+            genomes = [self.create_genome(genome_id=i, n_nodes=i)
+                       for i in range(n_networks)]
+
+            # Same networks, activated alone or in the arena
+            alone = [Network.genesis(genome=genome, compiled=True) for genome in genomes]
+            packed = [Network.genesis(genome=genome, compiled=True) for genome in genomes]
+
+            return alone, packed
+
+        def assert_same_activations(self, alone, packed, slots, n_activations=3,
+                                    executor=None, chunk_size=0):
+            for _ in range(n_activations):
+                inputs = np.random.uniform(-1, 1, (len(alone), 8))
+                outputs = self.arena.evaluate(slots=np.array(slots),
+                                              inputs=inputs,
+                                              executor=executor,
+                                              chunk_size=chunk_size)
+
+                for network, flat_network, row, output_row in zip(alone, packed,
+                                                                   inputs, outputs):
+                    expected = network.activate(input_values=row)
+
+                    assert flat_network.flat.read_outputs() == expected
+                    assert output_row.tolist() == network.flat.values[
+                                                    network.flat.output_index].tolist()
+
+        def test_add(self):
+            alone, packed = self.create_networks(n_networks=5)
+            slots = [self.arena.add(network=network) for network in packed]
+
+            assert slots == [0, 1, 2, 3, 4]
+            assert len(self.arena) == 5
+
+            self.assert_same_activations(alone=alone,
+                                         packed=packed,
+                                         slots=slots)
+
+        @pytest.mark.parametrize('executor_class', [ThreadPoolExecutor, ProcessPoolExecutor])
+        def test_evaluate_in_chunks(self, executor_class):
+            alone, packed = self.create_networks(n_networks=7)
+            slots = [self.arena.add(network=network) for network in packed]
+
+            with executor_class(max_workers=2) as executor:
+                self.assert_same_activations(alone=alone,
+                                             packed=packed,
+                                             slots=slots,
+                                             executor=executor,
+                                             chunk_size=3)
+
+        def test_add_compiles(self):
+            genome = self.create_genome(genome_id=0, n_nodes=2)
+            network = Network.genesis(genome=genome)
+
+            assert self.arena.add(network=network) == 0
+            assert network.flat is not None
+
+        def test_add_wrong_size(self):
+            arena = BrainArena(n_inputs=6,
+                               n_outputs=9)
+            _, packed = self.create_networks(n_networks=1)
+
+            with pytest.raises(ValueError):
+                arena.add(network=packed[0])
+
+        def test_remove_and_reuse(self):
+            alone, packed = self.create_networks(n_networks=6)
+            slots = [self.arena.add(network=network) for network in packed[:5]]
+
+            self.arena.remove(slot=slots[1])
+            assert self.arena.free_slots == [1]
+            assert len(self.arena) == 4
+
+            # Removing twice is harmless
+            self.arena.remove(slot=slots[1])
+            assert len(self.arena) == 4
+
+            assert self.arena.add(network=packed[5]) == 1
+            assert self.arena.free_slots == []
+
+            slots[1] = 1
+            alone[1], packed[1] = alone[5], packed[5]
+            self.assert_same_activations(alone=alone[:5],
+                                         packed=packed[:5],
+                                         slots=slots)
+
+        def test_compact(self):
+            alone, packed = self.create_networks(n_networks=6)
+            slots = [self.arena.add(network=network) for network in packed]
+
+            # Activate before removing so that recurrent values must survive
+            self.assert_same_activations(alone=alone,
+                                         packed=packed,
+                                         slots=slots)
+
+            for slot in slots[:4]:
+                self.arena.remove(slot=slot)
+
+            assert self.arena._garbage <= self.arena._sizes['values'] - self.arena._garbage
+
+            self.assert_same_activations(alone=alone[4:],
+                                         packed=packed[4:],
+                                         slots=slots[4:])
+
+        def test_activate_alone(self):
+            alone, packed = self.create_networks(n_networks=3)
+            slots = [self.arena.add(network=network) for network in packed]
+
+            inputs = np.random.uniform(-1, 1, 8)
+            packed[1].activate(input_values=inputs)
+            alone[1].activate(input_values=inputs)
+
+            # Values of a network activated alone are seen by the arena
+            self.assert_same_activations(alone=alone,
+                                         packed=packed,
+                                         slots=slots)
+
+        def test_brain_registration(self):
+            arena = BrainArena(n_inputs=8,
+                               n_outputs=9)
+
+            parent1 = Brain.genesis(brain_id=1,
+                                    genome_data=self.gen_data,
+                                    arena=arena)
+            parent2 = Brain.genesis(brain_id=2,
+                                    genome_data=self.gen_data,
+                                    arena=arena)
+
+            assert (parent1.slot, parent2.slot) == (0, 1)
+            assert parent1.arena is arena
+
+            child = Brain.crossover(brain_id=3,
+                                    parent1=parent1,
+                                    parent2=parent2)
+
+            assert child.arena is arena
+            assert child.slot == 2
+
+            parent1.release()
+            assert parent1.arena is None
+            assert parent1.slot == -1
+            assert arena.free_slots == [0]
@@ -1,10 +1,13 @@
 import random
 
+import numpy as np
 import pytest
 from numpy.random import choice
+from project.src.platform.running.config import config
 from project.src.rtNEAT.genes import (LinkGene, NodeGene, NodeType,
                                       reset_innovation_table)
-from project.src.rtNEAT.genome import Genome
+from project.src.rtNEAT.genome import (Genome, GenomeArrays,
+                                       pairwise_compatibility)
 
 
 class TestGenome:
@@ -201,6 +204,21 @@ class TestGenome:
                                                 genome2 = self.genome2_extended)
                 assert dist == 0.5/2 + 0.5/4
 
+            def test_pairwise_compatibility(self):
+                genomes = [self.genome1, self.genome2, self.genome3,
+                           self.genome4, self.genome2_extended]
+
+                distances = pairwise_compatibility(genomes=genomes)
+
+                assert distances.shape == (5, 5)
+                for i, genome1 in enumerate(genomes):
+                    for j, genome2 in enumerate(genomes):
+                        assert distances[i, j] == pytest.approx(
+                                                    Genome.genetic_distance(genome1=genome1,
+                                                                            genome2=genome2))
+
+                assert pairwise_compatibility(genomes=[]).shape == (0, 0)
+
         class TestMutation:
             @pytest.fixture(autouse=True)
             def setup(self):
@@ -765,3 +783,141 @@ class TestGenome:
 
                 
 
+
+
+class TestGenomeArrays:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        reset_innovation_table()
+        gen_data = {'n_inputs': 3,
+                    'n_outputs': 2,
+                    'n_actions': 2,
+                    'actions': {"0": [], "1": []}}
+
+        self.genome = Genome.genesis(genome_id=0,
+                                     genome_data=gen_data)
+        self.arrays = GenomeArrays.from_genome(genome=self.genome)
+
+        yield
+
+        reset_innovation_table()
+
+    def test_from_genome(self):
+        links, nodes = self.arrays.links, self.arrays.nodes
+
+        assert len(links) == self.genome.n_link_genes
+        assert len(nodes) == self.genome.n_node_genes
+
+        for link, row in zip(self.genome.link_genes.values(), links):
+            assert (row['innovation'], row['in_node'], row['out_node']) == (link.id, link.in_node,
+                                                                           link.out_node)
+            assert row['weight'] == link.weight
+            assert row['enabled'] == link.enabled
+
+        for node, row in zip(self.genome.node_genes.values(), nodes):
+            assert (row['id'], row['type'], row['bias']) == (node.id, node.type.value, node.bias)
+            assert row['activation'] == 0
+
+    def test_link_exists(self):
+        assert self.arrays.link_exists(node1=1, node2=4)
+        assert self.arrays.link_exists(node1=4, node2=1)
+        assert not self.arrays.link_exists(node1=1, node2=2)
+
+    def test_add_genes(self):
+        # Grow past the initial capacity
+        for i in range(40):
+            node = NodeGene(node_id=100 + i,
+                            node_type=NodeType.HIDDEN)
+            self.arrays.add_node(node=node)
+            self.arrays.add_link(link=LinkGene(link_id=100 + i,
+                                               in_node=1,
+                                               out_node=node.id))
+
+        assert len(self.arrays.links) == self.genome.n_link_genes + 40
+        assert len(self.arrays.nodes) == self.genome.n_node_genes + 40
+        assert self.arrays.link_exists(node1=139, node2=1)
+        assert not self.arrays.link_exists(node1=139, node2=2)
+
+    def test_find_open_link(self):
+        # Complete genome, no open link between inputs and outputs
+        assert self.arrays.find_open_link(in_nodes=np.array([1, 2, 3]),
+                                          out_nodes=np.array([4, 5]),
+                                          tries=20) == (None, None)
+
+        self.arrays.add_node(node=NodeGene(node_id=7,
+                                           node_type=NodeType.HIDDEN))
+        for _ in range(20):
+            in_node, out_node = self.arrays.find_open_link(in_nodes=np.array([1, 2, 3, 7]),
+                                                           out_nodes=np.array([7, 4, 5]),
+                                                           tries=50)
+            assert 7 in (in_node, out_node)
+            assert in_node != out_node
+
+    def test_find_random_link(self):
+        for link in self.genome.get_link_genes():
+            link.enabled = False
+            self.arrays.disable_link(link=link)
+
+        assert self.arrays.find_random_link() is None
+
+        link = self.genome.link_genes[1]
+        self.arrays.links['enabled'][0] = True
+        assert self.arrays.find_random_link() is link
+
+    def test_mutate_links(self, monkeypatch):
+        monkeypatch.setitem(config["NEAT"], "link_mutate_prob", 1.0)
+        monkeypatch.setitem(config["NEAT"], "new_link_prob", 0.0)
+        monkeypatch.setitem(config["NEAT"], "disable_prob", 1.0)
+
+        frozen = self.genome.link_genes[1]
+        frozen.frozen = True
+        arrays = GenomeArrays.from_genome(genome=self.genome)
+        weights = {link.id: link.weight for link in self.genome.get_link_genes()}
+
+        arrays.mutate_links()
+
+        # Genes are only changed when applied
+        assert {link.id: link.weight for link in self.genome.get_link_genes()} == weights
+
+        arrays.apply()
+        for link in self.genome.get_link_genes():
+            if link is frozen:
+                assert link.weight == weights[link.id]
+                assert link.enabled
+            else:
+                assert link.weight != weights[link.id]
+                assert link.mutation_number == link.weight
+                assert not link.enabled
+
+    def test_mutate_nodes(self, monkeypatch):
+        monkeypatch.setitem(config["NEAT"], "node_mutate_prob", 1.0)
+        monkeypatch.setitem(config["NEAT"], "mutate_bias_prob", 1.0)
+        monkeypatch.setitem(config["NEAT"], "disable_prob", 0.0)
+
+        biases = {node.id: node.bias for node in self.genome.get_node_genes()}
+
+        self.arrays.mutate_nodes()
+        self.arrays.apply()
+
+        for node in self.genome.get_node_genes():
+            if node.is_sensor():
+                assert node.bias == 0
+            else:
+                assert node.bias != biases[node.id]
+
+    def test_vectorized_mutate(self, monkeypatch):
+        monkeypatch.setitem(config["NEAT"], "vectorized_mutation", True)
+        monkeypatch.setitem(config["NEAT"], "add_node_prob", 1.0)
+        monkeypatch.setitem(config["NEAT"], "add_link_prob", 1.0)
+
+        n_links = self.genome.n_link_genes
+        self.genome.mutate(factor=5)
+
+        assert self.genome._arrays is None
+        assert self.genome.n_link_genes > n_links
+        self.genome.verify_post_crossover()
+
+        # No two links between the same nodes
+        pairs = [frozenset((link.in_node, link.out_node))
+                 for link in self.genome.get_link_genes()]
+        assert len(pairs) == len(set(pairs))
@@ -1,13 +1,16 @@
 import pytest
 from project.src.rtNEAT.genes import LinkGene, NodeGene, NodeType
+from project.src.rtNEAT.genome import Genome
 from project.src.rtNEAT.innovation import (Innovation, InnovationType,
-                                           InnovTable)
+                                           InnovTable, default_innov_table)
 
 
 class TestInnovTable:
     @pytest.fixture(autouse=True)
     def setup(self):
-        InnovTable.reset_innovation_table()
+        # Genes created without an id are numbered by the default table
+        self.table = default_innov_table
+        self.table.reset_innovation_table()
         sensor_node = NodeGene(node_type=NodeType.INPUT)
 
         action_node = NodeGene(node_type=NodeType.OUTPUT)
@@ -27,33 +30,33 @@ class TestInnovTable:
 
     def test_increment(self):
         # Link
-        assert InnovTable.get_link_number() == 2
-        InnovTable.increment_link()
-        assert InnovTable.get_link_number() == 3
-        InnovTable.increment_link(amount=5)
-        assert InnovTable.get_link_number() == 8
+        assert self.table.get_link_number() == 2
+        self.table.increment_link()
+        assert self.table.get_link_number() == 3
+        self.table.increment_link(amount=5)
+        assert self.table.get_link_number() == 8
 
         # Node
-        assert InnovTable.get_node_number() == 3
-        InnovTable.increment_node()
-        assert InnovTable.get_node_number() == 4
-        InnovTable.increment_node(amount=4)
-        assert InnovTable.get_node_number() == 8
+        assert self.table.get_node_number() == 3
+        self.table.increment_node()
+        assert self.table.get_node_number() == 4
+        self.table.increment_node(amount=4)
+        assert self.table.get_node_number() == 8
 
     def test_setter_and_getter(self):
         # Link
-        assert InnovTable.link_number == 2
-        InnovTable.link_number = 8
-        assert InnovTable.link_number == 8
-        InnovTable.link_number = 4
-        assert InnovTable.link_number == 8
+        assert self.table.link_number == 2
+        self.table.link_number = 8
+        assert self.table.link_number == 8
+        self.table.link_number = 4
+        assert self.table.link_number == 8
 
         # Node
-        assert InnovTable.node_number == 3
-        InnovTable.node_number = 8
-        assert InnovTable.node_number == 8
-        InnovTable.node_number = 4
-        assert InnovTable.node_number == 8
+        assert self.table.node_number == 3
+        self.table.node_number = 8
+        assert self.table.node_number == 8
+        self.table.node_number = 4
+        assert self.table.node_number == 8
 
 
     def test_check_innovation_already_exists(self):
@@ -69,9 +72,9 @@ class TestInnovTable:
                                     new_weight=weight,
                                     innovation_number1=innovation_number1)
             
-            InnovTable.add_innovation(innovation)
+            self.table.add_innovation(innovation)
 
-            exists = InnovTable._check_innovation_already_exists(innovation_type=innovation_type,
+            exists = self.table._check_innovation_already_exists(innovation_type=innovation_type,
                                                                     in_node=node1.id,
                                                                     out_node=node2.id)
             assert exists
@@ -79,47 +82,47 @@ class TestInnovTable:
 
             # Not exists
 
-            exists = InnovTable._check_innovation_already_exists(innovation_type=innovation_type,
+            exists = self.table._check_innovation_already_exists(innovation_type=innovation_type,
                                                                     in_node=node2.id,
                                                                     out_node=node1.id)
             assert not exists
 
-            exists = InnovTable._check_innovation_already_exists(innovation_type=InnovationType.NEW_NODE,
+            exists = self.table._check_innovation_already_exists(innovation_type=InnovationType.NEW_NODE,
                                                                     in_node=node1.id,
                                                                     out_node=3)
             assert not exists
 
     def test_get_innovation(self):
         node1, node2 = self.nodes[1], self.nodes[2]
-        assert InnovTable.link_number == 2
+        assert self.table.link_number == 2
 
         # new innovation
-        innovation = InnovTable.get_innovation( in_node=node1.id,
+        innovation = self.table.get_innovation( in_node=node1.id,
                                                 out_node=node2.id,
                                                 innovation_type=InnovationType.NEW_NODE)
 
         assert innovation.innovation_type == InnovationType.NEW_NODE
         assert innovation.node_in_id == node1.id
         assert innovation.node_out_id == node2.id
-        assert innovation.new_node_id == InnovTable.node_number - 1
-        assert innovation.innovation_number1 == InnovTable.link_number - 2
-        assert innovation.innovation_number2 == InnovTable.link_number - 1
-        assert InnovTable.node_number == 4
-        assert InnovTable.link_number == 4
+        assert innovation.new_node_id == self.table.node_number - 1
+        assert innovation.innovation_number1 == self.table.link_number - 2
+        assert innovation.innovation_number2 == self.table.link_number - 1
+        assert self.table.node_number == 4
+        assert self.table.link_number == 4
 
         # same innovaiton
-        innovation = InnovTable.get_innovation( in_node=node1.id,
+        innovation = self.table.get_innovation( in_node=node1.id,
                                                 out_node=node2.id,
                                                 innovation_type=InnovationType.NEW_NODE)
 
         assert innovation.innovation_type == InnovationType.NEW_NODE
         assert innovation.node_in_id == node1.id
         assert innovation.node_out_id == node2.id
-        assert innovation.new_node_id == InnovTable.node_number - 1
-        assert innovation.innovation_number1 == InnovTable.link_number - 2
-        assert innovation.innovation_number2 == InnovTable.link_number - 1
-        assert InnovTable.node_number == 4
-        assert InnovTable.link_number == 4
+        assert innovation.new_node_id == self.table.node_number - 1
+        assert innovation.innovation_number1 == self.table.link_number - 2
+        assert innovation.innovation_number2 == self.table.link_number - 1
+        assert self.table.node_number == 4
+        assert self.table.link_number == 4
 
 
 
@@ -127,19 +130,19 @@ class TestInnovTable:
         node1, node2 = self.nodes[1], self.nodes[2]
         initial_link_num = 4
         initial_node_num = 5
-        InnovTable.node_number = initial_node_num
-        InnovTable.link_number = initial_link_num
-        current_innovation = InnovTable.link_number
-        assert InnovTable.link_number == initial_link_num
-        assert InnovTable.node_number == initial_node_num
+        self.table.node_number = initial_node_num
+        self.table.link_number = initial_link_num
+        current_innovation = self.table.link_number
+        assert self.table.link_number == initial_link_num
+        assert self.table.node_number == initial_node_num
 
         # New link
-        innovation = InnovTable._create_innovation(in_node=node1.id,
+        innovation = self.table._create_innovation(in_node=node1.id,
                                                     out_node=node2.id,
                                                     innovation_type=InnovationType.NEW_LINK)
 
-        assert InnovTable.link_number == initial_link_num + 1
-        assert InnovTable.node_number == initial_node_num
+        assert self.table.link_number == initial_link_num + 1
+        assert self.table.node_number == initial_node_num
         assert innovation.innovation_type == InnovationType.NEW_LINK
         assert innovation.node_in_id == node1.id
         assert innovation.node_out_id == node2.id
@@ -150,19 +153,135 @@ class TestInnovTable:
         assert innovation.new_node_id == -1
 
         # New node
-        current_innovation = InnovTable.link_number
-        innovation = InnovTable._create_innovation(in_node=node1.id,
+        current_innovation = self.table.link_number
+        innovation = self.table._create_innovation(in_node=node1.id,
                                                     out_node=node2.id,
                                                     innovation_type=InnovationType.NEW_NODE,
                                                     old_innovation_number=8)
 
         assert innovation.innovation_number1 == current_innovation
         assert innovation.innovation_number2 == current_innovation + 1
-        assert InnovTable.link_number == current_innovation + 2
-        assert InnovTable.node_number == initial_node_num + 1
+        assert self.table.link_number == current_innovation + 2
+        assert self.table.node_number == initial_node_num + 1
         assert innovation.innovation_type == InnovationType.NEW_NODE
         assert innovation.node_in_id == node1.id
         assert innovation.node_out_id == node2.id
         assert innovation.weight == -1
         assert innovation.new_node_id == initial_node_num
         assert innovation.old_innovation_number == 8
+
+    def test_export_import_innovations(self):
+        node1, node2 = self.nodes[1], self.nodes[2]
+        link = self.table.get_innovation(in_node=node1.id,
+                                         out_node=node2.id,
+                                         innovation_type=InnovationType.NEW_LINK)
+        node = self.table.get_innovation(in_node=node1.id,
+                                         out_node=node2.id,
+                                         innovation_type=InnovationType.NEW_NODE,
+                                         old_innovation_number=link.innovation_number1)
+
+        records = self.table.export_innovations()
+        assert len(records) == 2
+        assert records['type'].tolist() == [1, 0]
+
+        self.table.reset_innovation_table()
+        self.table.load_innovations_infos(innovations=records,
+                                          node_number=4,
+                                          link_number=5)
+
+        for innovation in (link, node):
+            loaded = self.table._check_innovation_already_exists(innovation_type=innovation.innovation_type,
+                                                                 in_node=node1.id,
+                                                                 out_node=node2.id)
+            assert vars(loaded) == vars(innovation)
+
+        assert (self.table.node_number, self.table.link_number) == (4, 5)
+
+    def test_load_legacy_innovations(self):
+        node1, node2 = self.nodes[1], self.nodes[2]
+        innovation = Innovation(node_in_id=node1.id,
+                                node_out_id=node2.id,
+                                innovation_type=InnovationType.NEW_LINK,
+                                innovation_number1=1)
+
+        self.table.load_innovations_infos(innovations={"new_node": {},
+                                                       "new_link": {node1.id: [innovation]}},
+                                          node_number=3,
+                                          link_number=2)
+
+        assert self.table._check_innovation_already_exists(innovation_type=InnovationType.NEW_LINK,
+                                                           in_node=node1.id,
+                                                           out_node=node2.id) is innovation
+
+    def test_interleaved_numbering(self):
+        try:
+            self.table.set_numbering(stride=3,
+                                     offset=2)
+            assert self.table.align_number(number=6) == 8
+            assert self.table.align_number(number=8) == 8
+            assert (self.table.node_number - 2) % 3 == 0
+
+            node1, node2 = self.nodes[1], self.nodes[2]
+            link_number = self.table.link_number
+            node = self.table.get_innovation(in_node=node1.id,
+                                             out_node=node2.id,
+                                             innovation_type=InnovationType.NEW_NODE,
+                                             old_innovation_number=1)
+
+            assert (node.innovation_number1, node.innovation_number2) == (link_number, link_number + 3)
+            assert self.table.link_number == link_number + 6
+        finally:
+            self.table.set_numbering(stride=1,
+                                     offset=0)
+
+    def test_merge_innovations(self):
+        node1, node2 = self.nodes[1], self.nodes[2]
+        local = self.table.get_innovation(in_node=node1.id,
+                                          out_node=node2.id,
+                                          innovation_type=InnovationType.NEW_LINK)
+        records = self.table.export_innovations()
+        records['innovation_number1'] = 41
+
+        self.table.reset_innovation_table()
+        self.table.get_innovation(in_node=node2.id,
+                                  out_node=node1.id,
+                                  innovation_type=InnovationType.NEW_LINK)
+        assert self.table.merge_innovations(records=records) == 1
+        assert self.table.merge_innovations(records=records) == 0
+
+        merged = self.table._check_innovation_already_exists(innovation_type=InnovationType.NEW_LINK,
+                                                             in_node=node1.id,
+                                                             out_node=node2.id)
+        assert merged.innovation_number1 == 41 and merged is not local
+
+    def test_independent_tables(self):
+        node1, node2 = self.nodes[1], self.nodes[2]
+        tables = [InnovTable(), InnovTable()]
+        tables[0].increment_link(amount=10)
+
+        innovations = [table.get_innovation(in_node=node1.id,
+                                            out_node=node2.id,
+                                            innovation_type=InnovationType.NEW_LINK)
+                       for table in tables]
+
+        assert [innovation.innovation_number1 for innovation in innovations] == [11, 1]
+        assert [table.link_number for table in tables] == [12, 2]
+        assert not self.table.innovations
+
+    def test_genome_table(self):
+        gen_data = {'n_inputs': 2,
+                    'n_outputs': 2,
+                    'n_actions': 1,
+                    'actions': {"0": []}}
+        table = InnovTable()
+        genome = Genome.genesis(genome_id=1,
+                                genome_data=gen_data,
+                                innov_table=table)
+        assert (table.node_number, table.link_number) == (6, 5)
+
+        assert genome._mutate_add_node(innov_table=table)
+        assert len(table.innovations) == 1
+        assert table.node_number == 7
+        # The numbering of other simulations is left untouched
+        assert not self.table.innovations
+        assert self.table.node_number == 3
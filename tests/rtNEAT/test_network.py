@@ -357,4 +357,67 @@ class TestNetwork:
             # outputs = network2.activate(np.array(inputs))
             outputs = network2.n_outputs
             assert outputs == n_outputs
-            
\ No newline at end of file
+            
+
+class TestFlatNetwork:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        reset_innovation_table()
+        gen_data = {'n_inputs': 8,
+                    'n_outputs': 9,
+                    'n_actions': 6,
+                    'actions': {f"{i}": [] for i in range(6)}}
+
+        self.genome = Genome.genesis(genome_id=0,
+                                     genome_data=gen_data)
+
+    def grow_genome(self, n_nodes: int) -> None:
+        for _ in range(n_nodes):
+            self.genome._mutate_add_node()
+            self.genome._mutate_add_link(tries=20)
+
+        # Recurrent links between hidden nodes
+        hidden = [node.id for node in self.genome.get_node_genes()
+                  if node.type == NodeType.HIDDEN]
+        for in_node, out_node in zip(hidden, hidden[1:] + hidden[:1]):
+            self.genome.add_link(LinkGene(in_node=in_node,
+                                          out_node=out_node,
+                                          weight=np.random.uniform(-1,1)))
+
+        for link in choice(list(self.genome.link_genes.values()), 5):
+            link.enabled = False
+
+    def assert_same_activations(self, n_activations: int=5):
+        network = Network.genesis(genome=self.genome)
+        flat_network = Network.genesis(genome=self.genome,
+                                       compiled=True)
+
+        assert network.flat is None
+        assert flat_network.flat is not None
+
+        for _ in range(n_activations):
+            inputs = np.random.uniform(-1,1,8)
+            outputs = network.activate(input_values=inputs)
+            flat_outputs = flat_network.activate(input_values=inputs)
+
+            assert list(outputs.items()) == list(flat_outputs.items())
+            for key, node in network.outputs.items():
+                assert flat_network.outputs[key].activation_value == node.activation_value
+
+    def test_minimal_network(self):
+        self.assert_same_activations()
+
+    def test_hidden_network(self):
+        self.grow_genome(n_nodes=10)
+        self.assert_same_activations()
+
+    def test_large_network(self):
+        self.grow_genome(n_nodes=200)
+        self.assert_same_activations()
+
+    def test_compile_wrong_size(self):
+        flat_network = Network.genesis(genome=self.genome,
+                                       compiled=True)
+
+        with pytest.raises(ValueError):
+            flat_network.activate(input_values=np.zeros(7))
@@ -0,0 +1,127 @@
+import pickle
+
+import numpy as np
+import pytest
+from project.src.rtNEAT.arena import BrainArena
+from project.src.rtNEAT.genes import reset_innovation_table
+from project.src.rtNEAT.genome import Genome
+from project.src.rtNEAT.network import Network
+from project.src.rtNEAT.pool import ArenaPool, PackedNetwork
+
+
+class TestArenaPool:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        reset_innovation_table()
+        self.gen_data = {'n_inputs': 8,
+                         'n_outputs': 9,
+                         'n_actions': 6,
+                         'actions': {f"{i}": [] for i in range(6)}}
+
+        self.arena = BrainArena(n_inputs=8,
+                                n_outputs=9,
+                                capacity=2)
+        yield
+
+        self.arena.stop_pool()
+
+    def create_networks(self, n_networks: int):
+        genomes = []
+        for genome_id in range(n_networks):
+            genome = Genome.genesis(genome_id=genome_id,
+                                    genome_data=self.gen_data)
+            for _ in range(genome_id):
+                genome._mutate_add_node()
+                genome._mutate_add_link(tries=20)
+
+            genomes.append(genome)
+
+        # Same networks, activated alone or in the pool
+        alone = [Network.genesis(genome=genome, compiled=True) for genome in genomes]
+        packed = [Network.genesis(genome=genome, compiled=True) for genome in genomes]
+
+        return alone, packed
+
+    def assert_same_activations(self, alone, packed, slots, n_activations=3):
+        for _ in range(n_activations):
+            inputs = np.random.uniform(-1, 1, (len(alone), 8))
+            outputs = self.arena.evaluate(slots=np.array(slots),
+                                          inputs=inputs)
+
+            for network, flat_network, row, output_row in zip(alone, packed,
+                                                               inputs, outputs):
+                expected = network.activate(input_values=row)
+
+                assert flat_network.flat.read_outputs() == expected
+                assert output_row.tolist() == network.flat.values[
+                                                network.flat.output_index].tolist()
+
+    def test_packed_network(self):
+        _, (network,) = self.create_networks(n_networks=1)
+        packed = pickle.loads(pickle.dumps(PackedNetwork(network=network.flat)))
+
+        assert packed.order.tolist() == network.flat.order.tolist()
+        assert packed.weights.tolist() == network.flat.weights.tolist()
+        assert not hasattr(packed, 'outputs')
+
+    def test_start_pool(self):
+        alone, packed = self.create_networks(n_networks=5)
+        slots = [self.arena.add(network=network) for network in packed[:3]]
+
+        self.arena.start_pool(n_workers=2)
+        assert len(self.arena.pool) == 3
+        assert sorted(self.arena.pool.loads) == [1, 2]
+
+        # Added once started
+        slots += [self.arena.add(network=network) for network in packed[3:]]
+        assert len(self.arena.pool) == 5
+
+        self.assert_same_activations(alone=alone,
+                                     packed=packed,
+                                     slots=slots)
+
+    def test_remove(self):
+        alone, packed = self.create_networks(n_networks=4)
+        self.arena.start_pool(n_workers=2)
+        slots = [self.arena.add(network=network) for network in packed]
+
+        self.arena.remove(slot=slots[1])
+        assert len(self.arena.pool) == 3
+        assert sum(self.arena.pool.loads) == 3
+
+        self.assert_same_activations(alone=alone[2:],
+                                     packed=packed[2:],
+                                     slots=slots[2:])
+
+    def test_grow_buffers(self):
+        alone, packed = self.create_networks(n_networks=5)
+        pool = ArenaPool(n_inputs=8,
+                         n_outputs=9,
+                         n_workers=2,
+                         capacity=2)
+
+        for slot, network in enumerate(packed):
+            pool.add(slot=slot,
+                     network=network.flat)
+
+        inputs = np.random.uniform(-1, 1, (5, 8))
+        outputs = pool.evaluate(slots=np.arange(5),
+                                inputs=inputs)
+        pool.close()
+
+        assert pool.capacity >= 5
+        for network, row, output_row in zip(alone, inputs, outputs):
+            network.activate(input_values=row)
+            assert output_row.tolist() == network.flat.values[
+                                            network.flat.output_index].tolist()
+
+    def test_pickle_arena(self):
+        _, packed = self.create_networks(n_networks=2)
+        self.arena.start_pool(n_workers=1)
+        for network in packed:
+            self.arena.add(network=network)
+
+        arena = pickle.loads(pickle.dumps(self.arena))
+
+        assert arena.pool is None
+        assert len(arena) == 2
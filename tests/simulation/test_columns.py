@@ -0,0 +1,107 @@
+import pytest
+from project.src.platform.columns import EnergyStock, EntityColumns
+from project.src.platform.energies import EnergyType
+from project.src.platform.entities import Animal, Status, Tree
+
+
+class TestEntityColumns:
+    def test_create_columns(self):
+        columns = EntityColumns()
+
+        assert type(columns) == EntityColumns
+        assert len(columns) == 0
+        assert set(EntityColumns.COLUMNS).issubset(columns._columns)
+
+    class TestEntityColumnsMethods:
+        @pytest.fixture(autouse=True)
+        def setup(self):
+            self.columns = EntityColumns(capacity=2)
+            self.animal = Animal(animal_id=1,
+                                 position=(1,1),
+                                 size=3,
+                                 blue_energy=12,
+                                 red_energy=27)
+            self.animal._max_age = 20
+            self.tree = Tree(tree_id=2,
+                             position=(2,2),
+                             blue_energy=40,
+                             red_energy=5)
+
+        def test_attach(self):
+            action_cost = self.animal._action_cost
+            assert self.columns.attach(entity=self.animal) == 0
+            assert self.columns.attach(entity=self.tree) == 1
+            assert self.columns.attach(entity=self.animal) == 0
+            assert len(self.columns) == 2
+
+            # Values moved to the columns
+            assert 'age' not in vars(self.animal)
+            assert self.columns['max_age'][0] == 20
+            assert self.columns['blue_energy'][1] == 40
+
+            # Entities read and write their row
+            assert self.animal.size == 3
+            assert self.animal._action_cost == action_cost
+            assert self.animal.energies_stock == {'blue energy': 12, 'red energy': 27}
+            assert isinstance(self.animal.energies_stock, EnergyStock)
+
+            self.animal._increase_age(amount=4)
+            self.animal._gain_energy(energy_type=EnergyType.RED,
+                                     quantity=3)
+            assert self.columns['age'][0] == 4
+            assert self.columns['red_energy'][0] == 30
+
+            self.animal.energies_stock = {'blue energy': 1, 'red energy': 2}
+            assert self.columns['blue_energy'][0] == 1
+
+        def test_detach(self):
+            self.columns.attach(entity=self.animal)
+            self.columns.attach(entity=self.tree)
+            self.animal._increase_age(amount=2)
+
+            self.columns.detach(entity=self.animal)
+            assert self.columns.free_rows == [0]
+            assert len(self.columns) == 1
+
+            # Values are back in the entity
+            assert vars(self.animal)['age'] == 2
+            assert self.animal.energies_stock == {'blue energy': 12, 'red energy': 27}
+            assert type(self.animal.energies_stock) == dict
+
+            # Rows are recycled
+            other = Animal(animal_id=3,
+                           position=(3,3))
+            assert self.columns.attach(entity=other) == 0
+            assert other.age == 0
+
+        def test_grow(self):
+            animals = [Animal(animal_id=i, position=(i,i)) for i in range(5)]
+            for animal in animals:
+                self.columns.attach(entity=animal)
+
+            assert len(self.columns) == 5
+            assert len(self.columns['age']) >= 5
+
+            rows = EntityColumns.get_rows(entities=animals)
+            assert rows.tolist() == [0, 1, 2, 3, 4]
+            assert self.columns.gather(rows=rows[:2],
+                                       names=('age', 'size')).shape == (2, 2)
+
+        def test_age_and_find_dying(self):
+            self.columns.attach(entity=self.animal)
+            self.columns.attach(entity=self.tree)
+            self.tree._max_age = 1
+
+            self.columns.age()
+            assert (self.animal.age, self.tree.age) == (1, 1)
+            assert self.columns.find_dying() == ([], [])
+
+            self.columns.age()
+            self.animal.energies_stock['blue energy'] = 0
+            assert self.columns.find_dying() == ([self.tree], [self.animal])
+
+            # Free rows are not aged
+            self.columns.detach(entity=self.tree)
+            self.columns.age()
+            assert self.tree.age == 2
+            assert self.animal.status == Status.ALIVE
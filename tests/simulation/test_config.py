@@ -0,0 +1,98 @@
+import pickle
+
+import pytest
+from project.src.platform.entities import Animal
+from project.src.platform.running.config import SimContext, config
+from project.src.platform.simulation import Environment, Simulation
+from project.src.rtNEAT.innovation import default_innov_table
+
+
+class TestSimContext:
+    def test_from_config(self):
+        context = SimContext.from_config()
+
+        assert context['Simulation']['grid_width'] == config['Simulation']['grid_width']
+        assert context['NEAT'] == config['NEAT']
+        assert context.difficulty_level == config['Simulation']['difficulty_level']
+
+    def test_overrides(self):
+        init_max_age = config['Simulation']['Entity']['init_max_age']
+        context = SimContext.from_config(overrides={'Simulation': {'Entity': {'init_max_age': 7}}})
+
+        assert context['Simulation']['Entity']['init_max_age'] == 7
+        # Sibling settings kept, process configuration untouched
+        assert context['Simulation']['Entity']['initial_size'] == config['Simulation']['Entity']['initial_size']
+        assert config['Simulation']['Entity']['init_max_age'] == init_max_age
+
+    def test_frozen(self):
+        context = SimContext.from_config()
+
+        with pytest.raises(TypeError):
+            context['Simulation']['grid_width'] = 1
+
+        with pytest.raises(TypeError):
+            context['NEAT']['weight_mutate_prob'] = 1.0
+
+    def test_pickle(self):
+        context = SimContext.from_config(overrides={'Simulation': {'grid_width': 13}})
+        context.set_difficulty_factor(factor=2.0)
+
+        loaded_context = pickle.loads(pickle.dumps(context))
+
+        assert loaded_context['Simulation']['grid_width'] == 13
+        assert loaded_context.difficulty_factor == 2.0
+        with pytest.raises(TypeError):
+            loaded_context['Simulation']['grid_width'] = 1
+
+    def test_set_difficulty(self):
+        difficulty_level = config['Simulation']['difficulty_level']
+        context = SimContext.from_config(overrides={'Simulation': {'difficulty_min': 1,
+                                                                   'difficulty_max': 4}})
+
+        context.set_difficulty_factor(factor=2.0)
+        assert context.set_difficulty(new_difficulty=1.5) == 3.0
+        assert context.set_difficulty(new_difficulty=5) == 4
+        assert context.set_difficulty(new_difficulty=0) == 1
+
+        assert config['Simulation']['difficulty_level'] == difficulty_level
+
+
+class TestSideBySide:
+    def test_environment_context(self):
+        context = SimContext.from_config(overrides={'Simulation': {'grid_width': 12,
+                                                                   'grid_height': 9}})
+        env = Environment(env_id=1,
+                          context=context)
+
+        assert env.context is context
+        assert env.dimensions == (12, 9)
+
+    def test_simulations(self):
+        contexts = [SimContext.from_config(overrides={'Simulation': {'Entity': {'init_max_age': max_age}}})
+                    for max_age in (50, 80)]
+        simulations = [Simulation(sim_id=sim_id,
+                                  dimensions=(10, 10),
+                                  context=context)
+                       for sim_id, context in enumerate(contexts)]
+
+        for simulation in simulations:
+            simulation.init(populate=False)
+
+        animals = [simulation.environment.spawn_animal(coordinates=(5, 5))
+                   for simulation in simulations]
+
+        for animal, simulation, max_age in zip(animals, simulations, (50, 80)):
+            assert isinstance(animal, Animal)
+            assert animal.context is simulation.context
+            assert animal.max_age == max_age
+
+        # Innovations numbered by each simulation
+        assert simulations[0].innov_table is contexts[0].innov_table
+        assert simulations[0].innov_table is not simulations[1].innov_table
+        assert simulations[0].innov_table is not default_innov_table
+
+        # Difficulty adjusted in one simulation only
+        contexts[0].set_difficulty_factor(factor=3.0)
+        contexts[0].set_difficulty(new_difficulty=2)
+
+        assert contexts[1].difficulty_level == config['Simulation']['difficulty_level']
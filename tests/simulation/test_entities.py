@@ -730,6 +730,23 @@ class TestAnimal:
                 assert sum(inputs[12:21]) == 3
                 assert sum(inputs[21:]) == 75*0 """
 
+            def test_find_closest_object_inputs(self):
+                objects = {BlueEnergy(position=(7,4)),
+                           BlueEnergy(position=(3,8)),
+                           BlueEnergy(position=(15,15))}
+
+                norm_distance, norm_angle = self.animal._find_closest_object_inputs(objects_around=objects,
+                                                                                    sight_range=5)
+
+                closest = BlueEnergy(position=(7,4))
+                distance = self.animal.pos.distance(other_pos=closest.pos)
+                assert norm_distance == (5 - distance)/4
+                assert norm_angle == self.animal.pos.norm_angle(other_pos=closest.pos)
+
+                # Out of sight
+                assert self.animal._find_closest_object_inputs(objects_around={BlueEnergy(position=(15,15))},
+                                                               sight_range=5) == (-1, -1)
+
 
             def test_activate_mind(self):
                 
@@ -0,0 +1,69 @@
+import pytest
+from project.src.platform.energies import BlueEnergy, RedEnergy
+from project.src.platform.expiry import ExpiryWheel
+
+
+class TestExpiryWheel:
+    def test_create_wheel(self):
+        wheel = ExpiryWheel()
+
+        assert type(wheel) == ExpiryWheel
+        assert len(wheel) == 0
+
+    class TestExpiryWheelMethods:
+        @pytest.fixture(autouse=True)
+        def setup(self):
+            self.wheel = ExpiryWheel()
+            self.energies = [BlueEnergy(energy_id=i,
+                                        position=(i,0),
+                                        quantity=10) for i in range(4)]
+
+        def test_schedule(self):
+            for cycle, energy in enumerate(self.energies):
+                self.wheel.schedule(resource=energy,
+                                    cycle=cycle)
+
+            assert len(self.wheel) == 4
+            assert self.energies[2] in self.wheel
+
+            # Rescheduling moves the resource
+            self.wheel.schedule(resource=self.energies[0],
+                                cycle=3)
+            assert len(self.wheel) == 4
+            assert self.wheel.pop_expired(cycle=2) == self.energies[1:3]
+            assert self.wheel.pop_expired(cycle=3) == [self.energies[3], self.energies[0]]
+            assert len(self.wheel) == 0
+
+        def test_cancel(self):
+            for energy in self.energies:
+                self.wheel.schedule(resource=energy,
+                                    cycle=5)
+
+            self.wheel.cancel(resource=self.energies[1])
+            self.wheel.cancel(resource=self.energies[1])
+            assert self.energies[1] not in self.wheel
+
+            assert self.wheel.pop_expired(cycle=5) == [self.energies[0]] + self.energies[2:]
+
+        def test_pop_expired(self):
+            self.wheel.schedule(resource=self.energies[0],
+                                cycle=2)
+            assert self.wheel.pop_expired(cycle=1) == []
+            # Skipped cycles are emptied too
+            assert self.wheel.pop_expired(cycle=4) == [self.energies[0]]
+
+            # Resources scheduled in an emptied cycle expire in the next one
+            self.wheel.schedule(resource=self.energies[1],
+                                cycle=3)
+            assert self.wheel.pop_expired(cycle=4) == []
+            assert self.wheel.pop_expired(cycle=5) == [self.energies[1]]
+
+        def test_shared_ids(self):
+            red = RedEnergy(energy_id=0,
+                            position=(0,1),
+                            quantity=10)
+            self.wheel.schedule(resource=self.energies[0], cycle=1)
+            self.wheel.schedule(resource=red, cycle=1)
+            self.wheel.cancel(resource=self.energies[0])
+
+            assert self.wheel.pop_expired(cycle=1) == [red]
@@ -6,7 +6,7 @@ import pytest
 from project.src.platform.energies import (BlueEnergy, Energy, EnergyType,
                                            RedEnergy, Resource)
 from project.src.platform.entities import Animal, Entity, Tree
-from project.src.platform.grid import Grid, SubGrid
+from project.src.platform.grid import CellKind, Grid, SubGrid, get_cell_kind
 from project.src.platform.simulation import Environment
 
 
@@ -411,3 +411,134 @@ class TestSubGrid:
 
                 assert not_none(subregion) == i
 
+
+        def test_sub_region_view(self):
+            self.env.create_energy(energy_type=EnergyType.BLUE,
+                                   quantity=10,
+                                   coordinates=(10,10))
+
+            subregion = self.grid.resource_grid.get_sub_region(initial_pos=(10,10),
+                                                               radius=2)
+
+            assert subregion.shape == (5,5)
+            assert np.shares_memory(subregion, self.grid.resource_grid.array)
+            assert subregion[2,2] == self.grid.resource_grid.get_cell_value(coordinates=(10,10))
+            assert not subregion.flags.writeable
+
+        def test_sub_region_padded(self):
+            energy = self.env.create_energy(energy_type=EnergyType.BLUE,
+                                            quantity=10,
+                                            coordinates=(0,1))
+
+            subregion = self.grid.resource_grid.get_sub_region(initial_pos=(0,0),
+                                                               radius=2)
+
+            assert subregion.shape == (5,5)
+            assert not np.shares_memory(subregion, self.grid.resource_grid.array)
+            assert subregion[2,3] == energy
+            assert sum(x is not None for x in subregion.flatten()) == 1
+
+            # Opposite corner
+            subregion = self.grid.resource_grid.get_sub_region(initial_pos=(39,39),
+                                                               radius=1)
+
+            assert subregion.shape == (3,3)
+            assert sum(x is not None for x in subregion.flatten()) == 0
+
+        def test_sub_region_color(self):
+            self.grid.modify_cell_color(coordinates=(0,0),
+                                        color=(10,20,30))
+
+            subregion = self.grid.color_grid.get_sub_region(initial_pos=(0,0),
+                                                            radius=1)
+
+            assert subregion.shape == (3,3,3)
+            assert tuple(subregion[1,1]) == (10,20,30)
+            assert (subregion[0] == -255).all()
+            assert (subregion[:,0] == -255).all()
+            assert (subregion[2,2] == 255).all()
+
+            subregion = self.grid.color_grid.get_sub_region(initial_pos=(5,5),
+                                                            radius=1)
+
+            assert subregion.dtype == np.uint8
+            assert (subregion == 255).all()
+
+        def test_occupancy_layers(self):
+            tree = self.env.spawn_tree(coordinates=(1,1))
+            energy = self.env.create_energy(energy_type=EnergyType.RED,
+                                            quantity=10,
+                                            coordinates=(1,1))
+
+            assert self.grid.entity_kinds[1,1] == CellKind.TREE
+            assert self.grid.entity_ids[1,1] == tree.id
+            assert self.grid.resource_kinds[1,1] == CellKind.RED_ENERGY
+            assert self.grid.resource_ids[1,1] == energy.id
+
+            self.grid.place_entity(value=self.animal)
+            assert self.grid.entity_kinds[2,5] == CellKind.ANIMAL
+
+            self.entity_grid.update_cell(new_coordinates=(5,5),
+                                         value=self.animal)
+
+            assert self.grid.entity_kinds[2,5] == CellKind.EMPTY
+            assert self.grid.entity_ids[2,5] == 0
+            assert self.grid.entity_kinds[5,5] == CellKind.ANIMAL
+            assert self.grid.entity_ids[5,5] == self.animal.id
+
+            self.grid.remove_entity(entity=tree)
+            assert self.grid.entity_kinds[1,1] == CellKind.EMPTY
+
+        def test_find_vacant_coordinates(self):
+            self.grid.place_entity(value=self.animal)
+
+            vacant = self.entity_grid.find_vacant_coordinates(coordinates=[(2,5), (1,1), (-1,0),
+                                                                           (40,3), (1,1), (3,3)])
+
+            assert vacant.tolist() == [False, True, False, False, False, True]
+
+        def test_place_many_on_grid(self):
+            animals = [Animal(animal_id=7, position=(1,1)),
+                       Animal(animal_id=8, position=(2,3))]
+
+            self.grid.place_entities(values=animals,
+                                     coordinates=[(1,1), (2,3)])
+
+            assert self.entity_grid.get_cell_value(coordinates=(1,1)) is animals[0]
+            assert self.entity_grid.get_cell_value(coordinates=(2,3)) is animals[1]
+            assert self.grid.entity_kinds[2,3] == CellKind.ANIMAL
+            assert self.grid.entity_ids[2,3] == 8
+
+        def test_cell_kind(self):
+            assert get_cell_kind(Animal) == CellKind.ANIMAL
+            assert get_cell_kind(BlueEnergy) & CellKind.ENERGY
+            assert get_cell_kind(Tree) & CellKind.ENTITY
+            assert not get_cell_kind(Tree) & CellKind.ANIMAL
+            assert get_cell_kind(int) == CellKind.EMPTY
+
+        def test_find_instances_masks(self):
+            tree = self.env.spawn_tree(coordinates=(0,1))
+            animal1 = self.env.spawn_animal(coordinates=(1,1))
+            animal2 = self.env.spawn_animal(coordinates=(3,3))
+
+            assert self.entity_grid.find_instances_baseclass_around(coordinates=(1,1),
+                                                                    base_class=Entity) == {tree}
+
+            assert self.entity_grid.find_instances_baseclass_around(coordinates=(1,1),
+                                                                    base_class=Animal,
+                                                                    include_self=True,
+                                                                    radius=2) == {animal1, animal2}
+
+            # Closest ring only
+            assert self.entity_grid.find_closest_instances_baseclass(coordinates=(1,1),
+                                                                     base_class=Entity,
+                                                                     radius=3) == {tree}
+
+            assert self.entity_grid.find_closest_instances_baseclass(coordinates=(0,1),
+                                                                     base_class=Animal,
+                                                                     radius=4) == {animal1}
+
+            occupied = self.entity_grid.are_instance_baseclass_around(coordinates=(0,0),
+                                                                      base_class=Entity)
+            assert occupied.shape == (8,)
+            assert occupied.sum() == 2
@@ -0,0 +1,57 @@
+import pytest
+from project.src.platform.islands import (Archipelago, Topology,
+                                          select_emigrants)
+from project.src.platform.simulation import Simulation
+
+
+class TestMigration:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.simulation = Simulation(sim_id=0,
+                                     dimensions=(10, 10))
+        self.simulation.init(populate=False)
+        self.environment = self.simulation.environment
+
+    def test_select_emigrants(self):
+        animals = self.environment.spawn_animals(coordinates=[(1, 1), (2, 2), (3, 3)])
+        animals[0].gained_energy = 5
+        animals[2].gained_energy = 20
+
+        emigrants = select_emigrants(simulation=self.simulation,
+                                     n_migrants=2)
+
+        assert emigrants == [animals[2].brain.genotype, animals[0].brain.genotype]
+
+    def test_spawn_immigrants(self):
+        genomes = [animal.brain.genotype for animal
+                   in self.environment.spawn_animals(coordinates=[(1, 1), (2, 2)])]
+
+        immigrants = self.environment.spawn_immigrants(genomes=genomes,
+                                                       blue_energy=30)
+
+        assert len(immigrants) == 2
+        for immigrant, genome in zip(immigrants, genomes):
+            assert immigrant.brain.genotype is genome
+            assert immigrant.brain.id == immigrant.id
+            assert immigrant.brain.arena is self.environment.animal_arena
+            assert immigrant.energies_stock['blue energy'] == 30
+            assert self.environment.grid.entity_grid.get_cell_value(coordinates=immigrant.position) is immigrant
+
+
+def test_archipelago():
+    archipelago = Archipelago(n_islands=2,
+                              topology=Topology.RING,
+                              migration_interval=1,
+                              n_migrants=1,
+                              dimensions=(15, 15),
+                              seed=1)
+    try:
+        assert archipelago._get_destinations().tolist() == [1, 0]
+        statistics = archipelago.run(n_epochs=1)
+
+        assert archipelago.epoch == 1
+        assert [island['cycle'] for island in statistics] == [1, 1]
+    finally:
+        archipelago.close()
+
+    assert not any(process.is_alive() for process in archipelago._processes)
@@ -0,0 +1,73 @@
+import pytest
+from project.src.platform.lineage import Lineage
+
+
+class TestLineage:
+    def test_create_lineage(self):
+        lineage = Lineage()
+
+        assert type(lineage) == Lineage
+        assert len(lineage) == 0
+        assert lineage.max_depth == 0
+
+    class TestLineageMethods:
+        @pytest.fixture(autouse=True)
+        def setup(self):
+            # 1 + 2 -> 5, 3 + 4 -> 6, 5 + 6 -> 7 and 8, 7 + 9 -> 10
+            self.lineage = Lineage(capacity=4)
+            for child_id, parents in {5: (1, 2),
+                                      6: (3, 4),
+                                      7: (5, 6),
+                                      8: (5, 6),
+                                      10: (7, 9)}.items():
+                self.lineage.add_birth(child_id, *parents)
+
+        def test_add_birth(self):
+            assert len(self.lineage) == 5
+            assert len(self.lineage._parents) >= 11
+            assert self.lineage.get_parents(entity_id=7) == (5, 6)
+            assert self.lineage.get_parents(entity_id=1) == (0, 0)
+            assert self.lineage.get_parents(entity_id=100) == (0, 0)
+
+        def test_get_ancestors(self):
+            assert self.lineage.get_ancestors(entity_id=1).tolist() == []
+            assert self.lineage.get_ancestors(entity_id=5).tolist() == [1, 2]
+            assert self.lineage.get_ancestors(entity_id=10).tolist() == [1, 2, 3, 4, 5, 6, 7, 9]
+
+            self.lineage.forget(entity_id=10)
+            assert 10 not in self.lineage._ancestors
+
+        def test_max_depth(self):
+            self.lineage.max_depth = 1
+            assert self.lineage.get_ancestors(entity_id=10).tolist() == [7, 9]
+
+            self.lineage.max_depth = 2
+            self.lineage.forget(entity_id=10)
+            assert self.lineage.get_ancestors(entity_id=10).tolist() == [5, 6, 7, 9]
+
+        def test_is_ancestor(self):
+            assert self.lineage.is_ancestor(entity_id=10, ancestor_id=3)
+            assert not self.lineage.is_ancestor(entity_id=10, ancestor_id=8)
+            assert not self.lineage.is_ancestor(entity_id=1, ancestor_id=10)
+
+        def test_are_kin(self):
+            # Siblings
+            assert self.lineage.are_kin(entity1_id=7, entity2_id=8)
+            # Descendant
+            assert self.lineage.are_kin(entity1_id=10, entity2_id=5)
+            assert self.lineage.are_kin(entity1_id=5, entity2_id=10)
+            # Unrelated
+            assert not self.lineage.are_kin(entity1_id=5, entity2_id=6)
+            assert not self.lineage.are_kin(entity1_id=8, entity2_id=9)
+            # First generation has no kin
+            assert not self.lineage.are_kin(entity1_id=1, entity2_id=5)
+
+        def test_export_ancestry(self):
+            records = self.lineage.export_ancestry(entity_id=10)
+            assert records.tolist() == [[5, 1, 2], [6, 3, 4], [7, 5, 6], [10, 7, 9]]
+            assert self.lineage.export_ancestry(entity_id=1).tolist() == []
+
+            lineage = Lineage()
+            lineage.import_ancestry(records=records)
+            assert lineage.get_ancestors(entity_id=10).tolist() == [1, 2, 3, 4, 5, 6, 7, 9]
+            assert not lineage.are_kin(entity1_id=7, entity2_id=8)
@@ -0,0 +1,53 @@
+import json
+
+from project.src.platform.running.scheduler import (Job, Sweep,
+                                                    read_completed, run_sweep)
+
+
+def test_sweep():
+    sweep = Sweep(config_files=["a.json", "b.json"],
+                  repetitions=3,
+                  seeds=(1, 2),
+                  n_cycles=5)
+    jobs = list(sweep)
+
+    assert len(sweep) == len(jobs) == 12
+    assert len({job.key for job in jobs}) == 12
+    assert jobs[0] == Job(config_file="a.json",
+                          repetition=0,
+                          seed=1,
+                          n_cycles=5)
+
+
+def test_read_completed(tmp_path):
+    results_file = tmp_path / "results.jsonl"
+    results_file.write_text(json.dumps({'key': 'a|0|1', 'cycles': 3}) + "\n"
+                            + json.dumps({'key': 'a|1|1', 'error': 'ValueError()'}) + "\n"
+                            + '{"key": "a|2')
+
+    assert read_completed(results_file=str(results_file)) == {'a|0|1'}
+    assert read_completed(results_file=str(tmp_path / "missing.jsonl")) == set()
+
+
+def test_run_sweep(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps({"Run": {"parameter": "test"}}))
+    results_file = str(tmp_path / "results.jsonl")
+    sweep = Sweep(config_files=[str(config_file), str(tmp_path / "missing.json")],
+                  seeds=(1, 2),
+                  n_cycles=1)
+
+    report = run_sweep(sweep=sweep,
+                       results_file=results_file,
+                       max_workers=2)
+
+    assert (report['run'], report['skipped'], report['failed']) == (4, 0, 2)
+    results = [json.loads(line) for line in open(results_file, encoding="utf-8")]
+    assert sorted(result['cycles'] for result in results if 'error' not in result) == [1, 1]
+
+    # Resumed, only the failed jobs run again
+    report = run_sweep(sweep=sweep,
+                       results_file=results_file,
+                       max_workers=2)
+
+    assert (report['run'], report['skipped']) == (2, 2)
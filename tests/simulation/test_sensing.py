@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from project.src.platform.energies import EnergyType
+from project.src.platform.grid import CellKind
+from project.src.platform.sensing import Senses, find_closest_inputs
+from project.src.platform.simulation import Environment
+
+
+class TestSenses:
+    def test_create_senses(self):
+        senses = Senses()
+
+        assert type(senses) == Senses
+        assert senses.animal_inputs.shape == (0, 8)
+        assert senses.tree_inputs.shape == (0, 6)
+
+    class TestSensesMethods:
+        @pytest.fixture(autouse=True)
+        def setup(self):
+            self.env = Environment(env_id=0)
+            self.env.init()
+
+            self.animal1 = self.env.spawn_animal(coordinates=(5,5))
+            self.animal2 = self.env.spawn_animal(coordinates=(7,6))
+            self.animal3 = self.env.spawn_animal(coordinates=(0,0))
+            self.tree = self.env.spawn_tree(coordinates=(20,20))
+
+            self.env.create_energy(energy_type=EnergyType.BLUE,
+                                   quantity=10,
+                                   coordinates=(4,5))
+
+            self.env.create_energy(energy_type=EnergyType.RED,
+                                   quantity=10,
+                                   coordinates=(20,21))
+
+        def test_sense_shapes(self):
+            self.env.sense()
+
+            assert self.env.senses.animal_inputs.shape == (3, 8)
+            assert self.env.senses.tree_inputs.shape == (1, 6)
+
+        def test_sense_matches_entities(self):
+            self.env.sense()
+
+            for entity in (self.animal1, self.animal2, self.animal3, self.tree):
+                sensed = self.env.get_sensed_inputs(entity=entity)
+
+                # Entities think after having aged
+                entity.age += 1
+                expected = entity._normalize_inputs(environment=self.env)
+
+                assert sensed == pytest.approx(expected)
+
+        def test_nothing_visible(self):
+            self.env.sense()
+
+            inputs = self.env.get_sensed_inputs(entity=self.animal3)
+            assert tuple(inputs[4:]) == (-1, -1, -1, -1)
+
+        def test_find_closest_inputs(self):
+            positions = np.array([[5, 5], [39, 39]])
+            inputs = find_closest_inputs(positions=positions,
+                                         kinds=self.env.grid.entity_kinds,
+                                         kind=CellKind.ANIMAL,
+                                         sight_range=5)
+
+            assert inputs[0] == pytest.approx((self.animal1._find_closest_object_inputs(
+                                                    objects_around={self.animal2},
+                                                    sight_range=5)))
+            assert tuple(inputs[1]) == (-1, -1)
+
+        def test_unsensed_entity(self):
+            self.env.sense()
+            animal = self.env.spawn_animal(coordinates=(10,10))
+
+            assert self.env.get_sensed_inputs(entity=animal) is None
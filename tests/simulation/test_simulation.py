@@ -2,8 +2,8 @@ import random
 
 import pytest
 from project.src.platform.energies import BlueEnergy, EnergyType, RedEnergy
-from project.src.platform.entities import Direction, Tree
-from project.src.platform.grid import Grid
+from project.src.platform.entities import Direction, Status, Tree
+from project.src.platform.grid import CellKind, Grid
 from project.src.platform.simulation import Environment, Simulation
 from project.src.platform.universal import SimulatedObject
 
@@ -118,6 +118,84 @@ class TestEnvironment:
             assert self.state.energies[1] == energy2
             assert len(self.state.energies) == 1
 
+        def test_create_energies(self):
+            self.env.create_energy(energy_type=EnergyType.RED,
+                                   quantity=5,
+                                   coordinates=(2,2))
+
+            energies = self.env.create_energies(energy_types=[EnergyType.BLUE, EnergyType.RED,
+                                                              EnergyType.BLUE, EnergyType.RED,
+                                                              EnergyType.BLUE],
+                                                quantities=[12, 7, 0, 3, 9],
+                                                coordinates=[(1,1), (2,2), (3,3), (4,4), (1,1)])
+
+            # Occupied cell, empty quantity and duplicate skipped
+            assert [energy.__class__.__name__ for energy in energies] == ['BlueEnergy', 'RedEnergy']
+            assert [energy.id for energy in energies] == [2, 3]
+            assert [energy.position for energy in energies] == [(1,1), (4,4)]
+            assert [energy.quantity for energy in energies] == [12, 3]
+
+            assert self.state.get_energy_id() == 4
+            assert self.grid.resource_grid.get_cell_value(coordinates=(4,4)) is energies[1]
+            assert self.state.energies[3] is energies[1]
+            assert energies[0] in self.env.expiries
+            assert self.env.spatial_index.find_around(kinds=CellKind.ENERGY,
+                                                      coordinates=(4,4),
+                                                      radius=0,
+                                                      include_self=True) == {energies[1]}
+
+        def test_spawn_entities(self):
+            self.env.spawn_tree(coordinates=(1,1))
+
+            animals = self.env.spawn_animals(coordinates=[(1,1), (2,2), (50,2), (3,3)],
+                                             size=3)
+            trees = self.env.spawn_trees(coordinates=[(2,2), (4,4)])
+
+            assert [animal.id for animal in animals] == [2, 3]
+            assert [animal.position for animal in animals] == [(2,2), (3,3)]
+            assert all(animal.size == 3 for animal in animals)
+            assert [tree.id for tree in trees] == [4]
+
+            assert self.state.get_entity_id() == 5
+            assert self.state.n_animals == 2
+            assert self.state.n_trees == 2
+            assert self.grid.entity_grid.get_cell_value(coordinates=(3,3)) is animals[1]
+            assert animals[0].lineage is self.state.lineage
+            assert animals[0]._row >= 0
+
+        def test_id_stride(self):
+            self.state.id_stride = 4
+            self.state.next_entity_id = 3
+
+            animals = self.env.spawn_animals(coordinates=[(1,1), (2,2), (3,3)])
+            assert [animal.id for animal in animals] == [3, 7, 11]
+            assert self.state.get_entity_id() == 15
+            assert list(self.state.allocate_energy_ids(amount=2)) == [1, 5]
+
+        def test_populated_area(self):
+            env = Environment(env_id=2,
+                              dimensions=(60,60))
+            env.populated_area = (10, 20, 30, 25)
+            env.init()
+            state = env._populate_with_item(sparsity=2,
+                                            item='energy')
+
+            positions = [energy.position for energy in state.energies.values()]
+            assert positions
+            assert all(10 <= x < 30 and 20 <= y < 25 for x, y in positions)
+
+        def test_populate(self):
+            env = Environment(env_id=2,
+                              dimensions=(60,60))
+            env.init()
+            state = env._populate_with_item(sparsity=4,
+                                            item='energy')
+
+            positions = [energy.position for energy in state.energies.values()]
+            assert len(positions) == len(set(positions))
+            assert all(0 <= x < 60 and 0 <= y < 60 for x, y in positions)
+            assert sorted(state.energies) == list(range(1, state.get_energy_id()))
+
         def test_create_seed_from_tree(self):
             position = (1,1)
             tree = self.env.spawn_tree(coordinates=position,
@@ -188,6 +266,134 @@ class TestEnvironment:
 
             assert len(self.state.energies) == 0
 
+        def test_registers(self):
+            animal = self.env.spawn_animal(coordinates=(1,1))
+            tree = self.env.spawn_tree(coordinates=(5,5))
+            energy1 = self.env.create_energy(coordinates=(1,2),
+                                             energy_type=EnergyType.BLUE,
+                                             quantity=10)
+            energy2 = self.env.create_energy(coordinates=(1,3),
+                                             energy_type=EnergyType.RED,
+                                             quantity=10)
+
+            assert self.state.entities == {animal.id: animal, tree.id: tree}
+            assert self.state.get_entities() == [animal, tree]
+            assert self.state.n_entities == 2
+
+            # The seed shares its id with an energy and takes precedence
+            seed = self.env._create_seed_from_tree(tree=tree)
+            self.env.remove_entity(entity=tree)
+            assert seed.id == energy2.id
+
+            assert self.state.entities == {animal.id: animal}
+            assert self.state.resources == self.state.energies | self.state.seeds
+            assert self.state.n_resources == 2
+
+            self.env.remove_resource(resource=seed)
+            assert self.state.resources == {energy1.id: energy1, energy2.id: energy2}
+
+            # Snapshots can be iterated while the registers change
+            for resource in self.state.get_resources():
+                self.env.remove_resource(resource=resource)
+
+            assert self.state.resources == {}
+            assert self.state.n_resources == 0
+
+        def test_age_entities(self):
+            animal1 = self.env.spawn_animal(coordinates=(1,1))
+            animal2 = self.env.spawn_animal(coordinates=(3,3))
+            tree = self.env.spawn_tree(coordinates=(5,5))
+            animal1._max_age = 1
+            tree.energies_stock['blue energy'] = 0
+
+            self.env.age_entities()
+            assert [entity.age for entity in (animal1, animal2, tree)] == [1, 1, 1]
+            assert animal1.status != Status.DEAD
+            assert tree.status == Status.DEAD
+
+            self.env.age_entities()
+            assert animal1.status == Status.DEAD
+            assert animal2.status != Status.DEAD
+
+        def test_expire_resources(self):
+            energy1 = self.env.create_energy(coordinates=(1,1),
+                                             energy_type=EnergyType.BLUE,
+                                             quantity=10,
+                                             expiry=2)
+            energy2 = self.env.create_energy(coordinates=(1,2),
+                                             energy_type=EnergyType.RED,
+                                             quantity=10,
+                                             expiry=3)
+            picked = self.env.create_energy(coordinates=(1,3),
+                                            energy_type=EnergyType.RED,
+                                            quantity=10,
+                                            expiry=2)
+            self.env.remove_resource(resource=picked)
+            assert len(self.env.expiries) == 2
+
+            for cycle in range(1, 4):
+                self.state.new_cycle()
+                assert energy1.get_age(cycle=self.state.cycle) == cycle
+                self.env.expire_resources()
+
+                assert (energy1.id in self.state.energies) == (cycle < 2)
+                assert (energy2.id in self.state.energies) == (cycle < 3)
+
+            assert len(self.env.expiries) == 0
+            assert not self.grid.resource_grid.get_cell_value(coordinates=(1,2))
+
+        def test_brain_arenas(self):
+            animal = self.env.spawn_animal(coordinates=(1,1))
+            tree = self.env.spawn_tree(coordinates=(5,5))
+
+            assert animal.brain.arena is self.env.animal_arena
+            assert tree.brain.arena is self.env.tree_arena
+
+            self.env.remove_entity(entity=animal)
+            assert animal.brain.arena is None
+            assert len(self.env.animal_arena) == 0
+
+        def test_check_incest(self):
+            parent1 = self.env.spawn_animal(coordinates=(1,1))
+            parent2 = self.env.spawn_animal(coordinates=(1,3))
+            child1 = self.env.spawn_animal(coordinates=(3,1))
+            child2 = self.env.spawn_animal(coordinates=(3,3))
+            for child in (child1, child2):
+                child.on_birth(parent1=parent1,
+                               parent2=parent2)
+
+            assert child1.parents == (parent1.id, parent2.id)
+            assert child1.ancestors.tolist() == sorted([parent1.id, parent2.id])
+
+            assert self.env._check_incest(parent1=parent1, parent2=parent2)
+            assert not self.env._check_incest(parent1=child1, parent2=child2)
+            assert not self.env._check_incest(parent1=child1, parent2=parent1)
+
+            # Dead ancestors are only remembered by their ids
+            self.env.remove_entity(entity=parent1)
+            assert self.env.state.lineage.is_ancestor(entity_id=child1.id,
+                                                      ancestor_id=parent1.id)
+
+        def test_think(self):
+            animal1 = self.env.spawn_animal(coordinates=(1,1))
+            animal2 = self.env.spawn_animal(coordinates=(3,2))
+            tree = self.env.spawn_tree(coordinates=(5,5))
+
+            self.env.sense()
+            self.env.think()
+
+            for entity in (animal1, animal2, tree):
+                thoughts = self.env.get_thoughts(entity=entity)
+
+                # Same outputs as the recursive activation of the network
+                mind = entity.brain.phenotype
+                mind.flat = None
+                inputs = self.env.get_sensed_inputs(entity=entity)
+                assert thoughts == pytest.approx(mind.activate(input_values=inputs))
+
+                # Thoughts are only read once
+                assert self.env.get_thoughts(entity=entity) is None
+
         def test_find_entities_around(self):
             coordinates = (1,1)
             animal = self.env.spawn_animal(coordinates=coordinates)
@@ -316,6 +522,32 @@ class TestEnvironment:
             assert animal.position == (3,3)
             assert self.entity_grid.get_cell_value(coordinates=(3,3)) == animal
 
+        def test_act_in_id_order(self):
+            animal = self.animal
+            animal2 = self.env.spawn_animal(coordinates=(5,3))
+            for entity in (animal, animal2):
+                entity._gain_energy(energy_type=EnergyType.BLUE,
+                                    quantity=1000)
+                entity.actions = []
+
+            # Both move into (4,3), the oldest wins
+            animal._action_move(Direction.RIGHT)
+            animal2._action_move(Direction.LEFT)
+            self.env.act(entities=[animal2, animal])
+
+            assert animal.position == (4,3)
+            assert animal2.position == (5,3)
+            assert self.entity_grid.get_cell_value(coordinates=(4,3)) == animal
+
+            # Removed entities do not act
+            self.env.remove_entity(entity=animal)
+            animal.actions = []
+            animal._action_move(Direction.DOWN)
+            self.env.act(entities=[animal, animal2])
+
+            assert animal.position == (4,3)
+            assert self.entity_grid.get_cell_value(coordinates=(4,4)) == None
+
         def test_move_occupied_cell(self):
             animal = self.animal
             animal2 = self.env.spawn_animal(coordinates=(3,4))
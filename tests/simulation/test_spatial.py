@@ -0,0 +1,126 @@
+import pytest
+from project.src.platform.actions import MoveAction
+from project.src.platform.energies import BlueEnergy, EnergyType
+from project.src.platform.entities import Animal, Tree
+from project.src.platform.grid import CellKind
+from project.src.platform.simulation import Environment
+from project.src.platform.spatial import SpatialIndex
+
+
+class TestSpatialIndex:
+    def test_create_spatial_index(self):
+        index = SpatialIndex()
+
+        assert type(index) == SpatialIndex
+        assert index.bucket_size == SpatialIndex.BUCKET_SIZE
+        assert len(index) == 0
+
+    class TestSpatialIndexMethods:
+        @pytest.fixture(autouse=True)
+        def setup(self):
+            self.index = SpatialIndex(bucket_size=4)
+
+            self.animal1 = Animal(animal_id=1, position=(5,5))
+            self.animal2 = Animal(animal_id=2, position=(7,5))
+            self.tree = Tree(tree_id=3, position=(6,6))
+            self.energy = BlueEnergy(energy_id=1, position=(5,5))
+
+            for obj in (self.animal1, self.animal2, self.tree, self.energy):
+                self.index.insert(obj=obj)
+
+        def test_insert(self):
+            assert len(self.index) == 4
+            assert self.animal1 in self.index
+            assert self.energy in self.index
+
+        def test_remove(self):
+            self.index.remove(obj=self.animal2)
+
+            assert len(self.index) == 3
+            assert self.animal2 not in self.index
+
+            # Removing twice is harmless
+            self.index.remove(obj=self.animal2)
+            assert len(self.index) == 3
+
+        def test_find_around(self):
+            assert self.index.find_around(kinds=CellKind.ANIMAL,
+                                          coordinates=(5,5),
+                                          radius=2) == {self.animal2}
+
+            assert self.index.find_around(kinds=CellKind.ANIMAL,
+                                          coordinates=(5,5),
+                                          radius=2,
+                                          include_self=True) == {self.animal1, self.animal2}
+
+            assert self.index.find_around(kinds=CellKind.ENTITY,
+                                          coordinates=(5,5),
+                                          radius=1) == {self.tree}
+
+            assert self.index.find_around(kinds=CellKind.ENERGY,
+                                          coordinates=(6,6),
+                                          radius=1) == {self.energy}
+
+        def test_find_closest(self):
+            assert self.index.find_closest(kinds=CellKind.ENTITY,
+                                           coordinates=(5,5),
+                                           radius=3) == {self.tree}
+
+            assert self.index.find_closest(kinds=CellKind.ANIMAL,
+                                           coordinates=(5,5),
+                                           radius=3) == {self.animal2}
+
+            # Rings searched up to radius - 1
+            assert self.index.find_closest(kinds=CellKind.ANIMAL,
+                                           coordinates=(5,5),
+                                           radius=2) == set()
+
+        def test_move(self):
+            self.index.move(obj=self.animal2,
+                            coordinates=(20,20))
+
+            assert self.index.find_around(kinds=CellKind.ANIMAL,
+                                          coordinates=(5,5),
+                                          radius=3) == set()
+
+            assert self.index.find_around(kinds=CellKind.ANIMAL,
+                                          coordinates=(19,19),
+                                          radius=1) == {self.animal2}
+
+    class TestEnvironmentIndex:
+        @pytest.fixture(autouse=True)
+        def setup(self):
+            self.env = Environment(env_id=0)
+            self.env.init()
+            self.index = self.env.spatial_index
+
+        def test_index_follows_environment(self):
+            animal = self.env.spawn_animal(coordinates=(5,5))
+            energy = self.env.create_energy(energy_type=EnergyType.BLUE,
+                                            quantity=10,
+                                            coordinates=(7,7))
+
+            assert animal in self.index
+            assert energy in self.index
+
+            self.env._on_animal_move(animal=animal,
+                                     action=MoveAction(coordinates=(6,6)))
+
+            assert self.index.find_around(kinds=CellKind.ANIMAL,
+                                          coordinates=(6,6),
+                                          include_self=True,
+                                          radius=0) == {animal}
+
+            self.env.remove_resource(resource=energy)
+            assert energy not in self.index
+
+            self.env.remove_entity(entity=animal)
+            assert animal not in self.index
+
+        def test_find_energies_around(self):
+            energy = self.env.create_energy(energy_type=EnergyType.BLUE,
+                                            quantity=10,
+                                            coordinates=(7,7))
+
+            assert self.env.find_energies_around(coordinates=(5,5),
+                                                 radius=3) == {energy}
@@ -0,0 +1,136 @@
+import pytest
+from project.src.platform.energies import EnergyType
+from project.src.platform.tiling import (TiledSimulation, Tile, TileLayout,
+                                         get_halo_width, route)
+
+
+class TestTileLayout:
+    def test_create_layout(self):
+        layout = TileLayout(dimensions=(20, 10),
+                            shape=(2, 1))
+
+        assert len(layout) == 2
+        assert layout.halo == get_halo_width()
+        assert layout.x_edges.tolist() == [0, 10, 20]
+        assert layout.y_edges.tolist() == [0, 10]
+
+    def test_geometry(self):
+        layout = TileLayout(dimensions=(20, 12),
+                            shape=(2, 2),
+                            halo=3)
+
+        assert layout.get_interior(tile=1) == (0, 6, 10, 12)
+        assert layout.get_interior(tile=2) == (10, 0, 20, 6)
+        # Halo only toward the neighbours
+        assert layout.get_extent(tile=0) == (0, 0, 13, 9)
+        assert layout.get_extent(tile=3) == (7, 3, 20, 12)
+
+        assert layout.find_owners([(0, 0), (9, 6), (10, 5), (19, 11)]).tolist() == [0, 1, 2, 3]
+        assert layout.get_overlaps(tile=0) == {1: (0, 3, 10, 6),
+                                               2: (7, 0, 10, 6),
+                                               3: (7, 3, 10, 6)}
+
+
+class TestTile:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.layout = TileLayout(dimensions=(20, 10),
+                                 shape=(2, 1),
+                                 halo=3)
+        self.tiles = [Tile(index=index,
+                           layout=self.layout,
+                           seed=1) for index in range(2)]
+        for tile in self.tiles:
+            tile.init(populate=False)
+
+    def exchange(self):
+        inboxes = route(outboxes=[tile.collect() for tile in self.tiles])
+        for tile, inbox in zip(self.tiles, inboxes):
+            tile.exchange(inbox=inbox)
+
+    def test_init_tile(self):
+        left, right = self.tiles
+
+        assert left.origin == (0, 0)
+        assert left.interior == (0, 0, 10, 10)
+        assert left.simulation.dimensions == (13, 10)
+        assert right.origin == (7, 0)
+        assert right.interior == (3, 0, 13, 10)
+
+        # Ids interleaved between the tiles
+        animals = [tile.simulation.environment.spawn_animals(coordinates=[(5, 5), (6, 6)])
+                   for tile in self.tiles]
+        assert [animal.id for animal in animals[0]] == [1, 3]
+        assert [animal.id for animal in animals[1]] == [2, 4]
+
+    def test_ghosts(self):
+        left, right = self.tiles
+        animal = left.simulation.environment.spawn_animal(coordinates=(9, 5))
+        energy = right.simulation.environment.create_energy(energy_type=EnergyType.BLUE,
+                                                            quantity=10,
+                                                            coordinates=(3, 2))
+        self.exchange()
+
+        ghost = right.simulation.environment.grid.entity_grid.get_cell_value(coordinates=(2, 5))
+        assert ghost is not animal and ghost.id == animal.id
+        assert ghost.id not in right.simulation.state.entities
+        assert left.simulation.environment.get_resource_at(coordinates=(10, 2)).id == energy.id
+        assert right.count() == {'animals': 0, 'trees': 0, 'energies': 1}
+        assert left.count() == {'animals': 1, 'trees': 0, 'energies': 0}
+
+        # Copies replaced at each exchange, consumed resources removed by their owner
+        ghost_energy = left.simulation.environment.get_resource_at(coordinates=(10, 2))
+        left.simulation.environment.remove_resource(resource=ghost_energy)
+        self.exchange()
+
+        assert right.simulation.state.n_energies == 0
+        assert len(right._ghost_entities) == 1
+        assert right.simulation.environment.grid.entity_grid.get_cell_value(coordinates=(2, 5)).id == animal.id
+
+    def test_migration(self):
+        left, right = self.tiles
+        environment = left.simulation.environment
+        animal = environment.spawn_animal(coordinates=(9, 5),
+                                          blue_energy=40)
+        animal.age = 7
+        left.simulation.state.lineage.add_birth(child_id=animal.id,
+                                                parent1_id=4,
+                                                parent2_id=6)
+
+        # Step into the halo of the left tile
+        environment.grid.entity_grid.update_cell(new_coordinates=(10, 5),
+                                                 value=animal)
+        environment.spatial_index.move(obj=animal,
+                                       coordinates=(10, 5))
+        animal.position = (10, 5)
+        self.exchange()
+
+        assert left.count()['animals'] == 0
+        migrant = right.simulation.state.animals[animal.id]
+        assert migrant.position == (3, 5)
+        assert migrant.age == 7
+        assert migrant.energies_stock['blue energy'] == 40
+        assert migrant.lineage is right.simulation.state.lineage
+        assert migrant.brain.arena is right.simulation.environment.animal_arena
+        assert right.simulation.state.lineage.get_parents(entity_id=animal.id) == (4, 6)
+
+        # Seen by the tile it left from the next exchange
+        self.exchange()
+        ghost = environment.grid.entity_grid.get_cell_value(coordinates=(10, 5))
+        assert ghost.id == animal.id and ghost.id not in left.simulation.state.entities
+
+
+def test_tiled_simulation():
+    simulation = TiledSimulation(sim_id=0,
+                                 dimensions=(30, 30),
+                                 shape=(2, 1),
+                                 seed=1)
+    try:
+        assert simulation.counts['animals'] > 0
+        counts = simulation.update()
+        assert simulation.cycle == 1
+        assert set(counts) == {'animals', 'trees', 'energies'}
+    finally:
+        simulation.close()
+
+    assert not any(process.is_alive() for process in simulation._processes)
@@ -1,7 +1,8 @@
 from math import pi, sqrt
 
 import pytest
-from project.src.platform.universal import Position
+from project.src.platform.universal import (Position, get_offset_tables,
+                                           get_ring_offsets)
 
 
 class TestPosition:
@@ -32,3 +33,34 @@ class TestPosition:
 
         assert self.pos1.norm_angle(other_pos=self.pos5) == 0.25
         assert self.pos5.norm_angle(other_pos=self.pos6) == 0.75
+
+
+def test_offset_tables():
+    radius = 5
+    distances, norm_angles = get_offset_tables(radius=radius)
+    origin = Position(3,7)
+
+    assert distances.shape == norm_angles.shape == (11, 11)
+    for dx in range(-radius, radius+1):
+        for dy in range(-radius, radius+1):
+            if not (dx or dy):
+                continue
+
+            other = Position(3 + dx, 7 + dy)
+            assert distances[dx+radius, dy+radius] == origin.distance(other_pos=other)
+            assert norm_angles[dx+radius, dy+radius] == origin.norm_angle(other_pos=other)
+
+    assert distances[radius, radius] == 0
+
+
+def test_ring_offsets():
+    offsets, rings = get_ring_offsets(radius=2)
+
+    assert offsets.shape == (24, 2)
+    assert (rings[:8] == 1).all()
+    assert (rings[8:] == 2).all()
+    assert (abs(offsets).max(axis=1) == rings).all()
+    assert not (offsets == 0).all(axis=1).any()
+
+    offsets, rings = get_ring_offsets(radius=0)
+    assert offsets.shape == (0, 2)